@@ -6,11 +6,31 @@ Run: python demo.py
 
 import sys
 import os
+from functools import lru_cache
 
 # Fix Python path - add project root to path
 project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, project_root)
 
+# Shared intent classifier (created and warmed up on first use)
+_classifier = None
+
+
+def get_classifier():
+    """Get the shared IntentClassifier, warming it up on first call."""
+    global _classifier
+    if _classifier is None:
+        from src.nlu import IntentClassifier
+        _classifier = IntentClassifier()
+        _classifier.classify("warmup")
+    return _classifier
+
+
+@lru_cache(maxsize=256)
+def classify(text: str):
+    """Classify intent, memoized since interactive inputs often repeat."""
+    return get_classifier().classify(text)
+
 
 def demo_intent_classification():
     """Demo 1: Intent Classification"""
@@ -18,9 +38,6 @@ def demo_intent_classification():
     print("DEMO 1: Intent Classification (NLU)")
     print("="*60)
 
-    from src.nlu import IntentClassifier
-    classifier = IntentClassifier()
-
     test_inputs = [
         "hello, how are you",
         "what is the weather today",
@@ -35,7 +52,7 @@ def demo_intent_classification():
     print("-"*70)
 
     for text in test_inputs:
-        result = classifier.classify(text)
+        result = classify(text)
         print(f"{text:<40} {result.intent:<20} {result.confidence:.2f}")
 
 
@@ -112,11 +129,10 @@ def demo_interactive():
     print("Type your queries (type 'quit' to exit)")
 
     from src.agents import AgentOrchestrator
-    from src.nlu import IntentClassifier
 
     orchestrator = AgentOrchestrator()
     orchestrator.setup()
-    classifier = IntentClassifier()
+    get_classifier()
 
     while True:
         try:
@@ -128,7 +144,7 @@ def demo_interactive():
                 continue
 
             # Classify intent
-            intent_result = classifier.classify(user_input)
+            intent_result = classify(user_input)
 
             # Process through agents
             result = orchestrator.process(user_input, "en")
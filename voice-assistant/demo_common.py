@@ -0,0 +1,275 @@
+"""
+Shared helpers for the root-level demo scripts.
+
+Keeps the faster-whisper model alive between recordings so repeated
+transcriptions don't pay the model load cost (or leak memory) per call.
+"""
+
+import gc
+import importlib.util
+import os
+import queue
+import threading
+import traceback
+from functools import lru_cache
+
+import numpy as np
+
+# Persistent download location so model files are fetched/converted once
+MODEL_CACHE_DIR = os.environ.get(
+    "WHISPER_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "logentic", "whisper"),
+)
+
+# faster-whisper decoding options for short (sub-10s) interactive clips:
+# greedy search, no timestamp tokens, no cross-window conditioning, and
+# VAD to trim silence before the encoder runs
+FAST_TRANSCRIBE_OPTIONS = {
+    "task": "transcribe",
+    "beam_size": 1,
+    "vad_filter": True,
+    "vad_parameters": {"min_silence_duration_ms": 500},
+    "without_timestamps": True,
+    "condition_on_previous_text": False,
+}
+
+# Loaded faster-whisper models keyed by (model_name, device, compute_type)
+_MODEL_CACHE = {}
+
+
+def has_module(name: str) -> bool:
+    """Check whether a module is installed without importing it."""
+    return importlib.util.find_spec(name) is not None
+
+
+@lru_cache(maxsize=None)
+def detect_device() -> str:
+    """
+    Pick cuda or cpu for faster-whisper.
+
+    Asks CTranslate2 for the CUDA device count, which is much cheaper
+    than importing torch just to call torch.cuda.is_available().
+    The result is cached for the life of the process.
+
+    Returns:
+        "cuda" if a GPU is usable, otherwise "cpu"
+    """
+    import ctranslate2
+    return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+
+
+@lru_cache(maxsize=None)
+def get_gpu_name() -> str:
+    """Return the name of the first CUDA device (looked up once)."""
+    import torch
+    return torch.cuda.get_device_name(0)
+
+
+def get_model(
+    model_name: str,
+    device: str = "cpu",
+    compute_type: str = "auto",
+    warmup: bool = True,
+):
+    """
+    Get a cached faster-whisper model, loading it on first use.
+
+    Only one model is kept at a time. Switching to a different
+    model/device/compute type releases the previous one first.
+    Weights are stored under MODEL_CACHE_DIR (override with the
+    WHISPER_CACHE_DIR environment variable). On CPU, half the cores
+    are used for inference; set OMP_NUM_THREADS to override.
+
+    Args:
+        model_name: Whisper model name (small, medium, large-v3, ...)
+        device: Device to run on - cuda or cpu
+        compute_type: CTranslate2 compute type
+        warmup: Run a dummy transcription after loading so the first
+            real utterance doesn't pay kernel selection/autotuning cost
+
+    Returns:
+        faster_whisper.WhisperModel instance
+    """
+    key = (model_name, device, compute_type)
+    model = _MODEL_CACHE.get(key)
+    if model is not None:
+        return model
+
+    if _MODEL_CACHE:
+        release_models()
+
+    from faster_whisper import WhisperModel
+
+    kwargs = {}
+    if device == "cpu":
+        kwargs["cpu_threads"] = int(
+            os.environ.get("OMP_NUM_THREADS", max(1, (os.cpu_count() or 2) // 2))
+        )
+
+    model = WhisperModel(
+        model_name,
+        device=device,
+        compute_type=compute_type,
+        download_root=MODEL_CACHE_DIR,
+        **kwargs,
+    )
+    if warmup:
+        warmup_model(model)
+    _MODEL_CACHE[key] = model
+    return model
+
+
+def warmup_model(model, language: str = "en"):
+    """Transcribe one second of silence to warm up the model's kernels."""
+    silence = np.zeros(16000, dtype=np.float32)
+    segments, _ = model.transcribe(silence, language=language, beam_size=1)
+    list(segments)
+
+
+def pcm16_to_float32(audio: np.ndarray) -> np.ndarray:
+    """
+    Convert an int16 recording to the mono float32 array Whisper expects.
+
+    Args:
+        audio: int16 samples from sd.rec (shape (n,) or (n, 1))
+
+    Returns:
+        1-D float32 array scaled to [-1.0, 1.0)
+    """
+    # One fused widen-and-scale ufunc over contiguous memory (no int16->float32
+    # temporary), which NumPy runs with its SIMD loops
+    samples = np.ascontiguousarray(audio).reshape(-1)
+    return np.multiply(samples, np.float32(1.0 / 32768.0), dtype=np.float32)
+
+
+def is_silent(audio: np.ndarray, threshold: float = 0.01) -> bool:
+    """
+    Check whether a recording is too quiet to contain speech.
+
+    A single RMS pass is far cheaper than running Whisper on silence.
+
+    Args:
+        audio: int16 recording or float32 samples in [-1, 1]
+        threshold: RMS level (float scale) below which audio counts as silent
+
+    Returns:
+        True if the recording is empty or below the threshold
+    """
+    samples = audio.reshape(-1)
+    if samples.size == 0:
+        return True
+    samples = samples.astype(np.float32)
+    rms = np.sqrt(np.dot(samples, samples) / samples.size)
+    if audio.dtype == np.int16:
+        rms /= 32768.0
+    return bool(rms < threshold)
+
+
+def record_audio(duration: float, sample_rate: int = 16000, out: np.ndarray = None) -> np.ndarray:
+    """
+    Record mono int16 audio from the default microphone.
+
+    Args:
+        duration: Recording length in seconds (ignored when out is given)
+        sample_rate: Sample rate in Hz
+        out: Optional preallocated (n, 1) int16 buffer to record into
+
+    Returns:
+        int16 array of shape (n, 1); the out buffer itself if provided
+    """
+    import sounddevice as sd
+
+    if out is None:
+        audio = sd.rec(
+            int(duration * sample_rate),
+            samplerate=sample_rate,
+            channels=1,
+            dtype=np.int16
+        )
+    else:
+        audio = sd.rec(samplerate=sample_rate, channels=1, out=out)
+    sd.wait()
+    return audio
+
+
+def transcribe_array(model, audio: np.ndarray, language: str = None):
+    """
+    Transcribe an in-memory recording with faster-whisper.
+
+    Args:
+        model: faster_whisper.WhisperModel instance
+        audio: int16 recording, or float32 samples already converted
+        language: Language code (None for auto-detection)
+
+    Returns:
+        Tuple of (text, info) where info is faster-whisper's TranscriptionInfo
+    """
+    if audio.dtype == np.int16:
+        audio = pcm16_to_float32(audio)
+
+    segments, info = model.transcribe(
+        audio,
+        language=language,
+        **FAST_TRANSCRIBE_OPTIONS,
+    )
+    text = "".join(segment.text for segment in segments)
+    return text.strip(), info
+
+
+def release_models():
+    """Drop all cached models and free GPU memory."""
+    _MODEL_CACHE.clear()
+    gc.collect()
+    try:
+        import torch
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except ImportError:
+        pass
+
+
+class BackgroundWorker:
+    """
+    Runs a handler on queued items in a background thread.
+
+    Lets a demo keep recording the next utterance while the previous
+    one is still being transcribed.
+    """
+
+    _STOP = object()
+
+    def __init__(self, handler):
+        """
+        Start the worker thread.
+
+        Args:
+            handler: Callable invoked with each submitted item
+        """
+        self.handler = handler
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                break
+            try:
+                self.handler(item)
+            except Exception as e:
+                print(f"Worker error: {e}")
+                traceback.print_exc()
+
+    def submit(self, item):
+        """Queue an item for the handler."""
+        self._queue.put(item)
+
+    def pending(self) -> int:
+        """Return the number of items waiting to be handled."""
+        return self._queue.qsize()
+
+    def close(self):
+        """Finish all queued items and stop the thread."""
+        self._queue.put(self._STOP)
+        self._thread.join()
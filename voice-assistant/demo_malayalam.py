@@ -1,8 +1,8 @@
 """
 Malayalam Speech Recognition Demo
-Uses AI4Bharat IndicWhisper for better Malayalam support.
+Uses Whisper large-v3 through faster-whisper (CTranslate2 backend).
 
-First run: pip install transformers accelerate
+First run: pip install faster-whisper
 Then: python demo_malayalam.py
 """
 
@@ -21,23 +21,21 @@ def main():
 
     # Check dependencies
     try:
-        import sounddevice as sd
-        import soundfile as sf
+        import sounddevice  # noqa: F401
         import numpy as np
     except ImportError as e:
         print(f"\nMissing dependency: {e}")
-        print("Run: pip install sounddevice soundfile numpy")
+        print("Run: pip install sounddevice numpy")
         return
 
-    try:
-        from transformers import WhisperProcessor
-    except ImportError:
-        print("\nMissing transformers library.")
-        print("Run: pip install transformers accelerate torch")
-        return
+    from demo_common import (
+        detect_device, get_model, has_module, is_silent, record_audio, transcribe_array
+    )
 
-    # Import our ASR
-    from src.asr import IndicWhisperASR
+    if not has_module("faster_whisper"):
+        print("\nMissing faster-whisper library.")
+        print("Run: pip install faster-whisper")
+        return
 
     # Settings
     duration = 6  # seconds - slightly longer for Malayalam
@@ -57,8 +55,13 @@ def main():
     print(f"\nSelected: {language.upper()}")
     print("Using OpenAI whisper-large-v3 (~3GB download on first run)")
 
-    # Initialize ASR - using GPU (RTX 4070)
-    asr = IndicWhisperASR(language=language, device="cuda")
+    # Initialize ASR - GPU if available (RTX 4070), CPU otherwise
+    device = detect_device()
+    model = get_model("large-v3", device=device, compute_type="auto")
+    print(f"Model loaded on {device}")
+
+    # Recording buffer reused for every utterance
+    buf = np.empty((int(duration * sample_rate), 1), dtype=np.int16)
 
     print("\nReady! Press ENTER to start recording...")
 
@@ -70,36 +73,26 @@ def main():
         print(f"\nRecording for {duration} seconds... Speak in {language.upper()} now!")
 
         # Record audio
-        audio = sd.rec(
-            int(duration * sample_rate),
-            samplerate=sample_rate,
-            channels=1,
-            dtype=np.float32
-        )
-        sd.wait()
+        audio = record_audio(duration, sample_rate, out=buf)
         print("Recording complete!")
 
-        # Save temp file
-        temp_file = "temp_malayalam.wav"
-        sf.write(temp_file, audio, sample_rate)
+        if is_silent(audio):
+            print("[No speech detected]")
+            continue
 
         # Transcribe
         print("Transcribing...")
         try:
-            result = asr.transcribe(temp_file, language=language)
+            text, info = transcribe_array(model, audio, language=language)
 
             print("\n" + "-"*50)
-            print(f"Transcription: {result['text']}")
-            print(f"Language: {result['language_name']}")
+            print(f"Transcription: {text}")
+            print(f"Language: {info.language}")
             print("-"*50)
 
         except Exception as e:
             print(f"Error: {e}")
 
-        # Cleanup
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
-
     print("\nGoodbye!")
 
 
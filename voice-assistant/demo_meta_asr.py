@@ -10,6 +10,8 @@ import sys
 import os
 import subprocess
 import tempfile
+import wave
+from datetime import datetime
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -18,25 +20,46 @@ def record_audio_pulseaudio(duration=6, sample_rate=16000):
     """Record audio using PulseAudio (for WSL2)."""
     print(f"Recording {duration} seconds... Speak now!")
 
-    # Create temp file
-    temp_file = tempfile.mktemp(suffix=".wav")
+    # parecord has no duration flag, so stream raw 16-bit PCM from parec and
+    # stop after exactly duration * sample_rate samples instead of sleeping
+    num_bytes = int(duration * sample_rate) * 2
 
-    # Use parecord for recording
     try:
         proc = subprocess.Popen(
-            ["parecord", "--channels=1", f"--rate={sample_rate}", "--file-format=wav", temp_file],
+            ["parec", "--channels=1", f"--rate={sample_rate}", "--format=s16le", "--raw"],
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
+            stderr=subprocess.DEVNULL
         )
 
-        # Wait for duration
-        import time
-        time.sleep(duration)
+        pcm = bytearray()
+        while len(pcm) < num_bytes:
+            chunk = proc.stdout.read(num_bytes - len(pcm))
+            if not chunk:
+                break
+            pcm.extend(chunk)
 
         # Stop recording
         proc.terminate()
         proc.wait()
 
+        if not pcm:
+            print("Recording error: no audio received from PulseAudio")
+            return None
+
+        import numpy as np
+        from demo_common import is_silent
+        if is_silent(np.frombuffer(bytes(pcm), dtype=np.int16)):
+            print("[No speech detected]")
+            return None
+
+        # Save to temp file
+        fd, temp_file = tempfile.mkstemp(suffix=".wav")
+        with os.fdopen(fd, "wb") as f, wave.open(f, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            wav.writeframes(bytes(pcm))
+
         print("Recording complete!")
         return temp_file
 
@@ -50,24 +73,22 @@ def record_audio_pulseaudio(duration=6, sample_rate=16000):
 
 def record_audio_sounddevice(duration=6, sample_rate=16000):
     """Record audio using sounddevice (for Windows/native Linux)."""
-    import sounddevice as sd
     import soundfile as sf
-    import numpy as np
+    import demo_common
 
     print(f"Recording {duration} seconds... Speak now!")
 
-    audio = sd.rec(
-        int(duration * sample_rate),
-        samplerate=sample_rate,
-        channels=1,
-        dtype=np.float32
-    )
-    sd.wait()
+    audio = demo_common.record_audio(duration, sample_rate)
     print("Recording complete!")
 
+    if demo_common.is_silent(audio):
+        print("[No speech detected]")
+        return None
+
     # Save to temp file
-    temp_file = tempfile.mktemp(suffix=".wav")
-    sf.write(temp_file, audio, sample_rate)
+    fd, temp_file = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+    sf.write(temp_file, audio, sample_rate, subtype="PCM_16")
     return temp_file
 
 
@@ -88,6 +109,42 @@ def record_audio(duration=6, sample_rate=16000):
             return record_audio_pulseaudio(duration, sample_rate)
 
 
+def transcribe_batch(pipeline, files, language, lang_name):
+    """Transcribe a batch of recordings in one pipeline call and print results."""
+    print(f"Transcribing {len(files)} recording(s)...")
+
+    try:
+        transcriptions = pipeline.transcribe(
+            files,
+            lang=[language] * len(files),
+            batch_size=len(files)
+        )
+
+        output_file = "transcriptions.txt"
+        with open(output_file, "a", encoding="utf-8") as f:
+            for i, result_text in enumerate(transcriptions, 1):
+                print("\n" + "-"*50)
+                print(f"[{i}/{len(files)}] Language: {lang_name}")
+                print(f"Transcription: {result_text}")
+                print("-"*50)
+
+                # Save to file
+                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                f.write(f"\n[{timestamp}] Language: {lang_name}\n")
+                f.write(f"Transcription: {result_text}\n")
+                f.write("-"*50 + "\n")
+
+        print(f"Saved to: {output_file}")
+
+    except Exception as e:
+        print(f"Transcription error: {e}")
+
+    # Cleanup
+    for temp_file in files:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+
+
 def main():
     print("\n" + "="*60)
     print("META OMNILINGUAL ASR DEMO")
@@ -160,55 +217,43 @@ def main():
     print(f"\nLanguage: {lang_name} ({language})")
 
     duration = 6
+    max_batch = 8
 
     print("\nReady! Speak clearly.")
+    print(f"Recordings are transcribed together: press 't' or record {max_batch} to run a batch.")
 
+    pending = []
     while True:
-        choice = input("\nPress ENTER to record (or 'q' to quit): ").strip()
-        if choice.lower() == 'q':
+        choice = input(
+            f"\nPress ENTER to record, 't' to transcribe {len(pending)} pending, or 'q' to quit: "
+        ).strip().lower()
+        if choice == 'q':
             break
+        if choice == 't':
+            if pending:
+                transcribe_batch(pipeline, pending, language, lang_name)
+                pending = []
+            else:
+                print("Nothing recorded yet.")
+            continue
 
         # Record audio
         temp_file = record_audio(duration=duration)
 
+        # Failed or silent recordings already report why
         if not temp_file or not os.path.exists(temp_file):
-            print("Recording failed!")
             continue
 
-        print("Transcribing...")
+        pending.append(temp_file)
+        print(f"Queued recording {len(pending)}/{max_batch}")
 
-        try:
-            # Transcribe with Omnilingual ASR
-            transcriptions = pipeline.transcribe(
-                [temp_file],
-                lang=[language],
-                batch_size=1
-            )
-
-            result_text = transcriptions[0]
-
-            print("\n" + "-"*50)
-            print(f"Language: {lang_name}")
-            print(f"Transcription: {result_text}")
-            print("-"*50)
-
-            # Save to file
-            output_file = "transcriptions.txt"
-            with open(output_file, "a", encoding="utf-8") as f:
-                from datetime import datetime
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                f.write(f"\n[{timestamp}] Language: {lang_name}\n")
-                f.write(f"Transcription: {result_text}\n")
-                f.write("-"*50 + "\n")
-
-            print(f"Saved to: {output_file}")
+        # Amortize per-call overhead by transcribing recordings together
+        if len(pending) >= max_batch:
+            transcribe_batch(pipeline, pending, language, lang_name)
+            pending = []
 
-        except Exception as e:
-            print(f"Transcription error: {e}")
-
-        # Cleanup
-        if temp_file and os.path.exists(temp_file):
-            os.remove(temp_file)
+    if pending:
+        transcribe_batch(pipeline, pending, language, lang_name)
 
     print("Goodbye!")
 
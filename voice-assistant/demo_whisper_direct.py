@@ -1,6 +1,9 @@
 """
 Direct Whisper Demo for Malayalam
-Uses openai-whisper library directly (simpler, better language support)
+Uses faster-whisper (CTranslate2 backend) directly
+
+Install:
+    pip install faster-whisper
 
 Run: python demo_whisper_direct.py
 """
@@ -17,21 +20,28 @@ def main():
     print("="*60)
 
     try:
-        import whisper
-        import sounddevice as sd
-        import soundfile as sf
+        import sounddevice  # noqa: F401
         import numpy as np
     except ImportError as e:
         print(f"Missing: {e}")
-        print("Run: pip install openai-whisper sounddevice soundfile numpy")
+        print("Run: pip install faster-whisper sounddevice numpy")
+        return
+
+    from demo_common import (
+        detect_device, get_gpu_name, get_model, has_module, is_silent, record_audio,
+        transcribe_array,
+    )
+
+    if not has_module("faster_whisper"):
+        print("Missing: faster_whisper")
+        print("Run: pip install faster-whisper sounddevice numpy")
         return
 
     # Check for GPU
-    import torch
-    device = "cuda" if torch.cuda.is_available() else "cpu"
+    device = detect_device()
     print(f"Device: {device}")
     if device == "cuda":
-        print(f"GPU: {torch.cuda.get_device_name(0)}")
+        print(f"GPU: {get_gpu_name()}")
 
     print("\nSelect model size:")
     print("  1. small (500MB) - fastest")
@@ -42,7 +52,8 @@ def main():
     model_name = model_map.get(model_choice, "small")
 
     print(f"\nLoading Whisper {model_name}...")
-    model = whisper.load_model(model_name, device=device)
+    # compute_type="auto" lets CTranslate2 pick float16/int8_float16/int8
+    model = get_model(model_name, device=device, compute_type="auto")
     print("Model loaded!")
 
     print("\nSelect language:")
@@ -64,45 +75,32 @@ def main():
 
     print("\nReady! Speak clearly in Malayalam.")
 
+    # Recording buffer reused for every utterance
+    buf = np.empty((int(duration * sample_rate), 1), dtype=np.int16)
+
     while True:
         choice = input("\nPress ENTER to record (or 'q' to quit): ").strip()
         if choice.lower() == 'q':
             break
 
         print(f"Recording {duration} seconds...")
-        audio = sd.rec(
-            int(duration * sample_rate),
-            samplerate=sample_rate,
-            channels=1,
-            dtype=np.float32
-        )
-        sd.wait()
+        audio = record_audio(duration, sample_rate, out=buf)
         print("Recording complete!")
 
-        # Save temp file
-        temp_file = "temp_recording.wav"
-        sf.write(temp_file, audio, sample_rate)
+        if is_silent(audio):
+            print("[No speech detected]")
+            continue
 
         print("Transcribing...")
 
-        # Transcribe with forced language
-        result = model.transcribe(
-            temp_file,
-            language=language,      # Force language (e.g., "ml")
-            task="transcribe",      # Transcribe, don't translate
-            fp16=(device == "cuda"),
-            verbose=True,           # Show progress
-            condition_on_previous_text=False,  # Faster
-        )
+        # Transcribe with forced language (e.g., "ml")
+        text, info = transcribe_array(model, audio, language=language)
 
         print("\n" + "-"*50)
-        print(f"Detected language: {result.get('language', 'N/A')}")
-        print(f"Text: {result['text']}")
+        print(f"Detected language: {info.language}")
+        print(f"Text: {text}")
         print("-"*50)
 
-        # Cleanup
-        os.remove(temp_file)
-
     print("Goodbye!")
 
 
@@ -3,7 +3,7 @@ Demo with Laptop Microphone
 Record audio from your laptop mic and test ASR + full pipeline.
 
 Requirements:
-    pip install sounddevice soundfile
+    pip install sounddevice faster-whisper
 
 Run: python demo_with_mic.py
 """
@@ -34,10 +34,7 @@ def check_audio_devices():
 def record_and_transcribe():
     """Record from mic and transcribe."""
     try:
-        import sounddevice as sd
-        import soundfile as sf
-        import numpy as np
-        from src.asr import WhisperASR
+        from demo_common import detect_device, get_model, is_silent, record_audio, transcribe_array
 
         print("\n" + "="*60)
         print("RECORD & TRANSCRIBE DEMO")
@@ -50,19 +47,12 @@ def record_and_transcribe():
         input(f"\nPress ENTER to start recording ({duration} seconds)...")
 
         print("Recording... Speak now!")
-        audio = sd.rec(
-            int(duration * sample_rate),
-            samplerate=sample_rate,
-            channels=1,
-            dtype=np.float32
-        )
-        sd.wait()
+        audio = record_audio(duration, sample_rate)
         print("Recording complete!")
 
-        # Save to temp file
-        temp_file = "temp_recording.wav"
-        sf.write(temp_file, audio, sample_rate)
-        print(f"Saved to {temp_file}")
+        if is_silent(audio):
+            print("[No speech detected]")
+            return None
 
         # Ask for language
         print("\nSelect language:")
@@ -78,33 +68,33 @@ def record_and_transcribe():
 
         # Transcribe
         print("\nTranscribing (loading Whisper model, may take a moment)...")
-        # Using RTX 4070 GPU for fast inference
-        asr = WhisperASR(model_size="medium", device="cuda")
-        result = asr.transcribe(temp_file, language=language)
+        # Using RTX 4070 GPU for fast inference. distil-large-v3 has a much
+        # smaller decoder but is English-only, so use it just for English.
+        model_name = "distil-large-v3" if language == "en" else "medium"
+        model = get_model(model_name, device=detect_device(), compute_type="auto")
+        text, info = transcribe_array(model, audio, language=language)
 
         print("\n" + "-"*40)
-        print(f"Transcription: {result['text']}")
-        print(f"Language: {result['language_name']} ({result['language']})")
+        print(f"Transcription: {text}")
+        print(f"Language: {info.language} ({info.language_probability:.0%})")
         print("-"*40)
 
-        # Clean up
-        os.remove(temp_file)
-
-        return result['text']
+        return text
 
     except ImportError as e:
         print(f"Missing dependency: {e}")
-        print("Run: pip install sounddevice soundfile")
+        print("Run: pip install sounddevice faster-whisper")
         return None
 
 
 def full_pipeline_demo():
     """Full pipeline: Record -> ASR -> NLU -> Agent -> Response"""
     try:
-        import sounddevice as sd
-        import soundfile as sf
         import numpy as np
-        from src.asr import WhisperASR
+        from demo_common import (
+            BackgroundWorker, get_model, is_silent, pcm16_to_float32, record_audio,
+            transcribe_array,
+        )
         from src.nlu import IntentClassifier
         from src.agents import AgentOrchestrator
 
@@ -115,7 +105,7 @@ def full_pipeline_demo():
 
         # Initialize components
         print("\nInitializing components...")
-        asr = WhisperASR(model_size="base", device="cpu")
+        model = get_model("base", device="cpu", compute_type="auto")
         classifier = IntentClassifier()
         orchestrator = AgentOrchestrator()
         orchestrator.setup()
@@ -125,39 +115,20 @@ def full_pipeline_demo():
         duration = 5
         sample_rate = 16000
 
-        while True:
-            choice = input("\nPress ENTER to record (or 'q' to quit): ").strip()
-            if choice.lower() == 'q':
-                break
-
-            # Record
-            print(f"Recording for {duration} seconds... Speak now!")
-            audio = sd.rec(
-                int(duration * sample_rate),
-                samplerate=sample_rate,
-                channels=1,
-                dtype=np.float32
-            )
-            sd.wait()
-            print("Recording complete!")
-
-            # Save temp
-            temp_file = "temp_recording.wav"
-            sf.write(temp_file, audio, sample_rate)
+        # Recording buffer reused for every utterance
+        buf = np.empty((int(duration * sample_rate), 1), dtype=np.int16)
 
+        def process(audio):
             # ASR
-            print("Transcribing...")
-            asr_result = asr.transcribe(temp_file)
-            transcription = asr_result['text']
-            language = asr_result['language']
+            transcription, info = transcribe_array(model, audio)
+            language = info.language
 
             print(f"\n[ASR] You said: \"{transcription}\"")
-            print(f"[ASR] Language: {asr_result['language_name']}")
+            print(f"[ASR] Language: {language}")
 
             if not transcription.strip():
                 print("[Warning] No speech detected")
-                os.remove(temp_file)
-                continue
+                return
 
             # NLU
             intent_result = classifier.classify(transcription)
@@ -167,12 +138,29 @@ def full_pipeline_demo():
             agent_result = orchestrator.process(transcription, language)
             print(f"[Agent] Response: {agent_result['response']}")
 
-            # Clean up
-            os.remove(temp_file)
+        # Process in the background so the next recording can start right away
+        worker = BackgroundWorker(process)
+
+        while True:
+            choice = input("\nPress ENTER to record (or 'q' to quit): ").strip()
+            if choice.lower() == 'q':
+                break
+
+            # Record
+            print(f"Recording for {duration} seconds... Speak now!")
+            audio = record_audio(duration, sample_rate, out=buf)
+            if is_silent(audio):
+                print("[No speech detected]")
+                continue
+            print("Recording complete! Processing in background...")
+            # Convert now: buf is overwritten by the next recording
+            worker.submit(pcm16_to_float32(audio))
+
+        worker.close()
 
     except ImportError as e:
         print(f"Missing dependency: {e}")
-        print("Run: pip install sounddevice soundfile openai-whisper")
+        print("Run: pip install sounddevice faster-whisper")
 
 
 def main():
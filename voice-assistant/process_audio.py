@@ -2,12 +2,82 @@
 Meta Omnilingual ASR - Audio File Processor
 Processes pre-recorded audio files (for use in WSL2)
 
-Usage: python process_audio.py <audio_file> [language]
+Usage: python process_audio.py <audio_file|glob> [more files...] [language]
 Example: python process_audio.py /mnt/e/Work/logentic/voice-assistant/recorded_audio.wav mal_Mlym
+         python process_audio.py "recordings/*.wav" mal_Mlym
 """
 
 import sys
 import os
+import glob
+import re
+from functools import lru_cache
+
+BATCH_SIZE = 8
+
+# Omnilingual language codes look like mal_Mlym, eng_Latn
+LANG_CODE_PATTERN = re.compile(r"^[a-z]{3}_[A-Z][a-z]{3}$")
+
+# Omnilingual -> Whisper language codes (unknown codes fall back to auto-detect)
+WHISPER_LANG_CODES = {
+    "mal_Mlym": "ml",
+    "hin_Deva": "hi",
+    "tam_Taml": "ta",
+    "tel_Telu": "te",
+    "eng_Latn": "en",
+}
+
+
+@lru_cache(maxsize=1)
+def load_pipeline(model_name: str):
+    """Load an Omnilingual ASR pipeline once and reuse it across calls."""
+    from omnilingual_asr.models.inference.pipeline import ASRInferencePipeline
+    return ASRInferencePipeline(model_card=model_name)
+
+
+def transcribe_with_whisper(audio_files, language):
+    """
+    Transcribe files with faster-whisper's BatchedInferencePipeline.
+
+    Long files are split into VAD chunks that go through the encoder
+    in batches of BATCH_SIZE instead of one 30s window at a time.
+    """
+    try:
+        from faster_whisper import BatchedInferencePipeline
+        from demo_common import detect_device, get_model
+    except ImportError:
+        print("\nError: faster-whisper not installed")
+        print("Run: pip install faster-whisper")
+        return
+
+    device = detect_device()
+    compute_type = "int8_float16" if device == "cuda" else "int8"
+    whisper_lang = WHISPER_LANG_CODES.get(language)
+
+    print(f"\nLoading Whisper large-v3 on {device} ({compute_type})...")
+    model = get_model("large-v3", device=device, compute_type=compute_type)
+    pipeline = BatchedInferencePipeline(model=model)
+    print("Model loaded!")
+
+    print("\n" + "="*60)
+    print("RESULT")
+    print("="*60)
+    for audio_file in audio_files:
+        try:
+            segments, info = pipeline.transcribe(
+                audio_file,
+                batch_size=BATCH_SIZE,
+                language=whisper_lang,
+            )
+            text = "".join(segment.text for segment in segments).strip()
+
+            if len(audio_files) > 1:
+                print(f"\n{os.path.basename(audio_file)}:")
+            print(f"Language: {info.language}")
+            print(f"Transcription: {text}")
+        except Exception as e:
+            print(f"Transcription error ({audio_file}): {e}")
+    print("="*60)
 
 
 def main():
@@ -17,7 +87,7 @@ def main():
 
     # Check arguments
     if len(sys.argv) < 2:
-        print("\nUsage: python process_audio.py <audio_file> [language]")
+        print("\nUsage: python process_audio.py <audio_file|glob> [more files...] [language]")
         print("\nLanguage codes:")
         print("  mal_Mlym  - Malayalam")
         print("  hin_Deva  - Hindi")
@@ -26,34 +96,48 @@ def main():
         print("  eng_Latn  - English")
         print("\nExample:")
         print("  python process_audio.py /mnt/e/Work/logentic/voice-assistant/recorded_audio.wav mal_Mlym")
+        print('  python process_audio.py "recordings/*.wav" mal_Mlym')
         return
 
-    audio_file = sys.argv[1]
-    language = sys.argv[2] if len(sys.argv) > 2 else "mal_Mlym"
+    args = sys.argv[1:]
+    language = "mal_Mlym"
+    if len(args) > 1 and LANG_CODE_PATTERN.match(args[-1]):
+        language = args.pop()
+
+    # Expand globs and check files exist
+    audio_files = []
+    for arg in args:
+        matches = sorted(glob.glob(arg))
+        if not matches:
+            print(f"Error: File not found: {arg}")
+            return
+        audio_files.extend(matches)
+
+    print(f"\nAudio files: {len(audio_files)}")
+    for audio_file in audio_files:
+        print(f"  {audio_file}")
+    print(f"Language: {language}")
 
-    # Check if file exists
-    if not os.path.exists(audio_file):
-        print(f"Error: File not found: {audio_file}")
-        return
+    # Select model
+    print("\nSelect model:")
+    print("  1. 300M CTC (fastest, ~1GB)")
+    print("  2. 1B CTC (balanced)")
+    print("  3. 7B LLM (best quality, needs ~14GB VRAM)")
+    print("  4. Whisper large-v3, batched (faster-whisper, best for long audio)")
+    model_choice = input("Choice [1]: ").strip() or "1"
 
-    print(f"\nAudio file: {audio_file}")
-    print(f"Language: {language}")
+    if model_choice == "4":
+        transcribe_with_whisper(audio_files, language)
+        return
 
     # Import Omnilingual ASR
     try:
-        from omnilingual_asr.models.inference.pipeline import ASRInferencePipeline
+        import omnilingual_asr  # noqa: F401
     except ImportError:
         print("\nError: omnilingual-asr not installed")
         print("Run: pip install omnilingual-asr")
         return
 
-    # Select model
-    print("\nSelect model:")
-    print("  1. 300M CTC (fastest, ~1GB)")
-    print("  2. 1B CTC (balanced)")
-    print("  3. 7B LLM (best quality, needs ~14GB VRAM)")
-    model_choice = input("Choice [1]: ").strip() or "1"
-
     model_map = {
         "1": "omniASR_CTC_300M",
         "2": "omniASR_CTC_1B",
@@ -63,7 +147,7 @@ def main():
 
     print(f"\nLoading {model_name}...")
     try:
-        pipeline = ASRInferencePipeline(model_card=model_name)
+        pipeline = load_pipeline(model_name)
         print("Model loaded!")
     except Exception as e:
         print(f"Failed to load model: {e}")
@@ -73,16 +157,19 @@ def main():
 
     try:
         transcriptions = pipeline.transcribe(
-            [audio_file],
-            lang=[language],
-            batch_size=1
+            audio_files,
+            lang=[language] * len(audio_files),
+            batch_size=min(BATCH_SIZE, len(audio_files))
         )
 
         print("\n" + "="*60)
         print("RESULT")
         print("="*60)
         print(f"Language: {language}")
-        print(f"Transcription: {transcriptions[0]}")
+        for audio_file, text in zip(audio_files, transcriptions):
+            if len(audio_files) > 1:
+                print(f"\n{os.path.basename(audio_file)}:")
+            print(f"Transcription: {text}")
         print("="*60)
 
     except Exception as e:
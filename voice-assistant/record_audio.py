@@ -2,40 +2,129 @@
 Simple audio recorder for Windows
 Saves audio file that can be processed by WSL2
 
+Recording stops automatically once you stop speaking (voice activity
+detection), so the saved file carries no long trailing silence.
+
 Run: python record_audio.py
 """
 
+import threading
+
 import sounddevice as sd
 import soundfile as sf
 import numpy as np
 
+from src.utils.vad import SILENCE_STOP_MS, VAD_FRAME, load_speech_detector
+
+# Frames per callback: 128 samples is 8ms at 16kHz
+BLOCK_SIZE = 128
+
+
+def record_to_file(output_file, duration, sample_rate, is_speech=None):
+    """
+    Record from the microphone straight into a PCM_16 WAV file.
+
+    Each callback block is written to the open file as it arrives, so
+    disk I/O overlaps capture and the clip is never held in memory.
+    A copy of each block also goes into a small ring buffer that the
+    main thread scores with the VAD.
+
+    Args:
+        output_file: Path of the WAV file to write
+        duration: Maximum recording length in seconds
+        sample_rate: Sample rate in Hz
+        is_speech: Optional speech detector from load_speech_detector();
+            when given, recording stops after SILENCE_STOP_MS of silence
+            following speech
+
+    Returns:
+        Number of frames written
+    """
+    total = int(duration * sample_rate)
+    pos = 0
+    done = threading.Event()
+    stop = threading.Event()
+
+    # One second of history is plenty for the VAD to keep up
+    ring = np.zeros(sample_rate, dtype=np.int16)
+
+    with sf.SoundFile(
+        output_file, "w", samplerate=sample_rate, channels=1, subtype="PCM_16"
+    ) as f:
+
+        def callback(indata, frames, time_info, status):
+            nonlocal pos
+            n = min(frames, total - pos)
+            f.buffer_write(indata[:n], dtype="int16")
+
+            start = pos % len(ring)
+            first = min(n, len(ring) - start)
+            ring[start:start + first] = indata[:first, 0]
+            ring[:n - first] = indata[first:n, 0]
+
+            pos += n
+            if pos >= total or stop.is_set():
+                done.set()
+                raise sd.CallbackStop
+
+        with sd.InputStream(
+            samplerate=sample_rate,
+            channels=1,
+            dtype=np.int16,
+            blocksize=BLOCK_SIZE,
+            latency="low",
+            callback=callback,
+        ):
+            if is_speech is None:
+                done.wait()
+            else:
+                scored = 0
+                heard_speech = False
+                silent_frames = 0
+                stop_frames = int(SILENCE_STOP_MS * sample_rate / 1000 / VAD_FRAME)
+                frame_s = VAD_FRAME / sample_rate
+
+                while not done.wait(frame_s):
+                    while pos - scored >= VAD_FRAME:
+                        idx = np.arange(scored, scored + VAD_FRAME) % len(ring)
+                        frame = ring[idx].astype(np.float32) / 32768.0
+                        scored += VAD_FRAME
+
+                        if is_speech(frame):
+                            heard_speech = True
+                            silent_frames = 0
+                        elif heard_speech:
+                            silent_frames += 1
+
+                    if heard_speech and silent_frames >= stop_frames:
+                        stop.set()
+
+                done.wait()
+
+    return pos
+
+
 def main():
     print("\n" + "="*50)
     print("AUDIO RECORDER")
     print("Records audio for processing in WSL2")
     print("="*50)
 
-    duration = 6
+    max_duration = 15
     sample_rate = 16000
     output_file = "recorded_audio.wav"
 
+    is_speech = load_speech_detector(sample_rate)
+
     while True:
         choice = input("\nPress ENTER to record (or 'q' to quit): ").strip()
         if choice.lower() == 'q':
             break
 
-        print(f"Recording {duration} seconds... Speak now!")
-        audio = sd.rec(
-            int(duration * sample_rate),
-            samplerate=sample_rate,
-            channels=1,
-            dtype=np.float32
-        )
-        sd.wait()
-        print("Recording complete!")
-
-        # Save file
-        sf.write(output_file, audio, sample_rate)
+        print(f"Recording (up to {max_duration} seconds, stops when you pause)... Speak now!")
+        # Written to disk while recording
+        frames = record_to_file(output_file, max_duration, sample_rate, is_speech)
+        print(f"Recording complete! ({frames / sample_rate:.1f}s)")
         print(f"\nSaved to: {output_file}")
         print(f"Full path: E:\\Work\\logentic\\voice-assistant\\{output_file}")
         print("\nNow run in WSL2:")
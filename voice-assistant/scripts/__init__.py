@@ -0,0 +1 @@
+"""Demo and manual test scripts. Run from voice-assistant/ with python -m scripts.<name>."""
@@ -2,15 +2,16 @@
 """
 Voice Assistant Pipeline Demo
 Demonstrates the full pipeline: ASR → Translation → Intent → LLM → Translation → TTS
+
+Run from voice-assistant/: python -m scripts.demo_pipeline
 """
 
+import asyncio
+import io
 import sys
 import os
 from pathlib import Path
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
 import logging
 
 # Setup logging
@@ -20,65 +21,126 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+DIVIDER = "-" * 70
+RULE = "=" * 70
+
 
 def print_banner():
     """Print demo banner."""
-    print("\n" + "=" * 70)
+    print("\n" + RULE)
     print("   🎙️  HYPER-LOCALIZED MULTILINGUAL VOICE ASSISTANT")
     print("   📍 Malayalam → English → LLM → English → Malayalam")
-    print("=" * 70)
+    print(RULE)
+
+
+def print_sentence(index, malayalam, audio):
+    """Report each response sentence as soon as its audio is ready."""
+    print(f"   🔊 [{index + 1}] {malayalam}")
 
 
 def print_result(result):
     """Pretty print pipeline result."""
-    print("\n" + "-" * 70)
-    print("📊 PIPELINE RESULTS")
-    print("-" * 70)
+    # Build the whole report first and write it in one call
+    out = io.StringIO()
+
+    def line(text=""):
+        out.write(text)
+        out.write("\n")
+
+    line("\n" + DIVIDER)
+    line("📊 PIPELINE RESULTS")
+    line(DIVIDER)
 
     # Input
-    print(f"\n📥 INPUT:")
-    print(f"   Malayalam: {result.malayalam_text}")
+    line(f"\n📥 INPUT:")
+    line(f"   Malayalam: {result.malayalam_text}")
 
     # Translation
-    print(f"\n🔄 TRANSLATION (ML → EN):")
-    print(f"   English: {result.english_text}")
-    print(f"   ⏱️  Time: {result.translation_ml_en_time_ms:.1f}ms")
+    line(f"\n🔄 TRANSLATION (ML → EN):")
+    line(f"   English: {result.english_text}")
+    line(f"   ⏱️  Time: {result.translation_ml_en_time_ms:.1f}ms")
 
     # Intent Detection
     if result.intent_type:
-        print(f"\n🎯 INTENT DETECTED:")
-        print(f"   Type: {result.intent_type.upper()}")
-        print(f"   Description: {result.intent_description}")
-        print(f"   Confidence: {result.intent_confidence:.0%}")
+        line(f"\n🎯 INTENT DETECTED:")
+        line(f"   Type: {result.intent_type.upper()}")
+        line(f"   Description: {result.intent_description}")
+        line(f"   Confidence: {result.intent_confidence:.0%}")
         if result.intent_entities:
-            print(f"   Entities: {result.intent_entities}")
+            line(f"   Entities: {result.intent_entities}")
 
     # LLM Response
-    print(f"\n🤖 LLM RESPONSE:")
-    print(f"   English: {result.english_response}")
-    print(f"   ⏱️  Time: {result.llm_time_ms:.1f}ms")
+    line(f"\n🤖 LLM RESPONSE:")
+    line(f"   English: {result.english_response}")
+    line(f"   ⏱️  Time: {result.llm_time_ms:.1f}ms")
 
     # Translation back
-    print(f"\n🔄 TRANSLATION (EN → ML):")
-    print(f"   Malayalam: {result.malayalam_response}")
-    print(f"   ⏱️  Time: {result.translation_en_ml_time_ms:.1f}ms")
+    line(f"\n🔄 TRANSLATION (EN → ML):")
+    line(f"   Malayalam: {result.malayalam_response}")
+    line(f"   ⏱️  Time: {result.translation_en_ml_time_ms:.1f}ms")
 
     # TTS
-    print(f"\n🔊 TTS:")
-    print(f"   ⏱️  Time: {result.tts_time_ms:.1f}ms")
+    line(f"\n🔊 TTS:")
+    line(f"   ⏱️  Time: {result.tts_time_ms:.1f}ms")
+    if result.first_audio_time_ms:
+        line(f"   ⏱️  First audio: {result.first_audio_time_ms:.1f}ms")
 
     # Total
-    print(f"\n⏱️  TOTAL TIME: {result.total_time_ms:.1f}ms ({result.total_time_ms/1000:.2f}s)")
+    line(f"\n⏱️  TOTAL TIME: {result.total_time_ms:.1f}ms ({result.total_time_ms/1000:.2f}s)")
 
     if not result.success:
-        print(f"\n❌ ERROR: {result.error}")
+        line(f"\n❌ ERROR: {result.error}")
+
+    line(DIVIDER)
 
-    print("-" * 70)
+    sys.stdout.write(out.getvalue())
+    sys.stdout.flush()
+
+
+# Test inputs processed at once; bounded by GPU memory
+TEST_CONCURRENCY = 2
+
+
+async def run_test_inputs(pipeline, test_inputs, output_dir):
+    """
+    Run independent test inputs through the pipeline concurrently.
+
+    Each test uses its own conversation_id, so the runs don't share LLM
+    history and need no clear_conversation() between them.
+
+    Args:
+        pipeline: Loaded VoiceAssistantPipeline
+        test_inputs: List of (malayalam_text, description) tuples
+        output_dir: Directory for the response audio files
+
+    Returns:
+        Dict mapping test number to (PipelineResult, output_audio_path)
+    """
+    semaphore = asyncio.Semaphore(TEST_CONCURRENCY)
+    results = {}
+
+    async def run(i, malayalam_text):
+        output_audio = output_dir / f"response_{i}.wav"
+        conversation_id = f"test-{i}"
+        async with semaphore:
+            result = await pipeline.process_text_streaming(
+                text=malayalam_text,
+                input_language="ml",
+                output_audio_path=str(output_audio),
+                conversation_id=conversation_id,
+            )
+        pipeline.clear_conversation(conversation_id)
+        results[i] = (result, output_audio)
+
+    await asyncio.gather(*[
+        run(i, text) for i, (text, _) in enumerate(test_inputs, 1)
+    ])
+    return results
 
 
 def demo_text_input():
     """Demo with text input (no audio recording needed)."""
-    from pipeline import VoiceAssistantPipeline
+    from src.pipeline import VoiceAssistantPipeline
 
     print_banner()
 
@@ -99,8 +161,9 @@ def demo_text_input():
     # Initialize pipeline
     print("\n🔧 Initializing pipeline...")
     pipeline = VoiceAssistantPipeline(
-        asr_engine="whisper",
-        asr_model_size="base",
+        asr_engine="faster_whisper",
+        asr_model_size="turbo",
+        compute_type="int8_float16",
         llm_model_size="1.5b",
         tts_engine="mms",
         device="cuda",
@@ -114,37 +177,30 @@ def demo_text_input():
     output_dir = Path(__file__).parent.parent / "demo_outputs"
     output_dir.mkdir(exist_ok=True)
 
-    # Process each test input
-    for i, (malayalam_text, description) in enumerate(test_inputs, 1):
-        print(f"\n\n{'='*70}")
-        print(f"📝 TEST {i}: {description}")
-        print(f"{'='*70}")
-
-        output_audio = output_dir / f"response_{i}.wav"
+    # Process all test inputs concurrently, then report them in order
+    print(f"\n🚀 Running {len(test_inputs)} tests ({TEST_CONCURRENCY} at a time)...")
+    results = asyncio.run(run_test_inputs(pipeline, test_inputs, output_dir))
 
-        result = pipeline.process_text(
-            text=malayalam_text,
-            input_language="ml",
-            output_audio_path=str(output_audio),
-        )
+    for i, (_, description) in enumerate(test_inputs, 1):
+        print(f"\n\n{RULE}")
+        print(f"📝 TEST {i}: {description}")
+        print(f"{RULE}")
 
+        result, output_audio = results[i]
         print_result(result)
 
         if result.success:
             print(f"💾 Audio saved to: {output_audio}")
 
-        # Clear conversation for next test
-        pipeline.clear_conversation()
-
-    print(f"\n\n{'='*70}")
+    print(f"\n\n{RULE}")
     print("✅ DEMO COMPLETE!")
     print(f"📁 Output files saved to: {output_dir}")
-    print(f"{'='*70}\n")
+    print(f"{RULE}\n")
 
 
 def demo_interactive():
     """Interactive demo - type Malayalam text and get responses."""
-    from pipeline import VoiceAssistantPipeline
+    from src.pipeline import VoiceAssistantPipeline
 
     print_banner()
     print("\n🎮 INTERACTIVE MODE")
@@ -153,7 +209,9 @@ def demo_interactive():
     # Initialize pipeline
     print("🔧 Initializing pipeline...")
     pipeline = VoiceAssistantPipeline(
-        asr_engine="whisper",
+        asr_engine="faster_whisper",
+        asr_model_size="turbo",
+        compute_type="int8_float16",
         llm_model_size="1.5b",
         tts_engine="mms",
         device="cuda",
@@ -180,11 +238,12 @@ def demo_interactive():
             response_count += 1
             output_audio = output_dir / f"interactive_{response_count}.wav"
 
-            result = pipeline.process_text(
+            result = asyncio.run(pipeline.process_text_streaming(
                 text=user_input,
                 input_language="ml",
                 output_audio_path=str(output_audio),
-            )
+                on_audio=print_sentence,
+            ))
 
             print(f"\n🔄 English: {result.english_text}")
 
@@ -194,7 +253,8 @@ def demo_interactive():
 
             print(f"\n🤖 Response (EN): {result.english_response}")
             print(f"🗣️  Response (ML): {result.malayalam_response}")
-            print(f"\n⏱️  Total: {result.total_time_ms:.1f}ms")
+            print(f"\n⏱️  First audio: {result.first_audio_time_ms:.1f}ms")
+            print(f"⏱️  Total: {result.total_time_ms:.1f}ms")
             print(f"💾 Audio: {output_audio}")
 
         except KeyboardInterrupt:
@@ -205,7 +265,7 @@ def demo_interactive():
 
 def demo_with_audio():
     """Demo with audio file input."""
-    from pipeline import VoiceAssistantPipeline
+    from src.pipeline import VoiceAssistantPipeline
 
     print_banner()
 
@@ -230,8 +290,9 @@ def demo_with_audio():
     # Initialize pipeline
     print("\n🔧 Initializing pipeline...")
     pipeline = VoiceAssistantPipeline(
-        asr_engine="whisper",
-        asr_model_size="base",
+        asr_engine="faster_whisper",
+        asr_model_size="turbo",
+        compute_type="int8_float16",
         llm_model_size="1.5b",
         tts_engine="mms",
         device="cuda",
@@ -244,16 +305,17 @@ def demo_with_audio():
 
     # Process each audio file
     for i, audio_file in enumerate(audio_files, 1):
-        print(f"\n\n{'='*70}")
+        print(f"\n\n{RULE}")
         print(f"🎙️  Processing: {audio_file.name}")
-        print(f"{'='*70}")
+        print(f"{RULE}")
 
         output_audio = output_dir / f"response_{audio_file.stem}.wav"
 
-        result = pipeline.process(
+        result = asyncio.run(pipeline.process_streaming(
             audio_path=str(audio_file),
             output_audio_path=str(output_audio),
-        )
+            on_audio=print_sentence,
+        ))
 
         print_result(result)
 
@@ -262,9 +324,9 @@ def demo_with_audio():
 
         pipeline.clear_conversation()
 
-    print(f"\n\n{'='*70}")
+    print(f"\n\n{RULE}")
     print("✅ DEMO COMPLETE!")
-    print(f"{'='*70}\n")
+    print(f"{RULE}\n")
 
 
 def main():
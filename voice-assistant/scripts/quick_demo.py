@@ -2,14 +2,14 @@
 """
 Quick Pipeline Demo - Lightweight version for testing
 Tests each component separately with progress display.
+
+Run from voice-assistant/: python -m scripts.quick_demo
 """
 
-import sys
 import time
 from pathlib import Path
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from src.utils import cuda_timer
 
 
 def main():
@@ -22,18 +22,33 @@ def main():
     print(f"\n📥 INPUT (Malayalam):")
     print(f"   {malayalam_input}")
 
+    # Load both translation directions once; step 1 and the response
+    # translation below share this instance
+    print("\n🔧 Loading translation models (ML → EN, EN → ML)...")
+    try:
+        from src.translation import get_translator
+
+        start = time.perf_counter()
+        translator = get_translator(device="cuda")
+        translator.load_models(["indic-en", "en-indic"])
+        print(f"   ⏱️  Load time: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    except Exception as e:
+        print(f"   ❌ Error: {e}")
+        translator = None
+
     # Step 1: Translation ML → EN
     print("\n" + "-" * 50)
     print("🔄 STEP 1: Translation (Malayalam → English)")
     print("-" * 50)
 
     try:
-        from translation import IndicTranslator
+        if translator is None:
+            raise RuntimeError("Translator not available")
 
-        start = time.perf_counter()
-        translator = IndicTranslator(device="cuda")
-        english_text = translator.ml_to_en(malayalam_input)
-        trans_time = (time.perf_counter() - start) * 1000
+        with cuda_timer() as timer:
+            english_text = translator.ml_to_en(malayalam_input)
+        trans_time = timer.ms
 
         print(f"   ✅ English: {english_text}")
         print(f"   ⏱️  Time: {trans_time:.1f}ms")
@@ -49,7 +64,7 @@ def main():
     print("-" * 50)
 
     try:
-        from pipeline.intent import IntentDetector
+        from src.pipeline.intent import IntentDetector
 
         detector = IntentDetector(use_llm=False)
         intent = detector.detect(malayalam_input, english_text)
@@ -62,76 +77,100 @@ def main():
         print(f"   ❌ Error: {e}")
         print(f"   ⚠️  Skipping intent detection")
 
-    # Step 3: LLM Response
+    # Steps 3-5: LLM → Translation → TTS, streamed sentence by sentence.
+    # The LLM keeps generating in its own thread while each finished
+    # sentence is translated and synthesized.
     print("\n" + "-" * 50)
-    print("🤖 STEP 3: LLM Response Generation")
-    print("-" * 50)
-
-    try:
-        from llm import QwenLLM
-
-        start = time.perf_counter()
-        llm = QwenLLM(model_size="1.5b", device="cuda")
-        llm.set_system_prompt("""You are a helpful voice assistant. Give brief, natural responses suitable for speech. Keep responses to 1-2 sentences.""")
-
-        response = llm.chat(english_text)
-        english_response = response.content
-        llm_time = (time.perf_counter() - start) * 1000
-
-        print(f"   ✅ Response: {english_response}")
-        print(f"   ⏱️  Time: {llm_time:.1f}ms")
-
-    except Exception as e:
-        print(f"   ❌ Error: {e}")
-        english_response = "The weather today is pleasant with partly cloudy skies."
-        print(f"   ⚠️  Using fallback: {english_response}")
-
-    # Step 4: Translation EN → ML
-    print("\n" + "-" * 50)
-    print("🔄 STEP 4: Translation (English → Malayalam)")
-    print("-" * 50)
-
-    try:
-        start = time.perf_counter()
-        malayalam_response = translator.en_to_ml(english_response)
-        trans_time = (time.perf_counter() - start) * 1000
-
-        print(f"   ✅ Malayalam: {malayalam_response}")
-        print(f"   ⏱️  Time: {trans_time:.1f}ms")
-
-    except Exception as e:
-        print(f"   ❌ Error: {e}")
-        malayalam_response = english_response
-        print(f"   ⚠️  Using English response")
-
-    # Step 5: TTS
-    print("\n" + "-" * 50)
-    print("🔊 STEP 5: Text-to-Speech (MMS-TTS)")
+    print("🤖 STEPS 3-5: LLM → Translation (EN → ML) → TTS (streamed)")
     print("-" * 50)
 
     output_dir = Path(__file__).parent.parent / "demo_outputs"
     output_dir.mkdir(exist_ok=True)
     output_file = output_dir / "quick_demo_response.wav"
 
+    english_response = ""
+    malayalam_response = ""
+
     try:
-        from tts import TTSEngine
+        import numpy as np
+        import soundfile as sf
+        from src.llm import QwenLLM
+        from src.pipeline.orchestrator import is_sentence_boundary
+        from src.tts import get_tts
+
+        # Own instance, so the demo prompt doesn't change the shared get_llm() one
+        llm = QwenLLM(
+            model_size="1.5b",
+            device="cuda",
+            system_prompt="""You are a helpful voice assistant. Give brief, natural responses suitable for speech. Keep responses to 1-2 sentences.""",
+        )
+        # Repeated sentences are served from the on-disk synthesis cache
+        tts = get_tts(backend="mms", device="cuda", compute_type="float16", use_cache=True)
+
+        # Warm the EN→ML → TTS path once so the first streamed sentence
+        # doesn't pay model load, CUDA context and cuDNN autotuning
+        with cuda_timer() as timer:
+            if translator is not None:
+                translator.en_to_ml("Hello.")
+            tts.warmup(language="ml")
+        print(f"   🔥 Warmup: {timer.ms:.1f}ms")
+
+        english_parts, malayalam_parts, audio_parts = [], [], []
+        sample_rate = None
+        first_audio_time = None
+
+        def speak(sentence):
+            nonlocal sample_rate, first_audio_time
+            if translator is None:
+                malayalam = sentence
+            else:
+                try:
+                    malayalam = translator.en_to_ml(sentence)
+                except Exception as e:
+                    print(f"   ⚠️  Translation failed ({e}), using English")
+                    malayalam = sentence
+            result = tts.synthesize(text=malayalam, language="ml")
+            if first_audio_time is None:
+                first_audio_time = (time.perf_counter() - start) * 1000
+            sample_rate = result.sample_rate
+            malayalam_parts.append(malayalam)
+            audio_parts.append(result.audio)
+            print(f"   🔊 [{len(audio_parts)}] {sentence} → {malayalam}")
 
         start = time.perf_counter()
-        tts = TTSEngine(backend="mms", device="cuda")
-        result = tts.synthesize(
-            text=malayalam_response,
-            language="ml",
-            output_path=str(output_file)
-        )
-        tts_time = (time.perf_counter() - start) * 1000
+        buffer = ""
+        count = 0
+        for piece in llm.stream(english_text):
+            english_parts.append(piece)
+            if is_sentence_boundary(buffer, piece, count):
+                if (buffer + piece).strip():
+                    speak((buffer + piece).strip())
+                buffer = ""
+                count = 0
+            else:
+                buffer += piece
+                count += 1
+        if buffer.strip():
+            speak(buffer.strip())
+        total_time = (time.perf_counter() - start) * 1000
+
+        english_response = "".join(english_parts).strip()
+        malayalam_response = " ".join(malayalam_parts)
+        if audio_parts:
+            sf.write(str(output_file), np.concatenate(audio_parts), samplerate=sample_rate)
 
-        print(f"   ✅ Audio generated!")
+        print(f"   ✅ Response: {english_response}")
+        print(f"   ✅ Malayalam: {malayalam_response}")
         print(f"   💾 Saved to: {output_file}")
-        print(f"   ⏱️  Time: {tts_time:.1f}ms")
+        if first_audio_time is not None:
+            print(f"   ⏱️  First audio: {first_audio_time:.1f}ms")
+        print(f"   ⏱️  Time: {total_time:.1f}ms")
 
     except Exception as e:
         print(f"   ❌ Error: {e}")
-        print(f"   ⚠️  TTS failed")
+        english_response = english_response or "The weather today is pleasant with partly cloudy skies."
+        malayalam_response = malayalam_response or english_response
+        print(f"   ⚠️  Using fallback: {english_response}")
 
     # Summary
     print("\n" + "=" * 70)
@@ -2,15 +2,11 @@
 """
 Qwen LLM Test Script
 Test conversational AI with Qwen 2.5.
-"""
-
-import sys
-from pathlib import Path
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+Run from voice-assistant/: python -m scripts.test_llm
+"""
 
-from llm import QwenLLM
+from src.llm import get_llm
 
 
 def main():
@@ -18,9 +14,11 @@ def main():
     print("Qwen 2.5 LLM Test")
     print("=" * 60)
 
-    # Initialize with 1.5B model (good balance of speed/quality)
-    print("\n📌 Loading Qwen 2.5-1.5B-Instruct...")
-    llm = QwenLLM(model_size="1.5b", device="cuda")
+    # Initialize with 1.5B model (good balance of speed/quality).
+    # Compiled once up front so every chat below runs the fast path.
+    print("\n📌 Loading Qwen 2.5-1.5B-Instruct (compiling, first run takes ~30s)...")
+    llm = get_llm(model_size="1.5b", device="cuda", compile=True)
+    llm.load_model()
 
     # Test conversations
     test_inputs = [
@@ -2,16 +2,12 @@
 """
 Translation Test Script
 Test IndicTrans2 Malayalam <-> English translation.
-"""
-
-import sys
-import time
-from pathlib import Path
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+Run from voice-assistant/: python -m scripts.test_translation
+"""
 
-from translation import IndicTranslator, ml_to_en, en_to_ml
+from src.translation import get_translator
+from src.utils import cuda_timer
 
 
 def main():
@@ -34,33 +30,35 @@ def main():
 
     # Initialize translator
     print("\n📌 Loading IndicTrans2 models...")
-    translator = IndicTranslator(device="cuda")
+    translator = get_translator(device="cuda")
 
     # Test Malayalam → English
     print("\n" + "-" * 40)
     print("Malayalam → English")
     print("-" * 40)
 
-    for text in malayalam_texts:
+    with cuda_timer() as timer:
+        translations = translator.ml_to_en_batch(malayalam_texts)
+    elapsed = timer.ms
+
+    for text, translated in zip(malayalam_texts, translations):
         print(f"\n[ML] {text}")
-        start = time.perf_counter()
-        translated = translator.ml_to_en(text)
-        elapsed = (time.perf_counter() - start) * 1000
         print(f"[EN] {translated}")
-        print(f"     ⏱️  {elapsed:.1f}ms")
+    print(f"\n     ⏱️  {elapsed:.1f}ms for {len(malayalam_texts)} texts (batched)")
 
     # Test English → Malayalam
     print("\n" + "-" * 40)
     print("English → Malayalam")
     print("-" * 40)
 
-    for text in english_texts:
+    with cuda_timer() as timer:
+        translations = translator.en_to_ml_batch(english_texts)
+    elapsed = timer.ms
+
+    for text, translated in zip(english_texts, translations):
         print(f"\n[EN] {text}")
-        start = time.perf_counter()
-        translated = translator.en_to_ml(text)
-        elapsed = (time.perf_counter() - start) * 1000
         print(f"[ML] {translated}")
-        print(f"     ⏱️  {elapsed:.1f}ms")
+    print(f"\n     ⏱️  {elapsed:.1f}ms for {len(english_texts)} texts (batched)")
 
     # Round-trip test
     print("\n" + "-" * 40)
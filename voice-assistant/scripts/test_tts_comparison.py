@@ -2,16 +2,79 @@
 """
 TTS A/B Testing Script
 Compare MMS-TTS (offline) vs Cartesia (online) for Malayalam.
+
+Run from voice-assistant/: python -m scripts.test_tts_comparison
 """
 
-import sys
+import asyncio
 import os
 from pathlib import Path
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from src.tts import compare_tts, get_tts
+
+BACKENDS = ["mms", "cartesia"]
+
+BACKEND_LABELS = {
+    "mms": ("MMS-TTS", "offline"),
+    "cartesia": ("Cartesia", "online"),
+}
+
+# Concurrent jobs per backend: MMS shares one GPU model, Cartesia is network-bound
+BACKEND_CONCURRENCY = {
+    "mms": 1,
+    "cartesia": 3,
+}
+
+
+async def synthesize_all(texts, text_labels, output_dir):
+    """
+    Synthesize every (text, backend) pair concurrently.
+
+    Each backend gets one shared engine and its own semaphore, so GPU-bound
+    MMS jobs run one at a time while Cartesia requests overlap with them.
+
+    Args:
+        texts: Malayalam texts to synthesize
+        text_labels: Labels used for output filenames
+        output_dir: Directory for the generated .wav files
+
+    Returns:
+        Dict mapping (text_index, backend) to a TTSResult or the raised exception
+    """
+    engines = {}
+    for backend in BACKENDS:
+        try:
+            engines[backend] = get_tts(
+                backend=backend, device="cuda", compute_type="int8_float16", use_cache=True
+            )
+        except Exception as e:
+            engines[backend] = e
+
+    semaphores = {
+        backend: asyncio.Semaphore(BACKEND_CONCURRENCY[backend]) for backend in BACKENDS
+    }
 
-from tts import TTSEngine, compare_tts
+    async def run(idx, backend, text):
+        engine = engines[backend]
+        if isinstance(engine, Exception):
+            raise engine
+        label = text_labels[idx] if idx < len(text_labels) else f"Text {idx+1}"
+        file_label = label.lower().replace(" ", "_")
+        async with semaphores[backend]:
+            return await asyncio.to_thread(
+                engine.synthesize,
+                text=text,
+                language="ml",
+                output_path=output_dir / f"ml_{backend}_{file_label}.wav",
+            )
+
+    tasks = []
+    for idx, text in enumerate(texts):
+        for backend in BACKENDS:
+            tasks.append((idx, backend, asyncio.create_task(run(idx, backend, text))))
+
+    outcomes = await asyncio.gather(*(task for _, _, task in tasks), return_exceptions=True)
+    return {(idx, backend): outcome for (idx, backend, _), outcome in zip(tasks, outcomes)}
 
 
 def main():
@@ -48,36 +111,20 @@ def main():
 
     text_labels = ["Short", "Medium", "Long paragraph"]
 
+    results = asyncio.run(synthesize_all(test_texts["ml"], text_labels, output_dir))
+
     for i, text in enumerate(test_texts["ml"]):
         label = text_labels[i] if i < len(text_labels) else f"Text {i+1}"
         print(f"\n[{label}]: {text[:60]}...")
 
-        # Filename-safe label
-        file_label = label.lower().replace(" ", "_")
-
-        # Test MMS-TTS (offline)
-        try:
-            engine = TTSEngine(backend="mms", device="cuda")
-            result = engine.synthesize(
-                text=text,
-                language="ml",
-                output_path=output_dir / f"ml_mms_{file_label}.wav"
-            )
-            print(f"  ✅ MMS-TTS: {result.duration_ms:.1f}ms (offline)")
-        except Exception as e:
-            print(f"  ❌ MMS-TTS failed: {e}")
-
-        # Test Cartesia (online)
-        try:
-            engine = TTSEngine(backend="cartesia")
-            result = engine.synthesize(
-                text=text,
-                language="ml",
-                output_path=output_dir / f"ml_cartesia_{file_label}.wav"
-            )
-            print(f"  ✅ Cartesia: {result.duration_ms:.1f}ms (online)")
-        except Exception as e:
-            print(f"  ❌ Cartesia failed: {e}")
+        for backend in BACKENDS:
+            name, kind = BACKEND_LABELS[backend]
+            result = results[(i, backend)]
+            if isinstance(result, Exception):
+                print(f"  ❌ {name} failed: {result}")
+            else:
+                source = "cached" if result.cached else kind
+                print(f"  ✅ {name}: {result.duration_ms:.1f}ms ({source})")
 
     print(f"\n📁 Output files saved to: {output_dir}")
 
@@ -3,10 +3,17 @@ LangGraph Agent Orchestrator
 Coordinates multiple agents using stateful graph-based workflows.
 """
 
+import asyncio
+import hashlib
 import logging
+import operator
+import time
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional, TypedDict, Annotated
 from enum import Enum
 
+from ..utils import KeywordMatcher
+
 logger = logging.getLogger(__name__)
 
 
@@ -15,8 +22,10 @@ class AgentState(TypedDict):
     user_input: str
     language: str
     intent: Optional[str]
+    intents: List[str]
     entities: List[Dict[str, Any]]
-    agent_outputs: Dict[str, Any]
+    # Each agent appends its reply; parallel agents' replies are concatenated
+    agent_messages: Annotated[List[str], operator.add]
     final_response: Optional[str]
     error: Optional[str]
 
@@ -30,6 +39,31 @@ class IntentType(Enum):
     UNKNOWN = "unknown"
 
 
+# Intent keywords, in priority order: when keywords of several intents
+# occur in one input, the intent listed first wins
+INTENT_KEYWORDS = {
+    IntentType.INFORMATION_QUERY.value: ["what", "who", "where", "when", "how", "why", "tell me"],
+    IntentType.TASK_MANAGEMENT.value: ["remind", "schedule", "task", "todo", "calendar"],
+    IntentType.SMART_HOME.value: ["light", "fan", "ac", "door", "temperature"],
+}
+
+_INTENT_PRIORITY = {intent: rank for rank, intent in enumerate(INTENT_KEYWORDS)}
+
+# Agent node handling each intent; anything else goes to the chat agent
+INTENT_AGENTS = {
+    IntentType.INFORMATION_QUERY.value: "info_agent",
+    IntentType.TASK_MANAGEMENT.value: "task_agent",
+    IntentType.SMART_HOME.value: "smart_home_agent",
+}
+
+# Built once at import and shared by every orchestrator
+_INTENT_MATCHER = KeywordMatcher({
+    keyword: intent
+    for intent, keywords in INTENT_KEYWORDS.items()
+    for keyword in keywords
+})
+
+
 class AgentOrchestrator:
     """
     LangGraph-based orchestrator for managing multiple specialized agents.
@@ -41,21 +75,34 @@ class AgentOrchestrator:
     4. Results are aggregated and returned
     """
 
+    # Checkpointed runs kept in memory, and how long a result is reused
+    MAX_CHECKPOINT_THREADS = 256
+    CHECKPOINT_TTL_S = 600.0
+
     def __init__(self, config: Optional[Dict] = None):
         """
         Initialize the orchestrator.
 
         Args:
-            config: Optional configuration dictionary
+            config: Optional configuration dictionary; set "checkpoint" to
+                False to always re-run the graph instead of reusing
+                checkpointed results, "checkpoint_threads" to bound how many
+                runs are kept and "checkpoint_ttl_s" to expire them
         """
         self.config = config or {}
         self.graph = None
         self.agents = {}
+        self._intent_matcher = _INTENT_MATCHER
+        # thread_id -> creation time, least recently used first
+        self._threads: "OrderedDict[str, float]" = OrderedDict()
+        self.max_threads = self.config.get("checkpoint_threads", self.MAX_CHECKPOINT_THREADS)
+        self.thread_ttl_s = self.config.get("checkpoint_ttl_s", self.CHECKPOINT_TTL_S)
 
     def setup(self):
         """Setup the LangGraph workflow."""
         try:
             from langgraph.graph import StateGraph, END
+            from langgraph.types import Send
 
             # Create the state graph
             workflow = StateGraph(AgentState)
@@ -65,33 +112,37 @@ class AgentOrchestrator:
             workflow.add_node("info_agent", self._run_info_agent)
             workflow.add_node("task_agent", self._run_task_agent)
             workflow.add_node("chat_agent", self._run_chat_agent)
+            workflow.add_node("smart_home_agent", self._run_smart_home_agent)
             workflow.add_node("response_generator", self._generate_response)
 
             # Set entry point
             workflow.set_entry_point("intent_classifier")
 
-            # Add conditional edges based on intent
+            # Fan out: every agent matching an intent gets the state and
+            # the agents run concurrently in the same step
             workflow.add_conditional_edges(
                 "intent_classifier",
-                self._route_to_agent,
-                {
-                    IntentType.INFORMATION_QUERY.value: "info_agent",
-                    IntentType.TASK_MANAGEMENT.value: "task_agent",
-                    IntentType.GENERAL_CHAT.value: "chat_agent",
-                    IntentType.UNKNOWN.value: "chat_agent",
-                }
+                lambda state: [Send(agent, state) for agent in self._route_to_agents(state)],
+                ["info_agent", "task_agent", "chat_agent", "smart_home_agent"],
             )
 
-            # All agents lead to response generator
+            # All agents lead to response generator, which runs once they finish
             workflow.add_edge("info_agent", "response_generator")
             workflow.add_edge("task_agent", "response_generator")
             workflow.add_edge("chat_agent", "response_generator")
+            workflow.add_edge("smart_home_agent", "response_generator")
 
             # Response generator ends the workflow
             workflow.add_edge("response_generator", END)
 
-            # Compile the graph
-            self.graph = workflow.compile()
+            # Compile the graph. The checkpointer records each run under a
+            # thread keyed on its input, so retries of the same request are
+            # answered from the checkpoint and interrupted runs resume
+            checkpointer = None
+            if self.config.get("checkpoint", True):
+                from langgraph.checkpoint.memory import InMemorySaver
+                checkpointer = InMemorySaver()
+            self.graph = workflow.compile(checkpointer=checkpointer)
             logger.info("Agent orchestrator setup complete")
 
         except ImportError:
@@ -103,29 +154,29 @@ class AgentOrchestrator:
         logger.info("Using simple orchestrator fallback")
         self.graph = None
 
-    def _classify_intent(self, state: AgentState) -> AgentState:
-        """Classify user intent from input."""
+    def _classify_intent(self, state: AgentState) -> Dict[str, Any]:
+        """Classify user intent from input (no-op if aprocess already did)."""
+        if state.get("intent") is not None:
+            return {}
+
         user_input = state["user_input"].lower()
 
-        # Simple keyword-based classification (replace with ML model in production)
-        if any(word in user_input for word in ["what", "who", "where", "when", "how", "why", "tell me"]):
-            intent = IntentType.INFORMATION_QUERY.value
-        elif any(word in user_input for word in ["remind", "schedule", "task", "todo", "calendar"]):
-            intent = IntentType.TASK_MANAGEMENT.value
-        elif any(word in user_input for word in ["light", "fan", "ac", "door", "temperature"]):
-            intent = IntentType.SMART_HOME.value
-        else:
-            intent = IntentType.GENERAL_CHAT.value
+        # Simple keyword-based classification (replace with ML model in production).
+        # One automaton pass finds all keyword hits; the highest-priority intent
+        # is the primary one, and every matched intent gets its agent.
+        hits = {hit for _, hit in self._intent_matcher.iter(user_input)}
+        intents = sorted(hits, key=_INTENT_PRIORITY.__getitem__)
+        intent = intents[0] if intents else IntentType.GENERAL_CHAT.value
 
-        state["intent"] = intent
-        logger.info(f"Classified intent: {intent}")
-        return state
+        logger.info(f"Classified intent: {intent} (all: {intents})")
+        return {"intent": intent, "intents": intents}
 
-    def _route_to_agent(self, state: AgentState) -> str:
-        """Route to appropriate agent based on intent."""
-        return state.get("intent", IntentType.UNKNOWN.value)
+    def _route_to_agents(self, state: AgentState) -> List[str]:
+        """Agent nodes to run for the classified intents, in priority order."""
+        agents = [INTENT_AGENTS[intent] for intent in state.get("intents", [])]
+        return agents or ["chat_agent"]
 
-    def _run_info_agent(self, state: AgentState) -> AgentState:
+    async def _run_info_agent(self, state: AgentState) -> Dict[str, Any]:
         """Run the information query agent."""
         logger.info("Running info agent")
         user_input = state["user_input"]
@@ -133,13 +184,9 @@ class AgentOrchestrator:
         # Placeholder - integrate with actual knowledge base/search
         response = f"[Info Agent] Processing query: {user_input}"
 
-        state["agent_outputs"]["info_agent"] = {
-            "response": response,
-            "sources": [],
-        }
-        return state
+        return {"agent_messages": [response]}
 
-    def _run_task_agent(self, state: AgentState) -> AgentState:
+    async def _run_task_agent(self, state: AgentState) -> Dict[str, Any]:
         """Run the task management agent."""
         logger.info("Running task agent")
         user_input = state["user_input"]
@@ -147,13 +194,9 @@ class AgentOrchestrator:
         # Placeholder - integrate with actual task/calendar system
         response = f"[Task Agent] Processing task request: {user_input}"
 
-        state["agent_outputs"]["task_agent"] = {
-            "response": response,
-            "task_created": False,
-        }
-        return state
+        return {"agent_messages": [response]}
 
-    def _run_chat_agent(self, state: AgentState) -> AgentState:
+    async def _run_chat_agent(self, state: AgentState) -> Dict[str, Any]:
         """Run the general chat agent."""
         logger.info("Running chat agent")
         user_input = state["user_input"]
@@ -161,27 +204,41 @@ class AgentOrchestrator:
         # Placeholder - integrate with LLM for conversation
         response = f"[Chat Agent] I understand you said: {user_input}"
 
-        state["agent_outputs"]["chat_agent"] = {
-            "response": response,
-        }
-        return state
+        return {"agent_messages": [response]}
 
-    def _generate_response(self, state: AgentState) -> AgentState:
-        """Generate final response from agent outputs."""
-        outputs = state.get("agent_outputs", {})
+    async def _run_smart_home_agent(self, state: AgentState) -> Dict[str, Any]:
+        """Run the smart home control agent."""
+        logger.info("Running smart home agent")
+        user_input = state["user_input"]
 
-        # Combine responses from all agents that ran
-        responses = []
-        for agent_name, output in outputs.items():
-            if "response" in output:
-                responses.append(output["response"])
+        # Placeholder - integrate with actual device control
+        response = f"[Smart Home Agent] Processing device request: {user_input}"
 
-        state["final_response"] = " ".join(responses) if responses else "I couldn't process your request."
-        return state
+        return {"agent_messages": [response]}
 
-    def process(self, user_input: str, language: str = "en") -> Dict[str, Any]:
+    def _generate_response(self, state: AgentState) -> Dict[str, Any]:
+        """Generate final response from agent outputs."""
+        # Replies from all agents that ran, in intent priority order
+        responses = state.get("agent_messages", [])
+        final_response = " ".join(responses) if responses else "I couldn't process your request."
+        return {"final_response": final_response}
+
+    async def _run_agents(self, state: AgentState) -> Dict[str, Any]:
+        """Direct dispatcher: run the routed agents concurrently, without the graph."""
+        agents = {
+            "info_agent": self._run_info_agent,
+            "task_agent": self._run_task_agent,
+            "chat_agent": self._run_chat_agent,
+            "smart_home_agent": self._run_smart_home_agent,
+        }
+        updates = await asyncio.gather(
+            *(agents[name](state) for name in self._route_to_agents(state))
+        )
+        return {"agent_messages": [m for update in updates for m in update["agent_messages"]]}
+
+    async def aprocess(self, user_input: str, language: str = "en") -> Dict[str, Any]:
         """
-        Process user input through the agent workflow.
+        Process user input through the agent workflow without blocking the event loop.
 
         Args:
             user_input: User's text input
@@ -194,20 +251,39 @@ class AgentOrchestrator:
             "user_input": user_input,
             "language": language,
             "intent": None,
+            "intents": [],
             "entities": [],
-            "agent_outputs": {},
+            "agent_messages": [],
             "final_response": None,
             "error": None,
         }
-
-        if self.graph:
-            # Run through LangGraph
-            result = self.graph.invoke(initial_state)
+        initial_state.update(self._classify_intent(initial_state))
+
+        if not self.graph or len(self._route_to_agents(initial_state)) == 1:
+            # Single agent (the common case), or no LangGraph: call the nodes
+            # directly instead of paying for graph dispatch and checkpointing
+            result = dict(initial_state)
+            result.update(await self._run_agents(result))
+            result.update(self._generate_response(result))
+        elif self.graph.checkpointer:
+            thread_id = hashlib.blake2b(
+                f"{language}\0{user_input}".encode(), digest_size=12
+            ).hexdigest()
+            config = {"configurable": {"thread_id": thread_id}}
+            await self._track_thread(thread_id)
+
+            snapshot = await self.graph.aget_state(config)
+            if snapshot.next:
+                # Interrupted run: continue from the last checkpoint
+                result = await self.graph.ainvoke(None, config)
+            elif snapshot.values.get("final_response") is not None:
+                logger.info("Reusing checkpointed result")
+                result = snapshot.values
+            else:
+                result = await self.graph.ainvoke(initial_state, config)
         else:
-            # Simple fallback processing
-            result = self._classify_intent(initial_state)
-            result = self._run_chat_agent(result)
-            result = self._generate_response(result)
+            # Multiple agents: fan out through LangGraph
+            result = await self.graph.ainvoke(initial_state)
 
         return {
             "response": result.get("final_response", ""),
@@ -215,6 +291,43 @@ class AgentOrchestrator:
             "language": result.get("language"),
         }
 
+    async def _track_thread(self, thread_id: str):
+        """
+        Record use of a checkpoint thread, deleting expired and excess ones.
+
+        The in-memory checkpointer keeps every thread until deleted, so
+        without this a long-running server grows without bound and keeps
+        answering a repeated input from its first run forever.
+        """
+        now = time.monotonic()
+        created = self._threads.get(thread_id)
+        if created is not None and now - created > self.thread_ttl_s:
+            # Expired: drop the checkpoint so the graph runs again
+            await self.graph.checkpointer.adelete_thread(thread_id)
+            created = None
+        self._threads[thread_id] = created if created is not None else now
+        self._threads.move_to_end(thread_id)
+
+        while len(self._threads) > self.max_threads:
+            old, _ = self._threads.popitem(last=False)
+            await self.graph.checkpointer.adelete_thread(old)
+
+    def process(self, user_input: str, language: str = "en") -> Dict[str, Any]:
+        """
+        Process user input through the agent workflow.
+
+        Synchronous wrapper around aprocess() for scripts; async callers
+        should await aprocess() directly.
+
+        Args:
+            user_input: User's text input
+            language: Language code
+
+        Returns:
+            Dictionary with response and metadata
+        """
+        return asyncio.run(self.aprocess(user_input, language))
+
 
 # Example usage and testing
 def demo():
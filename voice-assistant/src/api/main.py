@@ -3,13 +3,15 @@ FastAPI Application for Voice Assistant
 Main API endpoints for the hyper-localized multilingual voice assistant.
 """
 
+import asyncio
+import io
 import logging
+import re
 from typing import Optional
-from pathlib import Path
-import tempfile
 
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, WebSocket
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
@@ -60,30 +62,49 @@ class HealthResponse(BaseModel):
 asr_engine = None
 tts_engine = None
 orchestrator = None
+# Builds a VAD per WebSocket connection (Silero VAD is stateful)
+new_speech_detector = None
+
+# Turns buffered between WebSocket pipeline stages
+WS_QUEUE_SIZE = 8
+
+# WebSocket replies are synthesized and sent sentence by sentence
+_SENTENCE_SPLIT = re.compile(r"(?<=[.?!।])\s+")
+
+# IndicTTS output sample rate
+TTS_SAMPLE_RATE = 22050
+
+# Synthesized replies, so repeated phrases skip TTS inference
+tts_cache = None
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize models on startup."""
-    global asr_engine, tts_engine, orchestrator
+    global asr_engine, tts_engine, orchestrator, new_speech_detector, tts_cache
 
     logger.info("Initializing voice assistant components...")
 
     try:
-        from src.asr import WhisperASR
-        from src.tts import IndicTTS
+        from src.asr import get_asr
+        from src.tts import IndicTTS, SynthesisCache
         from src.agents import AgentOrchestrator
+        from src.utils import speech_detector_factory
 
         # Initialize ASR (lazy loading - model loads on first use)
-        asr_engine = WhisperASR(model_size="base")
+        asr_engine = get_asr(model_size="base")
 
         # Initialize TTS (lazy loading)
         tts_engine = IndicTTS(default_language="hi")
+        tts_cache = SynthesisCache(max_entries=512)
 
         # Initialize agent orchestrator
         orchestrator = AgentOrchestrator()
         orchestrator.setup()
 
+        # VAD for splitting WebSocket audio into turns
+        new_speech_detector = speech_detector_factory(16000)
+
         logger.info("Voice assistant components initialized")
 
     except Exception as e:
@@ -91,6 +112,63 @@ async def startup_event():
         # Continue anyway - components will be None
 
 
+async def _read_upload(audio: UploadFile):
+    """
+    Decode an uploaded audio file without writing it to disk.
+
+    Args:
+        audio: Uploaded audio file
+
+    Returns:
+        (samples, sample_rate) tuple accepted by the ASR engines
+    """
+    import soundfile as sf
+
+    content = await audio.read()
+    return sf.read(io.BytesIO(content), dtype="float32")
+
+
+def _wav_bytes(audio, sample_rate: int) -> bytes:
+    """Encode audio as an in-memory WAV file."""
+    import soundfile as sf
+
+    buf = io.BytesIO()
+    sf.write(buf, audio, samplerate=sample_rate, format="WAV")
+    return buf.getvalue()
+
+
+async def _synthesize(text: str, language: str, emotion: str = "neutral") -> bytes:
+    """
+    Synthesize text to WAV bytes, reusing cached audio for repeated phrases.
+
+    The engine class is part of the cache key, so switching TTS models
+    does not serve stale audio.
+    """
+    key = tts_cache.key(
+        text, engine=type(tts_engine).__name__, language=language, emotion=emotion
+    )
+    cached = tts_cache.get(key)
+    if cached is None:
+        audio = await asyncio.to_thread(
+            tts_engine.synthesize, text=text, language=language, emotion=emotion
+        )
+        cached = (audio, TTS_SAMPLE_RATE)
+        tts_cache.put(key, *cached)
+    return _wav_bytes(*cached)
+
+
+async def _transcribe(audio_input, language: Optional[str]) -> dict:
+    """
+    Run ASR without blocking the event loop.
+
+    Engines with transcribe_async() batch concurrent requests into one
+    generate call; others run in a worker thread.
+    """
+    if hasattr(asr_engine, "transcribe_async"):
+        return await asr_engine.transcribe_async(audio_input, language)
+    return await asyncio.to_thread(asr_engine.transcribe, audio_input, language)
+
+
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint."""
@@ -116,17 +194,11 @@ async def transcribe_audio(
         raise HTTPException(status_code=503, detail="ASR engine not initialized")
 
     try:
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
-            content = await audio.read()
-            tmp.write(content)
-            tmp_path = tmp.name
+        # Decode the upload in memory
+        audio_input = await _read_upload(audio)
 
         # Transcribe
-        result = asr_engine.transcribe(tmp_path, language=language)
-
-        # Clean up
-        Path(tmp_path).unlink()
+        result = await _transcribe(audio_input, language)
 
         return TranscriptionResponse(
             text=result["text"],
@@ -158,22 +230,16 @@ async def process_audio(
         raise HTTPException(status_code=503, detail="Components not initialized")
 
     try:
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
-            content = await audio.read()
-            tmp.write(content)
-            tmp_path = tmp.name
+        # Decode the upload in memory
+        audio_input = await _read_upload(audio)
 
         # Step 1: Transcribe
-        asr_result = asr_engine.transcribe(tmp_path, language=language)
+        asr_result = await _transcribe(audio_input, language)
         transcription = asr_result["text"]
         detected_lang = asr_result["language"]
 
         # Step 2: Process through agent orchestrator
-        agent_result = orchestrator.process(transcription, detected_lang)
-
-        # Clean up
-        Path(tmp_path).unlink()
+        agent_result = await orchestrator.aprocess(transcription, detected_lang)
 
         return ProcessResponse(
             transcription=transcription,
@@ -208,22 +274,14 @@ async def synthesize_speech(
         raise HTTPException(status_code=503, detail="TTS engine not initialized")
 
     try:
-        from fastapi.responses import FileResponse
-
-        # Generate audio
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
-            tts_engine.synthesize(
-                text=text,
-                language=language,
-                emotion=emotion,
-                output_path=tmp.name,
-            )
-
-            return FileResponse(
-                tmp.name,
-                media_type="audio/wav",
-                filename="response.wav",
-            )
+        return Response(
+            content=await _synthesize(text, language, emotion),
+            media_type="audio/wav",
+            headers={
+                "Content-Disposition": 'attachment; filename="response.wav"',
+                "Cache-Control": "public, max-age=86400",
+            },
+        )
 
     except Exception as e:
         logger.error(f"TTS failed: {e}")
@@ -235,24 +293,125 @@ async def websocket_endpoint(websocket: WebSocket):
     """
     WebSocket endpoint for real-time streaming.
 
-    Handles continuous audio streaming from edge devices.
+    Edge devices stream 16kHz mono PCM16 audio as binary messages and end
+    an utterance with an empty binary message, which flushes the turn in
+    progress; an optional ?language= query parameter forces the ASR
+    language. Three stages connected by queues run concurrently, so one
+    turn is answered while the next is still being spoken or transcribed:
+
+    1. ingest: split the stream into speech turns with VAD
+    2. transcribe: ASR on each finished turn
+    3. respond: agent orchestrator, then TTS sent back as one WAV message
+       per sentence
+
+    Transcripts and response text are sent as JSON messages.
     """
     await websocket.accept()
     logger.info("WebSocket client connected")
 
-    try:
-        while True:
-            # Receive data from client
-            data = await websocket.receive_bytes()
+    if asr_engine is None or orchestrator is None or new_speech_detector is None:
+        await websocket.send_json({"type": "error", "detail": "Components not initialized"})
+        await websocket.close()
+        return
 
-            # Process audio chunk
-            # In production, implement proper streaming ASR
-            response = {"status": "received", "bytes": len(data)}
+    from src.utils import TurnSegmenter
 
-            await websocket.send_json(response)
+    language = websocket.query_params.get("language")
+    turns = asyncio.Queue(maxsize=WS_QUEUE_SIZE)
+    transcripts = asyncio.Queue(maxsize=WS_QUEUE_SIZE)
 
-    except Exception as e:
+    segmenter = TurnSegmenter(new_speech_detector())
+    ingest = asyncio.create_task(_ws_ingest(websocket, segmenter, turns))
+    workers = [
+        asyncio.create_task(_ws_transcribe(websocket, turns, transcripts, language)),
+        asyncio.create_task(_ws_respond(websocket, transcripts)),
+    ]
+
+    try:
+        await ingest
+    except WebSocketDisconnect as e:
         logger.info(f"WebSocket disconnected: {e}")
+    finally:
+        for task in workers:
+            task.cancel()
+
+
+async def _ws_ingest(websocket: WebSocket, segmenter, turns: asyncio.Queue):
+    """Stage 1: receive audio chunks and queue each finished speech turn."""
+    import numpy as np
+
+    # A message may end mid-sample; its odd byte starts the next message
+    partial = b""
+
+    while True:
+        data = await websocket.receive_bytes()
+
+        if not data:
+            # End of stream: don't wait for trailing silence
+            partial = b""
+            finished = segmenter.flush()
+        else:
+            data = partial + data
+            usable = len(data) - len(data) % 2
+            partial = data[usable:]
+            pcm = np.frombuffer(data, dtype=np.int16, count=usable // 2)
+            # VAD scoring off the event loop; the segmenter is only used here
+            finished = await asyncio.to_thread(segmenter.feed, pcm)
+
+        for turn in finished:
+            await turns.put(turn)
+
+
+async def _ws_transcribe(
+    websocket: WebSocket,
+    turns: asyncio.Queue,
+    transcripts: asyncio.Queue,
+    language: Optional[str],
+):
+    """Stage 2: transcribe each turn and pass the text on."""
+    while True:
+        turn = await turns.get()
+        try:
+            result = await _transcribe((turn, 16000), language)
+        except Exception as e:
+            logger.error(f"Transcription failed: {e}")
+            await websocket.send_json({"type": "error", "detail": str(e)})
+            continue
+
+        if not result["text"]:
+            continue
+
+        await websocket.send_json({
+            "type": "transcript",
+            "text": result["text"],
+            "language": result["language"],
+        })
+        await transcripts.put((result["text"], result["language"]))
+
+
+async def _ws_respond(websocket: WebSocket, transcripts: asyncio.Queue):
+    """Stage 3: run the agents and stream the spoken response back."""
+    while True:
+        text, language = await transcripts.get()
+        try:
+            agent_result = await orchestrator.aprocess(text, language)
+            response_text = agent_result.get("response", "")
+            await websocket.send_json({
+                "type": "response",
+                "intent": agent_result.get("intent", "unknown"),
+                "text": response_text,
+            })
+
+            if tts_engine is not None:
+                # One WAV per sentence: playback starts after the first
+                # sentence is synthesized instead of the whole response
+                for sentence in _SENTENCE_SPLIT.split(response_text):
+                    if sentence.strip():
+                        await websocket.send_bytes(await _synthesize(sentence, language))
+
+        except Exception as e:
+            logger.error(f"Response failed: {e}")
+            await websocket.send_json({"type": "error", "detail": str(e)})
 
 
 @app.post("/api/text")
@@ -269,7 +428,7 @@ async def process_text(
         raise HTTPException(status_code=503, detail="Orchestrator not initialized")
 
     try:
-        result = orchestrator.process(text, language)
+        result = await orchestrator.aprocess(text, language)
         return {
             "input": text,
             "intent": result.get("intent"),
@@ -282,7 +441,24 @@ async def process_text(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def main():
+    """Run the API server (logentic-api)."""
+    import os
+    import uvicorn
+
+    # uvloop and httptools (from uvicorn[standard]) are picked up when
+    # installed. Every worker loads its own models, so only raise
+    # API_WORKERS if there is memory (and VRAM) for one copy per worker.
+    uvicorn.run(
+        "src.api.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",
+        http="auto",
+        workers=int(os.environ.get("API_WORKERS", "1")),
+    )
+
+
 # Run with: uvicorn src.api.main:app --reload
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    main()
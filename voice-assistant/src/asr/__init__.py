@@ -1,6 +1,7 @@
 """ASR (Automatic Speech Recognition) Module"""
 
-from .whisper_asr import WhisperASR
+from .whisper_asr import WhisperASR, get_asr
+from .faster_whisper_asr import FasterWhisperASR
 from .indic_asr import IndicWhisperASR
 
-__all__ = ["WhisperASR", "IndicWhisperASR"]
+__all__ = ["WhisperASR", "FasterWhisperASR", "IndicWhisperASR", "get_asr"]
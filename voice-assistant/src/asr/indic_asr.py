@@ -5,11 +5,16 @@ Uses community fine-tuned models for much better accuracy than base Whisper.
 Install: pip install transformers torch accelerate
 """
 
+import importlib.util
 import logging
+import os
 from pathlib import Path
-from typing import Optional, Union
+from typing import List, Optional, Tuple, Union
 import numpy as np
 
+from ..utils import MicroBatcher, enable_compile_cache, to_mono
+from .faster_whisper_asr import FasterWhisperASR
+
 logger = logging.getLogger(__name__)
 
 
@@ -63,6 +68,12 @@ class IndicWhisperASR:
         self,
         language: str = "ml",
         device: str = "cpu",
+        compile: bool = False,
+        backend: str = "auto",
+        compute_type: str = "int8_float16",
+        memory_fraction: Optional[float] = None,
+        batch_size: int = 8,
+        max_wait_ms: float = 10,
     ):
         """
         Initialize IndicWhisper ASR.
@@ -70,6 +81,17 @@ class IndicWhisperASR:
         Args:
             language: Target language code (ml, hi, ta, te, ml-large, etc.)
             device: Device to run on - cuda or cpu
+            compile: Compile the decode step with a static KV cache so it
+                replays as a CUDA graph (CUDA only). Costs compile time at
+                load, then cuts per-token launch overhead.
+            backend: "ctranslate2" (INT8 weights via faster-whisper),
+                "transformers" (fp16/fp32 PyTorch), or "auto" to use
+                ctranslate2 when faster-whisper is installed
+            compute_type: CTranslate2 compute type (int8 is used on CPU)
+            memory_fraction: Cap on the share of GPU memory this process's
+                caching allocator may hold (None for no cap)
+            batch_size: Most concurrent transcribe_async() requests per batch
+            max_wait_ms: How long a batch waits to fill before it runs
         """
         # Handle special case: ml-large uses large model but targets Malayalam
         if language == "ml-large":
@@ -80,11 +102,50 @@ class IndicWhisperASR:
             self.model_id = self.MODEL_IDS.get(language, self.MODEL_IDS["default"])
 
         self.device = device
+        self.compile = compile
+        self.memory_fraction = memory_fraction
         self.model = None
         self.processor = None
 
+        if backend == "auto":
+            has_ct2 = importlib.util.find_spec("faster_whisper") is not None
+            backend = "ctranslate2" if has_ct2 and not compile else "transformers"
+        self.backend = backend
+
+        # ctranslate2 backend: same Whisper checkpoint, converted to INT8
+        self._ct2_asr = None
+        if backend == "ctranslate2":
+            self._ct2_asr = FasterWhisperASR(
+                model_size=self.model_id.split("whisper-", 1)[1],
+                device=device,
+                compute_type=compute_type,
+                language=self.language,
+            )
+
+        # CUDA only: pinned host buffer for the mel features and a side
+        # stream that copies them to the GPU
+        self._pinned_features = None
+        self._copy_stream = None
+
+        # Decoder prompt tensor per language, built once in load_model()
+        self._decoder_prompt_ids = {}
+
+        # transcribe_async() requests, coalesced into transcribe_batch() calls
+        self._batcher = MicroBatcher(self._transcribe_items, batch_size, max_wait_ms)
+
     def load_model(self):
         """Load the fine-tuned Whisper model from HuggingFace."""
+        if self._ct2_asr is not None:
+            self._ct2_asr.load_model()
+            print(f"Model loaded: {self.model_id} (CTranslate2, {self._ct2_asr.compute_type})")
+            return
+
+        if self.device == "cuda":
+            # Growable segments instead of fixed blocks, so varying request
+            # sizes don't fragment the pool. Only takes effect if set before
+            # the process's first CUDA allocation.
+            os.environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", "expandable_segments:True")
+
         try:
             from transformers import AutoModelForSpeechSeq2Seq, AutoProcessor, pipeline
             import torch
@@ -107,16 +168,49 @@ class IndicWhisperASR:
                 device = "cpu"
                 dtype = torch.float32
 
+            if device == "cpu":
+                # Keep generate's ops on the intra-op pool; extra inter-op
+                # threads only compete with it (and with other workers)
+                try:
+                    torch.set_num_interop_threads(1)
+                except RuntimeError:
+                    pass  # Already set, or parallel work has started
+            else:
+                # Let cuDNN pick the fastest algorithms for the encoder convs
+                torch.backends.cudnn.benchmark = True
+                if self.memory_fraction is not None:
+                    torch.cuda.set_per_process_memory_fraction(self.memory_fraction)
+
             # Load model and processor separately for better control
             self.processor = AutoProcessor.from_pretrained(self.model_id)
 
+            # Fused attention: FlashAttention-2 when installed (fp16 CUDA only),
+            # else PyTorch SDPA, which picks flash/mem-efficient kernels itself
+            if device != "cpu" and importlib.util.find_spec("flash_attn") is not None:
+                attn_implementation = "flash_attention_2"
+            else:
+                attn_implementation = "sdpa"
+
+            # The model is built on the meta device and each tensor is read from
+            # the memory-mapped safetensors file straight onto the target device,
+            # so the ~3GB of weights never sit in host RAM as a full copy
             model = AutoModelForSpeechSeq2Seq.from_pretrained(
                 self.model_id,
                 torch_dtype=dtype,
                 low_cpu_mem_usage=True,
                 use_safetensors=True,
+                attn_implementation=attn_implementation,
+                device_map=device,
             )
-            model.to(device)
+
+            if device != "cpu":
+                feature_extractor = self.processor.feature_extractor
+                self._pinned_features = torch.empty(
+                    (1, feature_extractor.feature_size, feature_extractor.nb_max_frames),
+                    dtype=dtype,
+                    pin_memory=True,
+                )
+                self._copy_stream = torch.cuda.Stream()
 
             # Clear any default generation config that might override language
             model.generation_config.forced_decoder_ids = None
@@ -132,6 +226,13 @@ class IndicWhisperASR:
                 device=device,
             )
 
+            self._build_decoder_prompts(device)
+
+            if self.compile and device != "cpu":
+                self._compile_model()
+            elif device != "cpu":
+                self._warmup()
+
             print(f"Model loaded on {device}")
             print(f"Target language: {self.language} ({self.SUPPORTED_LANGUAGES.get(self.language, self.language)})")
 
@@ -141,102 +242,224 @@ class IndicWhisperASR:
             logger.error(f"Failed to load model: {e}")
             raise
 
+    def _build_decoder_prompts(self, device):
+        """
+        Precompute the forced decoder prompt for every supported language.
+
+        Format: <|startoftranscript|><|ml|><|transcribe|><|notimestamps|>.
+        Built once so transcribe() does no tokenizer lookups, and each
+        language keeps the same device tensor across calls.
+
+        Args:
+            device: Device the model runs on
+        """
+        import torch
+
+        tokenizer = self.processor.tokenizer
+        sot_token_id = tokenizer.convert_tokens_to_ids("<|startoftranscript|>")
+
+        for code in self.SUPPORTED_LANGUAGES:
+            whisper_lang = self.WHISPER_LANG_CODES.get(code, code)
+            # [(1, <|lang|>), (2, <|transcribe|>), (3, <|notimestamps|>)]
+            prompt = tokenizer.get_decoder_prompt_ids(
+                language=whisper_lang,
+                task="transcribe",
+                no_timestamps=True,
+            )
+            self._decoder_prompt_ids[code] = torch.tensor(
+                [[sot_token_id] + [token_id for _, token_id in prompt]], device=device
+            )
+
+    def _compile_model(self):
+        """
+        Compile the Whisper forward pass and warm it up.
+
+        With a static KV cache every decode step has the same shapes, so
+        torch.compile's reduce-overhead mode captures it once as a CUDA
+        graph and replays it per token; the prefill step gets its own
+        graph. The decoder prompt is always 4 tokens, so the batch-1 warmup
+        covers single requests; other batch sizes from transcribe_async
+        compile on first use. Falls back to eager mode if compilation is
+        unavailable (e.g. no Triton on Windows). Compiled artifacts go to
+        the persistent inductor cache, so only the first process to load
+        the model pays the full compile.
+        """
+        import torch
+
+        enable_compile_cache()
+        model = self.pipe.model
+        eager_forward = model.forward
+        logger.info("Compiling Whisper forward pass (static KV cache)")
+
+        try:
+            model.generation_config.cache_implementation = "static"
+            model.forward = torch.compile(
+                eager_forward,
+                mode="reduce-overhead",
+                fullgraph=True,
+            )
+
+            self._warmup()
+            logger.info("Whisper forward pass compiled")
+
+        except Exception as e:
+            logger.warning(f"torch.compile unavailable, using eager mode: {e}")
+            model.forward = eager_forward
+            model.generation_config.cache_implementation = None
+
+    def _warmup(self):
+        """
+        Run one short generate on a silent 30s window.
+
+        Pays one-time costs (cuDNN autotuning, compilation) at load time and
+        leaves the caching allocator holding blocks of the sizes a request
+        needs, so steady-state requests reuse them instead of calling
+        cudaMalloc.
+        """
+        import torch
+
+        model = self.pipe.model
+        param = next(model.parameters())
+        feature_extractor = self.processor.feature_extractor
+        features = torch.zeros(
+            (1, feature_extractor.feature_size, feature_extractor.nb_max_frames),
+            device=param.device,
+            dtype=param.dtype,
+        )
+
+        with torch.inference_mode():
+            model.generate(
+                features,
+                decoder_input_ids=self._decoder_prompt_ids[self.language],
+                max_new_tokens=8,
+                do_sample=False,
+            )
+
+    def _features_to_device(self, features: np.ndarray, device, dtype):
+        """
+        Move mel features to the model's device.
+
+        On CUDA the features go through a reused pinned buffer and are
+        copied asynchronously on a side stream; the default stream waits
+        on that copy instead of the host blocking on it.
+
+        Args:
+            features: Mel features from the feature extractor, (1, mels, frames)
+            device: Model device
+            dtype: Model dtype
+
+        Returns:
+            Feature tensor on device
+        """
+        import torch
+
+        if self._pinned_features is None or features.shape != self._pinned_features.shape:
+            return torch.from_numpy(features).to(device=device, dtype=dtype)
+
+        np.copyto(self._pinned_features.numpy(), features, casting="same_kind")
+        with torch.cuda.stream(self._copy_stream):
+            input_features = self._pinned_features.to(device, non_blocking=True)
+
+        current = torch.cuda.current_stream()
+        current.wait_stream(self._copy_stream)
+        input_features.record_stream(current)
+        return input_features
+
     def transcribe(
         self,
-        audio: Union[str, Path, np.ndarray],
+        audio: Union[str, Path, np.ndarray, Tuple[np.ndarray, int]],
         language: Optional[str] = None,
     ) -> dict:
         """
         Transcribe audio to text.
 
         Args:
-            audio: Audio file path or numpy array
+            audio: Audio file path, 16kHz numpy array, or an already
+                decoded (samples, sample_rate) tuple
             language: Override language for this transcription
 
         Returns:
             Dictionary with transcription results
         """
-        if not hasattr(self, 'pipe') or self.pipe is None:
-            self.load_model()
-
-        target_lang = language or self.language
+        return self.transcribe_batch([audio], [language])[0]
 
-        try:
-            import torch
-            import soundfile as sf
+    def transcribe_batch(
+        self,
+        audios: List[Union[str, Path, np.ndarray, Tuple[np.ndarray, int]]],
+        languages: Optional[List[Optional[str]]] = None,
+    ) -> List[dict]:
+        """
+        Transcribe several clips with one generate call.
 
-            logger.info(f"Transcribing audio in {self.SUPPORTED_LANGUAGES.get(target_lang, target_lang)}")
+        Whisper pads every clip to the same 30s mel window, so clips of
+        any length stack into one batch without extra masking.
 
-            # Load audio
-            if isinstance(audio, (str, Path)):
-                audio_data, sr = sf.read(str(audio))
-            else:
-                audio_data = audio.flatten()
-                sr = 16000
+        Args:
+            audios: Clips, each as accepted by transcribe()
+            languages: Per-clip language override (None entries use the default)
 
-            # Resample to 16kHz if needed
-            if sr != 16000:
-                duration = len(audio_data) / sr
-                target_length = int(duration * 16000)
-                indices = np.linspace(0, len(audio_data) - 1, target_length).astype(int)
-                audio_data = audio_data[indices]
+        Returns:
+            One transcription result per clip, in order
+        """
+        target_langs = [
+            lang or self.language for lang in (languages or [None] * len(audios))
+        ]
+
+        if self._ct2_asr is not None:
+            # Loads the model on first use; CTranslate2 is called per clip
+            results = []
+            for audio, target_lang in zip(audios, target_langs):
+                result = self._ct2_asr.transcribe(audio, language=target_lang)
+                result["language_name"] = self.SUPPORTED_LANGUAGES.get(target_lang, target_lang)
+                results.append(result)
+            return results
 
-            # Convert to mono if stereo
-            if len(audio_data.shape) > 1:
-                audio_data = audio_data.mean(axis=1)
+        if not hasattr(self, 'pipe') or self.pipe is None:
+            self.load_model()
 
-            audio_data = audio_data.astype(np.float32)
+        try:
+            import torch
+            import soundfile as sf
 
-            # Get the Whisper language code (full name)
-            whisper_lang = self.WHISPER_LANG_CODES.get(target_lang, target_lang)
-            print(f"[DEBUG] Forcing language: {whisper_lang}")
+            logger.info(f"Transcribing {len(audios)} clip(s) in {', '.join(target_langs)}")
+
+            # One lookup per clip, done before any audio work so an
+            # unsupported language fails fast
+            prompts = []
+            for target_lang in target_langs:
+                prompt = self._decoder_prompt_ids.get(target_lang)
+                if prompt is None:
+                    raise ValueError(f"Unsupported language: {target_lang}")
+                prompts.append(prompt)
+
+            # Load audio, as mono 16kHz
+            clips = []
+            for audio in audios:
+                if isinstance(audio, tuple):
+                    clips.append(to_mono(*audio))
+                elif isinstance(audio, (str, Path)):
+                    clips.append(to_mono(*sf.read(str(audio), dtype="float32")))
+                else:
+                    clips.append(to_mono(audio.flatten(), 16000))
 
             # Process audio through feature extractor
-            inputs = self.processor(
-                audio_data,
+            inputs = self.processor.feature_extractor(
+                clips,
                 sampling_rate=16000,
-                return_tensors="pt"
+                return_tensors="np"
             )
 
             # Move to same device and dtype as model
             device = next(self.pipe.model.parameters()).device
             dtype = next(self.pipe.model.parameters()).dtype
-            input_features = inputs.input_features.to(device=device, dtype=dtype)
-
-            # Get language and task tokens
-            tokenizer = self.processor.tokenizer
+            input_features = self._features_to_device(inputs.input_features, device, dtype)
 
-            # Force Malayalam output by setting decoder_input_ids
-            # Format: <|startoftranscript|><|ml|><|transcribe|><|notimestamps|>
-            lang_token = f"<|{whisper_lang}|>"
-
-            decoder_input_ids = tokenizer.get_decoder_prompt_ids(
-                language=whisper_lang,
-                task="transcribe",
-                no_timestamps=True,
-            )
-
-            print(f"[DEBUG] Language token: {lang_token}")
-            print(f"[DEBUG] Decoder prompt IDs: {decoder_input_ids}")
-
-            # Build decoder input IDs manually to force Malayalam
-            # <|startoftranscript|> <|malayalam|> <|transcribe|> <|notimestamps|>
-            sot_token_id = tokenizer.convert_tokens_to_ids("<|startoftranscript|>")
-            lang_token_id = tokenizer.convert_tokens_to_ids(lang_token)
-            transcribe_token_id = tokenizer.convert_tokens_to_ids("<|transcribe|>")
-            notimestamps_token_id = tokenizer.convert_tokens_to_ids("<|notimestamps|>")
-
-            decoder_input_ids = torch.tensor([[
-                sot_token_id,
-                lang_token_id,
-                transcribe_token_id,
-                notimestamps_token_id,
-            ]]).to(device)
-
-            print(f"[DEBUG] Decoder IDs: {decoder_input_ids.tolist()}")
+            # Force each clip's language through the precomputed decoder prompts;
+            # a single clip uses its cached tensor as-is (stable address, no copy)
+            decoder_input_ids = prompts[0] if len(prompts) == 1 else torch.cat(prompts)
 
             # Generate transcription with explicit decoder input
-            with torch.no_grad():
+            with torch.inference_mode():
                 predicted_ids = self.pipe.model.generate(
                     input_features,
                     decoder_input_ids=decoder_input_ids,
@@ -245,21 +468,50 @@ class IndicWhisperASR:
                 )
 
             # Decode the output
-            transcription = self.processor.batch_decode(
+            transcriptions = self.processor.batch_decode(
                 predicted_ids,
                 skip_special_tokens=True
-            )[0]
+            )
 
-            return {
-                "text": transcription.strip(),
-                "language": target_lang,
-                "language_name": self.SUPPORTED_LANGUAGES.get(target_lang, target_lang),
-            }
+            return [
+                {
+                    "text": transcription.strip(),
+                    "language": target_lang,
+                    "language_name": self.SUPPORTED_LANGUAGES.get(target_lang, target_lang),
+                }
+                for transcription, target_lang in zip(transcriptions, target_langs)
+            ]
 
         except Exception as e:
             logger.error(f"Transcription failed: {e}")
             raise
 
+    async def transcribe_async(
+        self,
+        audio: Union[str, Path, np.ndarray, Tuple[np.ndarray, int]],
+        language: Optional[str] = None,
+    ) -> dict:
+        """
+        Transcribe audio, batched with other concurrent callers.
+
+        Requests are queued for a background worker that groups up to
+        batch_size of them (waiting at most max_wait_ms for the batch to
+        fill) into one transcribe_batch() call in a worker thread.
+
+        Args:
+            audio: Clip, as accepted by transcribe()
+            language: Override language for this transcription
+
+        Returns:
+            Dictionary with transcription results
+        """
+        return await self._batcher.submit((audio, language))
+
+    def _transcribe_items(self, items: List[tuple]) -> List[dict]:
+        """transcribe_batch() over queued (audio, language) requests."""
+        audios, languages = zip(*items)
+        return self.transcribe_batch(list(audios), list(languages))
+
 
 # Quick test function
 def test_indic_whisper(audio_path: str, language: str = "ml"):
@@ -79,14 +79,17 @@ class AudioHandler:
 
             logger.info(f"Recording {duration} seconds of audio...")
 
-            audio_data = sd.rec(
+            # Captured as int16 (half the bytes of float32 off the device),
+            # converted once when done
+            pcm = sd.rec(
                 int(duration * self.sample_rate),
                 samplerate=self.sample_rate,
                 channels=self.channels,
-                dtype=np.float32,
+                dtype=np.int16,
                 device=self.device_index,
             )
             sd.wait()
+            audio_data = np.multiply(pcm, 1 / 32768.0, dtype=np.float32)
 
             logger.info("Recording complete")
 
@@ -109,6 +112,10 @@ class AudioHandler:
         """
         Record audio until silence is detected.
 
+        Audio is captured as int16 and each chunk's energy is a single
+        integer dot product compared against the squared threshold, so
+        the silence check needs no float conversion or sqrt.
+
         Args:
             silence_threshold: RMS threshold for silence
             silence_duration: Duration of silence to stop recording
@@ -122,31 +129,45 @@ class AudioHandler:
 
             logger.info("Recording until silence...")
 
-            audio_chunks = []
             silence_chunks = 0
             chunks_for_silence = int(silence_duration * self.sample_rate / self.chunk_size)
             max_chunks = int(max_duration * self.sample_rate / self.chunk_size)
 
+            # The longest possible recording, allocated once and filled in place
+            buf = np.empty((max_chunks * self.chunk_size, self.channels), dtype=np.int16)
+            write = 0
+
+            # rms < threshold  <=>  sum(x**2) < threshold**2 * n, in int16 units
+            silence_sq = (silence_threshold * 32768) ** 2 * self.chunk_size * self.channels
+
             with sd.InputStream(
                 samplerate=self.sample_rate,
                 channels=self.channels,
-                dtype=np.float32,
+                dtype=np.int16,
                 device=self.device_index,
             ) as stream:
+                # Hot-loop names bound to locals; the widened copy of each
+                # chunk reuses one buffer (int64: a chunk's energy overflows int32)
+                read, dot, copyto = stream.read, np.dot, np.copyto
+                chunk_size = self.chunk_size
+                samples = np.empty(chunk_size * self.channels, dtype=np.int64)
+
                 for _ in range(max_chunks):
-                    chunk, _ = stream.read(self.chunk_size)
-                    audio_chunks.append(chunk)
+                    chunk, _ = read(chunk_size)
+                    buf[write:write + chunk_size] = chunk
+                    write += chunk_size
 
                     # Check for silence
-                    rms = np.sqrt(np.mean(chunk ** 2))
-                    if rms < silence_threshold:
+                    copyto(samples, chunk.reshape(-1))
+                    if dot(samples, samples) < silence_sq:
                         silence_chunks += 1
                         if silence_chunks >= chunks_for_silence:
                             break
                     else:
                         silence_chunks = 0
 
-            audio_data = np.concatenate(audio_chunks)
+            # Single pass: int16 view of the recorded span straight to float32
+            audio_data = np.multiply(buf[:write], 1 / 32768.0, dtype=np.float32)
             logger.info(f"Recording complete: {len(audio_data) / self.sample_rate:.2f} seconds")
 
             return audio_data.squeeze()
@@ -220,17 +241,25 @@ class AudioHandler:
         """
         Preprocess audio for ASR.
 
+        Peak-normalizes and removes the DC offset. Since
+        x / peak - mean(x / peak) == (x - mean(x)) / peak, both steps run
+        as one subtract and one in-place multiply on a single output array
+        after reductions that allocate nothing.
+
         Args:
             audio: Raw audio data
 
         Returns:
             Preprocessed audio
         """
-        # Normalize
-        if audio.max() > 0:
-            audio = audio / np.abs(audio).max()
+        peak = float(audio.max())
+        scale = 1.0
+        if peak > 0:
+            # Peak magnitude without materializing np.abs(audio)
+            scale = 1.0 / max(peak, -float(audio.min()))
 
-        # Remove DC offset
-        audio = audio - np.mean(audio)
+        # Python floats keep float32 input in float32
+        out = np.subtract(audio, float(audio.mean()))
+        out *= scale
 
-        return audio
+        return out
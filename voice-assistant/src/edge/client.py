@@ -5,8 +5,10 @@ Handles communication between edge device and processing server.
 
 import logging
 import asyncio
-from typing import Dict, Any, Optional
+import threading
+from typing import Any, AsyncIterator, Dict, Optional, Union
 import json
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +20,15 @@ class EdgeClient:
     Supports WebSocket for real-time streaming and HTTP for request/response.
     """
 
+    # Pooled HTTP connections, kept alive between requests
+    HTTP_POOL_SIZE = 4
+    HTTP_KEEPALIVE_S = 60
+
+    # Streamed audio is coalesced into WebSocket messages of this much
+    # 16kHz PCM16, instead of one message per capture chunk
+    SAMPLE_RATE = 16000
+    SEND_FRAME_MS = 500
+
     def __init__(
         self,
         server_url: str = "http://localhost:8000",
@@ -59,18 +70,34 @@ class EdgeClient:
         """
         Stream audio chunks to server via WebSocket.
 
+        Chunks go out as 16kHz mono PCM16, half the bytes of float32,
+        coalesced into binary messages of SEND_FRAME_MS of audio; an empty
+        message marks the end of the stream.
+
         Args:
-            audio_chunks: Async iterator of audio chunks
+            audio_chunks: Async iterator of int16 or float32 (-1..1) chunks
         """
         if not self.ws_connection:
             await self.connect_websocket()
 
+        frame_bytes = self.SAMPLE_RATE * self.SEND_FRAME_MS // 1000 * 2
+        pending = bytearray()
+
         try:
             async for chunk in audio_chunks:
-                await self.ws_connection.send(chunk.tobytes())
+                if chunk.dtype != np.int16:
+                    chunk = (np.clip(chunk, -1.0, 1.0) * 32767).astype(np.int16)
+                pending += np.ascontiguousarray(chunk).tobytes()
+
+                if len(pending) >= frame_bytes:
+                    await self.ws_connection.send(bytes(pending))
+                    pending.clear()
+
+            if pending:
+                await self.ws_connection.send(bytes(pending))
 
             # Signal end of stream
-            await self.ws_connection.send(json.dumps({"type": "end_stream"}))
+            await self.ws_connection.send(b"")
 
         except Exception as e:
             logger.error(f"Streaming failed: {e}")
@@ -94,6 +121,39 @@ class EdgeClient:
             logger.error(f"Failed to receive response: {e}")
             raise
 
+    async def receive_stream(self) -> AsyncIterator[Union[Dict[str, Any], bytes]]:
+        """
+        Yield server messages as they arrive, until the connection closes.
+
+        The server answers each turn with JSON messages (transcript,
+        response) followed by one WAV message per sentence of the spoken
+        reply, so playback can start on the first audio chunk.
+
+        Yields:
+            Decoded JSON messages as dictionaries, audio as WAV bytes
+        """
+        if not self.ws_connection:
+            raise RuntimeError("WebSocket not connected")
+
+        async for message in self.ws_connection:
+            if isinstance(message, bytes):
+                yield message
+            else:
+                yield json.loads(message)
+
+    async def _get_session(self):
+        """Return the shared HTTP session, creating it on first use."""
+        import aiohttp
+
+        if not self.session:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.HTTP_POOL_SIZE,
+                    keepalive_timeout=self.HTTP_KEEPALIVE_S,
+                )
+            )
+        return self.session
+
     async def process_audio(
         self,
         audio_data: bytes,
@@ -112,9 +172,7 @@ class EdgeClient:
         try:
             import aiohttp
 
-            if not self.session:
-                self.session = aiohttp.ClientSession()
-
+            session = await self._get_session()
             url = f"{self.server_url}/api/process"
 
             data = aiohttp.FormData()
@@ -127,7 +185,7 @@ class EdgeClient:
             if language:
                 data.add_field("language", language)
 
-            async with self.session.post(url, data=data) as response:
+            async with session.post(url, data=data) as response:
                 if response.status == 200:
                     return await response.json()
                 else:
@@ -147,13 +205,9 @@ class EdgeClient:
             True if server is healthy
         """
         try:
-            import aiohttp
-
-            if not self.session:
-                self.session = aiohttp.ClientSession()
-
+            session = await self._get_session()
             url = f"{self.server_url}/health"
-            async with self.session.get(url) as response:
+            async with session.get(url) as response:
                 return response.status == 200
 
         except Exception:
@@ -169,16 +223,26 @@ class EdgeClient:
 
 # Synchronous wrapper for simple usage
 class SyncEdgeClient:
-    """Synchronous wrapper for EdgeClient."""
+    """
+    Synchronous wrapper for EdgeClient.
+
+    The client's event loop runs for the wrapper's lifetime in a daemon
+    thread, so the HTTP session and its kept-alive connections survive
+    between calls; each call just submits a coroutine to that loop.
+    """
 
     def __init__(self, server_url: str = "http://localhost:8000"):
         self.client = EdgeClient(server_url)
-        self._loop = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+        # Create the session up front so the first call doesn't pay for it
+        asyncio.run_coroutine_threadsafe(self.client._get_session(), self._loop)
 
-    def _get_loop(self):
-        if self._loop is None or self._loop.is_closed():
-            self._loop = asyncio.new_event_loop()
-        return self._loop
+    def _run(self, coro):
+        """Run a coroutine on the client's loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
 
     def process_audio(
         self,
@@ -186,18 +250,17 @@ class SyncEdgeClient:
         language: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Synchronous audio processing."""
-        loop = self._get_loop()
-        return loop.run_until_complete(
-            self.client.process_audio(audio_data, language)
-        )
+        return self._run(self.client.process_audio(audio_data, language))
 
     def health_check(self) -> bool:
         """Synchronous health check."""
-        loop = self._get_loop()
-        return loop.run_until_complete(self.client.health_check())
+        return self._run(self.client.health_check())
 
     def close(self):
         """Clean up."""
-        if self._loop:
-            self._loop.run_until_complete(self.client.close())
-            self._loop.close()
+        if self._loop.is_closed():
+            return
+        self._run(self.client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -1,5 +1,5 @@
 """LLM Module"""
 
-from .qwen import QwenLLM, chat, generate
+from .qwen import QwenLLM, chat, generate, get_llm
 
-__all__ = ["QwenLLM", "chat", "generate"]
+__all__ = ["QwenLLM", "chat", "generate", "get_llm"]
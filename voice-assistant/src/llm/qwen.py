@@ -3,10 +3,16 @@ Qwen 2.5 LLM Module
 Local conversational AI using Qwen 2.5 Instruct models.
 """
 
+import importlib.util
 import logging
-from typing import Optional, List, Dict, Literal
+import os
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, List, Dict, Iterator, Literal, Tuple
 from dataclasses import dataclass, field
 
+from ..utils import enable_compile_cache, release_cuda_memory
+
 logger = logging.getLogger(__name__)
 
 
@@ -15,6 +21,8 @@ class Message:
     """Chat message."""
     role: Literal["system", "user", "assistant"]
     content: str
+    # Chat-template token IDs, filled in the first time the message is encoded
+    token_ids: Optional[List[int]] = field(default=None, repr=False, compare=False)
 
 
 @dataclass
@@ -34,6 +42,10 @@ class QwenLLM:
     - 1.5B: ~3GB VRAM (balanced)
     - 3B: ~6GB VRAM (better quality)
     - 7B: ~14GB VRAM (best local quality)
+
+    Runs on transformers by default. The "vllm" backend serves the model
+    with vLLM's paged KV cache and prefix caching for GPU servers shared by
+    many edge clients; the transformers path stays for single-user devices.
     """
 
     MODELS = {
@@ -43,6 +55,24 @@ class QwenLLM:
         "7b": "Qwen/Qwen2.5-7B-Instruct",
     }
 
+    # Pre-quantized INT4 checkpoints published next to each model
+    QUANTIZED_SUFFIXES = {
+        "awq": "-AWQ",
+        "gptq": "-GPTQ-Int4",
+    }
+
+    # Quantized CPU inference: llama.cpp with 4-bit GGUF weights
+    GGUF_FILENAME = "*q4_k_m.gguf"
+    LLAMA_CPP_CONTEXT = 2048
+
+    # Conversations whose KV cache is kept between turns (least recently
+    # used are dropped first)
+    MAX_KV_CACHES = 4
+
+    # After a generation, cached CUDA memory beyond this much idle is
+    # handed back for the ASR/TTS models sharing the GPU
+    IDLE_CUDA_BYTES = 512 * 1024 * 1024
+
     DEFAULT_SYSTEM_PROMPT = """You are a helpful voice assistant. You provide concise, friendly responses suitable for spoken conversation. Keep responses brief and natural - typically 1-3 sentences unless more detail is needed. You can help with:
 - Answering questions
 - Providing information
@@ -51,12 +81,18 @@ class QwenLLM:
 
 Respond naturally as if speaking to someone."""
 
+    # Fraction of GPU memory vLLM claims for weights and its KV cache pool
+    VLLM_GPU_MEMORY_UTILIZATION = 0.85
+
     def __init__(
         self,
         model_size: str = "1.5b",
         device: str = "cuda",
         system_prompt: Optional[str] = None,
         max_memory_messages: int = 10,
+        compile: bool = False,
+        backend: Literal["hf", "vllm"] = "hf",
+        quantization: Optional[Literal["awq", "gptq", "bnb-nf4"]] = None,
     ):
         """
         Initialize Qwen LLM.
@@ -66,18 +102,40 @@ Respond naturally as if speaking to someone."""
             device: Device to run on - cuda or cpu
             system_prompt: Custom system prompt
             max_memory_messages: Max conversation history to keep
+            compile: Compile the forward pass with a static KV cache (CUDA
+                only). Costs ~20-30s at load time, then speeds up every call.
+            backend: "hf" (transformers) or "vllm" (CUDA only)
+            quantization: INT4 weights - "awq"/"gptq" load the published
+                quantized checkpoint, "bnb-nf4" quantizes at load time
+                (CUDA). On CPU any of them runs the Q4_K_M GGUF on llama.cpp.
         """
         self.model_size = model_size
         self.device = device
         self.system_prompt = system_prompt or self.DEFAULT_SYSTEM_PROMPT
         self.max_memory_messages = max_memory_messages
+        self.compile = compile
+        self.backend = backend
+        self.quantization = quantization
 
         self.model = None
         self.tokenizer = None
+        # Rendered system turn and its token IDs, the generation prompt IDs
+        self._system_text: Optional[str] = None
+        self._system_ids: Optional[List[int]] = None
+        self._generation_prompt_ids: Optional[List[int]] = None
         self.conversation_history: List[Message] = []
+        # Histories for callers that pass a conversation_id
+        self.conversations: Dict[str, List[Message]] = {}
+        # conversation_id -> (token IDs held in the cache, KV cache)
+        self._kv_caches: "OrderedDict[Optional[str], Tuple[List[int], object]]" = OrderedDict()
 
     def load_model(self):
-        """Load the Qwen model."""
+        """Load the Qwen model (a no-op if it is already loaded)."""
+        if self.model is not None:
+            # The instance is shared via get_llm(); reloading would also
+            # throw away the compiled forward pass
+            return
+
         from transformers import AutoModelForCausalLM, AutoTokenizer
         import torch
 
@@ -87,6 +145,15 @@ Respond naturally as if speaking to someone."""
 
         logger.info(f"Loading Qwen model: {model_id}")
 
+        if self.backend == "vllm":
+            # vLLM runs the AWQ/GPTQ checkpoints with its own INT4 kernels
+            self._load_vllm(model_id + self.QUANTIZED_SUFFIXES.get(self.quantization, ""))
+            return
+
+        if self.quantization and not (self.device == "cuda" and torch.cuda.is_available()):
+            self._load_llama_cpp(model_id)
+            return
+
         try:
             self.tokenizer = AutoTokenizer.from_pretrained(
                 model_id,
@@ -95,40 +162,323 @@ Respond naturally as if speaking to someone."""
 
             # Load with appropriate settings based on device
             if self.device == "cuda" and torch.cuda.is_available():
+                quantization_config = None
+                if self.quantization in self.QUANTIZED_SUFFIXES:
+                    model_id += self.QUANTIZED_SUFFIXES[self.quantization]
+                elif self.quantization == "bnb-nf4":
+                    from transformers import BitsAndBytesConfig
+                    quantization_config = BitsAndBytesConfig(
+                        load_in_4bit=True,
+                        bnb_4bit_quant_type="nf4",
+                        bnb_4bit_compute_dtype=torch.float16,
+                    )
+
+                # Fused attention: FlashAttention-2 when installed, else PyTorch
+                # SDPA, which picks flash/mem-efficient kernels itself
+                if importlib.util.find_spec("flash_attn") is not None:
+                    attn_implementation = "flash_attention_2"
+                else:
+                    attn_implementation = "sdpa"
+
                 self.model = AutoModelForCausalLM.from_pretrained(
                     model_id,
                     torch_dtype=torch.float16,
                     device_map="auto",
                     trust_remote_code=True,
+                    attn_implementation=attn_implementation,
+                    quantization_config=quantization_config,
                 )
             else:
                 self.model = AutoModelForCausalLM.from_pretrained(
                     model_id,
                     torch_dtype=torch.float32,
                     trust_remote_code=True,
+                    low_cpu_mem_usage=True,
                 )
-                self.model = self.model.to("cpu")
-                self.device = "cpu"
 
+            # "cuda" falls back to CPU when no GPU is available
+            self.device = next(self.model.parameters()).device.type
             self.model.eval()
+            # Decode steps reuse the KV cache rather than re-running the prefix
+            self.model.config.use_cache = True
             logger.info(f"Qwen model loaded successfully on {self.device}")
 
+            if self.compile and self.device == "cuda":
+                self._compile_model()
+
         except Exception as e:
             logger.error(f"Failed to load Qwen model: {e}")
             raise
 
-    def _build_messages(self, user_input: str) -> List[Dict]:
-        """Build message list for the model."""
-        messages = [{"role": "system", "content": self.system_prompt}]
+    def _load_vllm(self, model_id: str):
+        """Load the model into a vLLM engine with prefix caching."""
+        import threading
+
+        try:
+            from vllm import LLM
+        except ImportError:
+            raise ImportError("vllm not installed. Run: pip install vllm")
+
+        try:
+            # Prefix caching shares the system prompt's KV blocks across
+            # every conversation instead of recomputing them per request
+            self.model = LLM(
+                model=model_id,
+                dtype="float16",
+                gpu_memory_utilization=self.VLLM_GPU_MEMORY_UTILIZATION,
+                enable_prefix_caching=True,
+            )
+            self.tokenizer = self.model.get_tokenizer()
+            self._vllm_lock = threading.Lock()
+            logger.info("Qwen model loaded successfully on vLLM")
+
+        except Exception as e:
+            logger.error(f"Failed to load Qwen model on vLLM: {e}")
+            raise
+
+    def _load_llama_cpp(self, model_id: str):
+        """Load the 4-bit GGUF build of the model on llama.cpp (CPU)."""
+        import threading
+        from transformers import AutoTokenizer
+
+        try:
+            from llama_cpp import Llama
+        except ImportError:
+            raise ImportError(
+                "llama-cpp-python not installed. Run: pip install llama-cpp-python"
+            )
+
+        try:
+            # Same vocabulary as the GGUF, used for the chat template and
+            # the cached prompt token IDs
+            self.tokenizer = AutoTokenizer.from_pretrained(model_id, trust_remote_code=True)
+            self.model = Llama.from_pretrained(
+                repo_id=f"{model_id}-GGUF",
+                filename=self.GGUF_FILENAME,
+                n_ctx=self.LLAMA_CPP_CONTEXT,
+                n_threads=os.cpu_count(),
+                verbose=False,
+            )
+            self._llama_lock = threading.Lock()
+            self.backend = "llama_cpp"
+            self.device = "cpu"
+            logger.info("Qwen model loaded successfully on llama.cpp (Q4_K_M)")
+
+        except Exception as e:
+            logger.error(f"Failed to load Qwen GGUF model: {e}")
+            raise
+
+    def _generate_llama_cpp(
+        self,
+        ids: List[int],
+        max_new_tokens: int,
+        temperature: float,
+        top_p: float = 1.0,
+    ) -> List[int]:
+        """Generate from prompt token IDs on llama.cpp, returning the new token IDs."""
+        stop = {self.model.token_eos(), self.tokenizer.eos_token_id}
+        new_tokens = []
+
+        # llama.cpp keeps the KV cache of the longest prefix shared with the
+        # previous prompt, so earlier turns of a conversation are not re-run
+        with self._llama_lock:
+            for token in self.model.generate(ids, temp=temperature, top_p=top_p):
+                if token in stop:
+                    break
+                new_tokens.append(token)
+                if len(new_tokens) >= max_new_tokens:
+                    break
+
+        return new_tokens
+
+    def _generate_vllm(
+        self,
+        ids: List[int],
+        max_new_tokens: int,
+        temperature: float,
+        top_p: float = 1.0,
+    ) -> List[int]:
+        """Generate from prompt token IDs on vLLM, returning the new token IDs."""
+        from vllm import SamplingParams
+
+        params = SamplingParams(
+            temperature=temperature,
+            top_p=top_p,
+            max_tokens=max_new_tokens,
+        )
+        # The offline engine is not thread-safe
+        with self._vllm_lock:
+            outputs = self.model.generate(
+                {"prompt_token_ids": ids}, params, use_tqdm=False
+            )
+        return list(outputs[0].outputs[0].token_ids)
+
+    def _compile_model(self):
+        """
+        Compile the forward pass and warm it up.
+
+        A static KV cache keeps tensor shapes fixed across decode steps, so
+        torch.compile can capture the per-token forward as a CUDA graph
+        instead of running it op by op from Python. The warmup generation
+        pays the compile cost here rather than on the first user request.
+        Falls back to eager mode if compilation is unavailable (e.g. no
+        Triton on Windows). Compiled artifacts go to the persistent inductor
+        cache, so only the first process to load the model pays the full
+        compile.
+        """
+        import torch
+
+        enable_compile_cache()
+        eager_forward = self.model.forward
+        logger.info("Compiling Qwen forward pass (static KV cache)")
+
+        try:
+            self.model.generation_config.cache_implementation = "static"
+            self.model.forward = torch.compile(
+                eager_forward,
+                mode="reduce-overhead",
+                fullgraph=True,
+            )
+
+            inputs = self.tokenizer("Hello", return_tensors="pt").to("cuda")
+            with torch.inference_mode():
+                self.model.generate(
+                    **inputs,
+                    max_new_tokens=8,
+                    do_sample=False,
+                    pad_token_id=self.tokenizer.eos_token_id,
+                )
+            logger.info("Qwen forward pass compiled")
+
+        except Exception as e:
+            logger.warning(f"torch.compile unavailable, using eager mode: {e}")
+            self.model.forward = eager_forward
+            self.model.generation_config.cache_implementation = None
+
+    def _history(self, conversation_id: Optional[str] = None) -> List[Message]:
+        """Return the history list for a conversation (default if None)."""
+        if conversation_id is None:
+            return self.conversation_history
+        return self.conversations.setdefault(conversation_id, [])
+
+    def _remember(
+        self,
+        user_input: str,
+        response_text: str,
+        conversation_id: Optional[str] = None,
+        user_ids: Optional[List[int]] = None,
+    ):
+        """Append an exchange to a conversation's history and trim it."""
+        history = self._history(conversation_id)
+        history.append(Message(role="user", content=user_input, token_ids=user_ids))
+        history.append(Message(role="assistant", content=response_text))
+
+        # Trim history if too long
+        if len(history) > self.max_memory_messages * 2:
+            del history[:-self.max_memory_messages * 2]
+
+    def _encode_turn(self, role: str, content: str) -> List[int]:
+        """
+        Token IDs of one chat-template turn.
+
+        The ChatML template Qwen uses renders a conversation as the
+        concatenation of its turns, and every turn starts with a special
+        token, so a turn tokenizes the same on its own as inside the
+        full prompt. The turn's text is what rendering it after the
+        system prompt adds to the system prompt alone.
+        """
+        if self._system_ids is None:
+            system = [{"role": "system", "content": self.system_prompt}]
+            self._system_text = self.tokenizer.apply_chat_template(system, tokenize=False)
+            self._system_ids = self.tokenizer.encode(self._system_text, add_special_tokens=False)
+            prompted = self.tokenizer.apply_chat_template(
+                system, tokenize=False, add_generation_prompt=True
+            )
+            self._generation_prompt_ids = self.tokenizer.encode(
+                prompted[len(self._system_text):], add_special_tokens=False
+            )
+
+        text = self.tokenizer.apply_chat_template(
+            [
+                {"role": "system", "content": self.system_prompt},
+                {"role": role, "content": content},
+            ],
+            tokenize=False,
+        )
+        return self.tokenizer.encode(text[len(self._system_text):], add_special_tokens=False)
+
+    def _build_input_ids(
+        self, user_input: str, conversation_id: Optional[str] = None
+    ) -> Tuple[List[int], List[int]]:
+        """
+        Build the prompt token IDs for the model.
+
+        The system prompt and each history message are tokenized once and
+        cached, so a turn only tokenizes the new user input.
+
+        Returns:
+            (prompt IDs, IDs of the new user turn)
+        """
+        user_ids = self._encode_turn("user", user_input)
+        ids = list(self._system_ids)
 
         # Add conversation history
-        for msg in self.conversation_history[-self.max_memory_messages:]:
-            messages.append({"role": msg.role, "content": msg.content})
+        for msg in self._history(conversation_id)[-self.max_memory_messages:]:
+            if msg.token_ids is None:
+                msg.token_ids = self._encode_turn(msg.role, msg.content)
+            ids.extend(msg.token_ids)
 
         # Add current user input
-        messages.append({"role": "user", "content": user_input})
+        ids.extend(user_ids)
+        ids.extend(self._generation_prompt_ids)
+
+        return ids, user_ids
+
+    def _take_kv_cache(self, ids: List[int], conversation_id: Optional[str] = None):
+        """
+        Take a conversation's KV cache for a new prompt.
+
+        The cache is cropped to the longest prefix its tokens share with
+        the prompt, so generate() only prefills the rest: usually just
+        the new user turn, or everything after the system prompt once the
+        history window has slid. The entry is removed while in use.
 
-        return messages
+        Returns:
+            The cropped cache, or None to prefill from scratch
+        """
+        entry = self._kv_caches.pop(conversation_id, None)
+        if entry is None or self.model.generation_config.cache_implementation == "static":
+            return None
+
+        cached_ids, cache = entry
+        # At least one prompt token must be left to prefill
+        limit = min(len(cached_ids), len(ids) - 1)
+        shared = 0
+        while shared < limit and cached_ids[shared] == ids[shared]:
+            shared += 1
+        if shared == 0:
+            return None
+
+        cache.crop(shared)
+        return cache
+
+    def _store_kv_cache(self, sequence, cache, conversation_id: Optional[str] = None):
+        """Keep the KV cache left by generate() for the conversation's next turn."""
+        if cache is None or self.model.generation_config.cache_implementation == "static":
+            return
+
+        # The last generated token was never fed back, so it has no KV entry
+        self._kv_caches[conversation_id] = (sequence[:cache.get_seq_length()].tolist(), cache)
+        self._kv_caches.move_to_end(conversation_id)
+        while len(self._kv_caches) > self.MAX_KV_CACHES:
+            self._kv_caches.popitem(last=False)
+
+    def _prompt_inputs(self, ids: List[int]) -> Dict:
+        """Wrap prompt IDs as generate() inputs on the model's device."""
+        import torch
+
+        input_ids = torch.tensor([ids], dtype=torch.long, device=self.device)
+        return {"input_ids": input_ids, "attention_mask": torch.ones_like(input_ids)}
 
     def chat(
         self,
@@ -137,6 +487,7 @@ Respond naturally as if speaking to someone."""
         temperature: float = 0.7,
         top_p: float = 0.9,
         remember: bool = True,
+        conversation_id: Optional[str] = None,
     ) -> ChatResponse:
         """
         Chat with the model.
@@ -144,9 +495,10 @@ Respond naturally as if speaking to someone."""
         Args:
             user_input: User's message
             max_new_tokens: Maximum tokens to generate
-            temperature: Sampling temperature (0.0-1.0)
+            temperature: Sampling temperature (0.0-1.0); 0 decodes greedily
             top_p: Nucleus sampling parameter
             remember: Whether to add to conversation history
+            conversation_id: Separate history to use (None for the default one)
 
         Returns:
             ChatResponse with generated text and metadata
@@ -157,39 +509,41 @@ Respond naturally as if speaking to someone."""
         if self.model is None:
             self.load_model()
 
-        messages = self._build_messages(user_input)
-
         logger.info(f"Generating response for: '{user_input[:50]}...'")
 
         try:
             start_time = time.perf_counter()
 
-            # Apply chat template
-            text = self.tokenizer.apply_chat_template(
-                messages,
-                tokenize=False,
-                add_generation_prompt=True,
-            )
-
-            inputs = self.tokenizer(text, return_tensors="pt")
-            if self.device == "cuda":
-                inputs = {k: v.to("cuda") for k, v in inputs.items()}
-
-            input_length = inputs["input_ids"].shape[1]
+            ids, user_ids = self._build_input_ids(user_input, conversation_id)
 
-            # Generate
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    **inputs,
-                    max_new_tokens=max_new_tokens,
-                    temperature=temperature,
-                    top_p=top_p,
-                    do_sample=True,
-                    pad_token_id=self.tokenizer.eos_token_id,
-                )
+            if self.backend == "vllm":
+                new_tokens = self._generate_vllm(ids, max_new_tokens, temperature, top_p)
+            elif self.backend == "llama_cpp":
+                new_tokens = self._generate_llama_cpp(ids, max_new_tokens, temperature, top_p)
+            else:
+                inputs = self._prompt_inputs(ids)
+                sampling = self._sampling_kwargs(temperature, top_p)
+
+                # Generate, prefilling only what the cached turns don't cover
+                with torch.inference_mode():
+                    outputs = self.model.generate(
+                        **inputs,
+                        past_key_values=self._take_kv_cache(ids, conversation_id),
+                        max_new_tokens=max_new_tokens,
+                        **sampling,
+                        num_beams=1,
+                        pad_token_id=self.tokenizer.eos_token_id,
+                        return_dict_in_generate=True,
+                    )
+
+                sequence = outputs.sequences[0]
+                self._store_kv_cache(sequence, outputs.past_key_values, conversation_id)
+                if self.device == "cuda":
+                    release_cuda_memory(self.IDLE_CUDA_BYTES)
+
+                # Only the new tokens
+                new_tokens = sequence[len(ids):]
 
-            # Decode only the new tokens
-            new_tokens = outputs[0][input_length:]
             response_text = self.tokenizer.decode(
                 new_tokens,
                 skip_special_tokens=True,
@@ -200,12 +554,7 @@ Respond naturally as if speaking to someone."""
 
             # Update conversation history
             if remember:
-                self.conversation_history.append(Message(role="user", content=user_input))
-                self.conversation_history.append(Message(role="assistant", content=response_text))
-
-                # Trim history if too long
-                if len(self.conversation_history) > self.max_memory_messages * 2:
-                    self.conversation_history = self.conversation_history[-self.max_memory_messages * 2:]
+                self._remember(user_input, response_text, conversation_id, user_ids)
 
             logger.info(f"Generated {tokens_generated} tokens in {generation_time:.1f}ms")
 
@@ -219,6 +568,94 @@ Respond naturally as if speaking to someone."""
             logger.error(f"Generation failed: {e}")
             raise
 
+    def stream(
+        self,
+        user_input: str,
+        max_new_tokens: int = 256,
+        temperature: float = 0.7,
+        top_p: float = 0.9,
+        remember: bool = True,
+        conversation_id: Optional[str] = None,
+    ) -> Iterator[str]:
+        """
+        Chat with the model, yielding text pieces as they are generated.
+
+        Generation runs in a background thread; decoded text is yielded
+        as soon as each token is available so callers can start
+        translation/TTS before the full response is done.
+
+        Args:
+            user_input: User's message
+            max_new_tokens: Maximum tokens to generate
+            temperature: Sampling temperature (0.0-1.0); 0 decodes greedily
+            top_p: Nucleus sampling parameter
+            remember: Whether to add to conversation history
+            conversation_id: Separate history to use (None for the default one)
+
+        Yields:
+            Decoded text pieces
+        """
+        if self.model is None:
+            self.load_model()
+
+        if self.backend != "hf":
+            # vLLM and llama.cpp paths return whole completions
+            response = self.chat(
+                user_input, max_new_tokens, temperature, top_p, remember, conversation_id
+            )
+            if response.content:
+                yield response.content
+            return
+
+        import threading
+        import torch
+        from transformers import TextIteratorStreamer
+
+        logger.info(f"Streaming response for: '{user_input[:50]}...'")
+
+        ids, user_ids = self._build_input_ids(user_input, conversation_id)
+        inputs = self._prompt_inputs(ids)
+
+        streamer = TextIteratorStreamer(
+            self.tokenizer,
+            skip_prompt=True,
+            skip_special_tokens=True,
+        )
+
+        past_key_values = self._take_kv_cache(ids, conversation_id)
+
+        def _generate():
+            with torch.inference_mode():
+                outputs = self.model.generate(
+                    **inputs,
+                    past_key_values=past_key_values,
+                    max_new_tokens=max_new_tokens,
+                    **self._sampling_kwargs(temperature, top_p),
+                    num_beams=1,
+                    pad_token_id=self.tokenizer.eos_token_id,
+                    streamer=streamer,
+                    return_dict_in_generate=True,
+                )
+            self._store_kv_cache(outputs.sequences[0], outputs.past_key_values, conversation_id)
+            if self.device == "cuda":
+                release_cuda_memory(self.IDLE_CUDA_BYTES)
+
+        thread = threading.Thread(target=_generate, daemon=True)
+        thread.start()
+
+        pieces = []
+        for piece in streamer:
+            if piece:
+                pieces.append(piece)
+                yield piece
+
+        thread.join()
+        response_text = "".join(pieces).strip()
+
+        # Update conversation history
+        if remember:
+            self._remember(user_input, response_text, conversation_id, user_ids)
+
     def generate(
         self,
         prompt: str,
@@ -231,7 +668,7 @@ Respond naturally as if speaking to someone."""
         Args:
             prompt: Raw prompt text
             max_new_tokens: Maximum tokens to generate
-            temperature: Sampling temperature
+            temperature: Sampling temperature; 0 decodes greedily
 
         Returns:
             Generated text
@@ -241,42 +678,99 @@ Respond naturally as if speaking to someone."""
         if self.model is None:
             self.load_model()
 
+        if self.backend != "hf":
+            ids = self.tokenizer.encode(prompt)
+            if self.backend == "vllm":
+                new_tokens = self._generate_vllm(ids, max_new_tokens, temperature)
+            else:
+                new_tokens = self._generate_llama_cpp(ids, max_new_tokens, temperature)
+            return self.tokenizer.decode(ids + new_tokens, skip_special_tokens=True)
+
         inputs = self.tokenizer(prompt, return_tensors="pt")
         if self.device == "cuda":
             inputs = {k: v.to("cuda") for k, v in inputs.items()}
 
-        with torch.no_grad():
+        with torch.inference_mode():
             outputs = self.model.generate(
                 **inputs,
                 max_new_tokens=max_new_tokens,
-                temperature=temperature,
-                do_sample=True,
+                **self._sampling_kwargs(temperature),
+                num_beams=1,
                 pad_token_id=self.tokenizer.eos_token_id,
             )
 
         return self.tokenizer.decode(outputs[0], skip_special_tokens=True)
 
-    def clear_history(self):
-        """Clear conversation history."""
-        self.conversation_history = []
+    @staticmethod
+    def _sampling_kwargs(temperature: float, top_p: float = 1.0) -> dict:
+        """HF generate() sampling arguments; temperature 0 decodes greedily."""
+        if temperature > 0:
+            return {"do_sample": True, "temperature": temperature, "top_p": top_p}
+        return {"do_sample": False}
+
+    def has_history(self, conversation_id: Optional[str] = None) -> bool:
+        """Whether a conversation (the default one if no id is given) has any turns."""
+        if conversation_id is None:
+            return bool(self.conversation_history)
+        return bool(self.conversations.get(conversation_id))
+
+    def remember(
+        self,
+        user_input: str,
+        response_text: str,
+        conversation_id: Optional[str] = None,
+    ):
+        """Add an exchange answered without the model (e.g. from a cache) to history."""
+        self._remember(user_input, response_text, conversation_id)
+
+    def clear_history(self, conversation_id: Optional[str] = None):
+        """Clear conversation history (the default one if no id is given)."""
+        if conversation_id is None:
+            self.conversation_history = []
+        else:
+            self.conversations.pop(conversation_id, None)
+        self._kv_caches.pop(conversation_id, None)
         logger.info("Conversation history cleared")
 
+    def unload(self):
+        """Drop the model and free its GPU memory; the next call reloads it."""
+        self.model = None
+        self.tokenizer = None
+        self._system_ids = None
+        self._kv_caches.clear()
+        release_cuda_memory(collect=True)
+        logger.info("Qwen model unloaded")
+
+    def __enter__(self) -> "QwenLLM":
+        self.load_model()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.unload()
+
     def set_system_prompt(self, prompt: str):
         """Update the system prompt."""
         self.system_prompt = prompt
+        self._system_ids = None
         logger.info("System prompt updated")
 
 
-# Singleton instance
-_llm = None
-
-
-def get_llm(model_size: str = "1.5b", device: str = "cuda") -> QwenLLM:
-    """Get or create singleton LLM instance."""
-    global _llm
-    if _llm is None:
-        _llm = QwenLLM(model_size=model_size, device=device)
-    return _llm
+@lru_cache(maxsize=None)
+def get_llm(
+    model_size: str = "1.5b",
+    device: str = "cuda",
+    compile: bool = False,
+    backend: str = "hf",
+    quantization: Optional[str] = None,
+) -> QwenLLM:
+    """Get or create the shared LLM instance for a model size and device."""
+    return QwenLLM(
+        model_size=model_size,
+        device=device,
+        compile=compile,
+        backend=backend,
+        quantization=quantization,
+    )
 
 
 def chat(user_input: str, **kwargs) -> str:
@@ -4,11 +4,23 @@ Classifies user intent and extracts entities from natural language input.
 """
 
 import logging
+import re
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 
+import numpy as np
+
+from ..utils import KeywordMatcher
+
 logger = logging.getLogger(__name__)
 
+# Times ("5", "10:30", "7 pm") and longer numbers in one alternation; a
+# number only matches where the time branch does not
+_ENTITY_RE = re.compile(
+    r'(?P<time>\b\d{1,2}(?::\d{2})?(?:\s*[ap]m)?\b)|(?P<number>\b\d+\b)',
+    re.IGNORECASE,
+)
+
 
 @dataclass
 class IntentResult:
@@ -47,6 +59,7 @@ class IntentClassifier:
         """
         self.model_type = model_type
         self.model = None
+        self._keyword_matcher = _KEYWORD_MATCHER
 
     def classify(
         self,
@@ -73,17 +86,25 @@ class IntentClassifier:
             return self._llm_classify(text, language)
 
     def _keyword_classify(self, text: str, language: str) -> IntentResult:
-        """Simple keyword-based classification."""
+        """Simple keyword-based classification of already lower-cased text."""
         best_intent = "unknown"
         best_confidence = 0.0
 
-        for intent, keywords in self.INTENTS.items():
-            matches = sum(1 for kw in keywords if kw in text)
-            if matches > 0:
-                confidence = min(matches / len(keywords) + 0.3, 1.0)
-                if confidence > best_confidence:
-                    best_confidence = confidence
-                    best_intent = intent
+        # One automaton pass finds every keyword; count distinct ones into a
+        # histogram indexed by intent id
+        counts = np.zeros(len(_INTENT_NAMES))
+        for _, intent_id in set(self._keyword_matcher.iter(text)):
+            counts[intent_id] += 1
+
+        # All confidences at once; intents without a match score 0, and
+        # argmax keeps the first intent on ties
+        confidences = np.where(
+            counts > 0, np.minimum(counts * _INV_KEYWORD_COUNTS + 0.3, 1.0), 0.0
+        )
+        best = int(confidences.argmax())
+        if confidences[best] > 0:
+            best_intent = _INTENT_NAMES[best]
+            best_confidence = float(confidences[best])
 
         # Extract basic entities
         entities = self._extract_entities(text)
@@ -110,23 +131,32 @@ class IntentClassifier:
     def _extract_entities(self, text: str) -> List[Dict[str, Any]]:
         """Extract entities from text (basic implementation)."""
         entities = []
+        seen = set()
 
-        # Simple time extraction
-        import re
-        time_pattern = r'\b(\d{1,2}(?::\d{2})?\s*(?:am|pm|AM|PM)?)\b'
-        times = re.findall(time_pattern, text)
-        for t in times:
-            entities.append({"type": "time", "value": t})
-
-        # Simple number extraction
-        number_pattern = r'\b(\d+)\b'
-        numbers = re.findall(number_pattern, text)
-        for n in numbers:
-            if n not in [e["value"] for e in entities]:
-                entities.append({"type": "number", "value": n})
+        # Simple time and number extraction in a single scan
+        for match in _ENTITY_RE.finditer(text):
+            value = match.group()
+            if value not in seen:
+                seen.add(value)
+                entities.append({"type": match.lastgroup, "value": value})
 
         return entities
 
     def get_supported_intents(self) -> List[str]:
         """Return list of supported intents."""
         return list(self.INTENTS.keys())
+
+
+# Intent names and 1 / number of keywords, in IntentClassifier.INTENTS order
+_INTENT_NAMES = list(IntentClassifier.INTENTS)
+_INV_KEYWORD_COUNTS = np.array(
+    [1.0 / len(keywords) for keywords in IntentClassifier.INTENTS.values()]
+)
+
+# Lower-cased keyword -> intent id (position in IntentClassifier.INTENTS);
+# classify() lower-cases the text
+_KEYWORD_MATCHER = KeywordMatcher({
+    keyword.lower(): intent_id
+    for intent_id, keywords in enumerate(IntentClassifier.INTENTS.values())
+    for keyword in keywords
+}, whole_words=True)
@@ -4,12 +4,22 @@ Detects user intent from transcribed text.
 """
 
 import logging
+import re
+import threading
 from dataclasses import dataclass
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 from enum import Enum
 
+import numpy as np
+
+from ..utils import KeywordMatcher
+
 logger = logging.getLogger(__name__)
 
+# "FIELD: value" lines of the LLM intent reply, and "key: value" entity pairs
+_FIELD_RE = re.compile(r"^[ \t]*(INTENT|ENTITIES|DESCRIPTION):[ \t]*(.*?)[ \t]*$", re.MULTILINE)
+_ENTITY_RE = re.compile(r"([^:,]+):([^,]*)")
+
 
 class IntentType(Enum):
     """Types of user intents."""
@@ -41,9 +51,69 @@ class Intent:
 class IntentDetector:
     """
     Detects intent from user input.
-    Uses keyword matching + LLM for complex cases.
+    Uses keyword matching, then sentence-embedding similarity, then the
+    LLM for the cases neither is confident about.
     """
 
+    # Model behind the LLM fallback; one instance per size is shared by
+    # every detector. On CUDA it loads as 4-bit NF4: classifying a short
+    # utterance is memory-bound decoding, so INT4 weights cut both VRAM
+    # and per-token latency
+    LLM_MODEL_SIZE = "1.5b"
+    LLM_QUANTIZATION = "bnb-nf4"
+    # The INTENT/ENTITIES/DESCRIPTION reply fits well inside this
+    LLM_MAX_NEW_TOKENS = 64
+    _LLM_CACHE: Dict[str, Any] = {}
+    _LLM_LOCK = threading.Lock()
+
+    # Small multilingual sentence encoder (~120MB) for the embedding tier:
+    # a few milliseconds on CPU against a full LLM generate call
+    EMBEDDING_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+    # Below this cosine similarity the LLM (if enabled) decides instead
+    EMBEDDING_MIN_CONFIDENCE = 0.6
+    _EMBEDDER_CACHE: Dict[str, Any] = {}
+    _EMBEDDER_LOCK = threading.Lock()
+
+    # Example utterances per intent; their mean embedding is the intent's
+    # centroid for the embedding tier
+    INTENT_EXAMPLES = {
+        IntentType.GREETING: [
+            "hello there", "good morning", "nice to meet you", "namaste",
+        ],
+        IntentType.WEATHER: [
+            "will it rain tomorrow", "is it hot outside",
+            "should I carry an umbrella", "what's the forecast for the weekend",
+        ],
+        IntentType.TIME: [
+            "what time is it", "what's the date today",
+            "which day is it", "how late is it now",
+        ],
+        IntentType.REMINDER: [
+            "remind me to call my mother", "set an alarm for six",
+            "don't let me forget the meeting", "schedule a doctor's appointment",
+        ],
+        IntentType.CALCULATION: [
+            "what is twelve times eight", "add forty and sixty",
+            "what's fifteen percent of two hundred", "divide ninety by three",
+        ],
+        IntentType.COMMAND: [
+            "turn off the lights", "play some music",
+            "open the door", "stop the fan",
+        ],
+        IntentType.INFORMATION: [
+            "who wrote this book", "explain how vaccines work",
+            "give me the latest news", "history of Kerala",
+        ],
+        IntentType.TASK: [
+            "book a taxi to the airport", "order groceries",
+            "send a message to my brother", "add milk to my shopping list",
+        ],
+        IntentType.GENERAL: [
+            "I'm feeling bored", "tell me a joke",
+            "thank you so much", "let's chat for a while",
+        ],
+    }
+
     # Keyword patterns for quick intent detection
     INTENT_PATTERNS = {
         IntentType.GREETING: [
@@ -76,23 +146,46 @@ class IntentDetector:
         ],
     }
 
-    def __init__(self, use_llm: bool = True):
+    def __init__(self, use_llm: bool = True, use_embeddings: bool = True):
         """
         Initialize intent detector.
 
         Args:
             use_llm: Whether to use LLM for complex intent detection
+            use_embeddings: Whether to try sentence-embedding similarity
+                before the LLM (needs sentence-transformers)
         """
         self.use_llm = use_llm
+        self.use_embeddings = use_embeddings
         self._llm = None
+        self._keyword_matcher = _KEYWORD_MATCHER
+
+    def load_model(self):
+        """Load the embedding model now rather than on the first detect()."""
+        if self.use_embeddings:
+            self._shared_embedder(self.EMBEDDING_MODEL)
 
     def _get_llm(self):
-        """Lazy load LLM for intent detection."""
+        """Lazy load the LLM for intent detection, shared across detectors."""
         if self._llm is None and self.use_llm:
-            from ..llm import QwenLLM
-            self._llm = QwenLLM(model_size="1.5b")
-            # Set a specific system prompt for intent detection
-            self._llm.set_system_prompt("""You are an intent classifier. Given a user message, identify:
+            self._llm = self._shared_llm(self.LLM_MODEL_SIZE)
+        return self._llm
+
+    @classmethod
+    def _shared_llm(cls, model_size: str):
+        """Return the intent LLM for model_size, creating it on first use."""
+        with cls._LLM_LOCK:
+            llm = cls._LLM_CACHE.get(model_size)
+            if llm is None:
+                from ..llm import QwenLLM
+                # Off CUDA a quantized QwenLLM needs llama.cpp, so the CPU
+                # fallback keeps full-precision weights
+                llm = QwenLLM(
+                    model_size=model_size,
+                    quantization=cls.LLM_QUANTIZATION if _cuda_available() else None,
+                )
+                # Set a specific system prompt for intent detection
+                llm.set_system_prompt("""You are an intent classifier. Given a user message, identify:
 1. The primary intent (greeting, question, command, weather, time, reminder, calculation, information, task, general)
 2. Key entities mentioned (names, numbers, locations, times)
 3. A brief description of what the user wants
@@ -101,7 +194,48 @@ Respond in this exact format:
 INTENT: <intent_type>
 ENTITIES: <key: value pairs or "none">
 DESCRIPTION: <brief description>""")
-        return self._llm
+                cls._LLM_CACHE[model_size] = llm
+            return llm
+
+    @classmethod
+    def _shared_embedder(cls, model_name: str):
+        """
+        Return the shared (encoder, intent types, centroids) for model_name.
+
+        Returns None when sentence-transformers is not installed or the
+        model fails to load; the failure is cached so it is not retried.
+        """
+        with cls._EMBEDDER_LOCK:
+            if model_name not in cls._EMBEDDER_CACHE:
+                cls._EMBEDDER_CACHE[model_name] = cls._load_embedder(model_name)
+            return cls._EMBEDDER_CACHE[model_name]
+
+    @classmethod
+    def _load_embedder(cls, model_name: str):
+        """Load the sentence encoder and embed the intent examples."""
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            logger.warning(
+                "sentence-transformers not installed; skipping embedding intent "
+                "detection. Run: pip install sentence-transformers"
+            )
+            return None
+
+        logger.info(f"Loading intent embedding model: {model_name}")
+        try:
+            encoder = SentenceTransformer(model_name, device="cpu")
+            centroids = np.stack([
+                encoder.encode(examples, normalize_embeddings=True).mean(axis=0)
+                for examples in cls.INTENT_EXAMPLES.values()
+            ])
+        except Exception as e:
+            logger.warning(f"Intent embedding model unavailable; skipping embedding tier: {e}")
+            return None
+
+        intent_types = list(cls.INTENT_EXAMPLES)
+        centroids /= np.linalg.norm(centroids, axis=1, keepdims=True)
+        return encoder, intent_types, centroids
 
     def detect(
         self,
@@ -136,6 +270,20 @@ DESCRIPTION: <brief description>""")
                 description=self._get_intent_description(detected_intent, analysis_text)
             )
 
+        # Nearest intent centroid; the LLM only sees low-confidence cases
+        if self.use_embeddings:
+            match = self._embedding_detect(english_text or text)
+            if match is not None and match[1] >= self.EMBEDDING_MIN_CONFIDENCE:
+                intent_type, confidence = match
+                return Intent(
+                    type=intent_type,
+                    confidence=confidence,
+                    entities={},
+                    original_text=text,
+                    english_text=english_text or text,
+                    description=self._get_intent_description(intent_type, analysis_text)
+                )
+
         # Use LLM for complex cases
         if self.use_llm:
             return self._llm_detect(text, english_text or text)
@@ -151,21 +299,45 @@ DESCRIPTION: <brief description>""")
         )
 
     def _keyword_detect(self, text: str) -> Optional[IntentType]:
-        """Detect intent using keyword matching."""
-        text_lower = text.lower()
+        """Detect intent using keyword matching on already lower-cased text."""
+        # One automaton pass finds every keyword
+        matches = set(self._keyword_matcher.iter(text))
+
+        # Most utterances hit no keyword or keywords of a single intent;
+        # only a mix of intents needs scoring
+        intent_ids = {intent_id for _, intent_id in matches}
+        if len(intent_ids) <= 1:
+            return _INTENT_ORDER[intent_ids.pop()] if intent_ids else None
+
+        # Count distinct keywords into a histogram indexed by intent id
+        scores = np.zeros(len(_INTENT_ORDER), dtype=np.int32)
+        for _, intent_id in matches:
+            scores[intent_id] += 1
+
+        # Return intent with highest score; argmax picks the first on ties,
+        # so pattern order breaks them
+        best = int(scores.argmax())
+        if scores[best]:
+            return _INTENT_ORDER[best]
 
-        # Check each intent pattern
-        scores = {}
-        for intent_type, keywords in self.INTENT_PATTERNS.items():
-            score = sum(1 for kw in keywords if kw in text_lower)
-            if score > 0:
-                scores[intent_type] = score
+        return None
 
-        if scores:
-            # Return intent with highest score
-            return max(scores, key=scores.get)
+    def _embedding_detect(self, text: str) -> Optional[Tuple[IntentType, float]]:
+        """
+        Match text to the most similar intent centroid.
 
-        return None
+        Returns:
+            (intent type, cosine similarity), or None if no encoder is available
+        """
+        embedder = self._shared_embedder(self.EMBEDDING_MODEL)
+        if embedder is None:
+            return None
+
+        encoder, intent_types, centroids = embedder
+        embedding = encoder.encode([text], normalize_embeddings=True)[0]
+        similarities = centroids @ embedding
+        best = int(similarities.argmax())
+        return intent_types[best], float(similarities[best])
 
     def _llm_detect(self, original_text: str, english_text: str) -> Intent:
         """Use LLM for intent detection."""
@@ -185,7 +357,8 @@ DESCRIPTION: <brief description>""")
             response = llm.chat(
                 f"Classify this user message: \"{english_text}\"",
                 remember=False,
-                max_new_tokens=100,
+                max_new_tokens=self.LLM_MAX_NEW_TOKENS,
+                temperature=0.0,
             )
 
             # Parse LLM response
@@ -213,29 +386,18 @@ DESCRIPTION: <brief description>""")
         english_text: str
     ) -> Intent:
         """Parse LLM response into Intent object."""
-        intent_type = IntentType.GENERAL
+        fields = {m[1]: m[2] for m in _FIELD_RE.finditer(response)}
+
+        intent_type = _INTENT_TYPES.get(fields.get("INTENT", "").lower(), IntentType.GENERAL)
+
         entities = {}
-        description = "General query"
-
-        lines = response.strip().split('\n')
-        for line in lines:
-            line = line.strip()
-            if line.startswith("INTENT:"):
-                intent_str = line.replace("INTENT:", "").strip().lower()
-                try:
-                    intent_type = IntentType(intent_str)
-                except ValueError:
-                    intent_type = IntentType.GENERAL
-            elif line.startswith("ENTITIES:"):
-                entities_str = line.replace("ENTITIES:", "").strip()
-                if entities_str.lower() != "none":
-                    # Simple parsing of key: value pairs
-                    for pair in entities_str.split(","):
-                        if ":" in pair:
-                            k, v = pair.split(":", 1)
-                            entities[k.strip()] = v.strip()
-            elif line.startswith("DESCRIPTION:"):
-                description = line.replace("DESCRIPTION:", "").strip()
+        entities_str = fields.get("ENTITIES", "")
+        if entities_str.lower() != "none":
+            # Simple parsing of key: value pairs
+            for key, value in _ENTITY_RE.findall(entities_str):
+                entities[key.strip()] = value.strip()
+
+        description = fields.get("DESCRIPTION", "General query")
 
         return Intent(
             type=intent_type,
@@ -256,6 +418,31 @@ DESCRIPTION: <brief description>""")
             IntentType.CALCULATION: "User wants to perform a calculation",
             IntentType.QUESTION: "User is asking a question",
             IntentType.COMMAND: "User is giving a command or instruction",
+            IntentType.INFORMATION: "User is looking for information",
+            IntentType.TASK: "User wants a task done",
             IntentType.GENERAL: "General conversation or query",
         }
         return descriptions.get(intent_type, "General query")
+
+
+def _cuda_available() -> bool:
+    """Whether torch is installed and can see a GPU."""
+    try:
+        import torch
+    except ImportError:
+        return False
+    return torch.cuda.is_available()
+
+
+# Intent type by value, for parsing the LLM reply
+_INTENT_TYPES = {intent_type.value: intent_type for intent_type in IntentType}
+
+# Intent ids are positions in IntentDetector.INTENT_PATTERNS
+_INTENT_ORDER = list(IntentDetector.INTENT_PATTERNS)
+
+# Keywords are lower-cased to match the lower-cased text
+_KEYWORD_MATCHER = KeywordMatcher({
+    keyword.lower(): intent_id
+    for intent_id, keywords in enumerate(IntentDetector.INTENT_PATTERNS.values())
+    for keyword in keywords
+}, whole_words=True)
@@ -3,17 +3,54 @@ Voice Assistant Pipeline Orchestrator
 Connects all components: ASR → Translation → LLM → Translation → TTS
 """
 
+import asyncio
 import logging
+import re
+import sys
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Optional, Union
+from typing import Callable, Optional, Union
 from pathlib import Path
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Flush a streamed sentence after this many pieces even without punctuation
+MAX_SENTENCE_TOKENS = 80
 
-@dataclass
+_SENTENCE_END = re.compile(r"[.?!]\s*$")
+
+_WHITESPACE = re.compile(r"\s+")
+
+# dataclass(slots=True) needs Python 3.10; on 3.9 results keep a __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _elapsed_ms(start_ns: int) -> float:
+    """Milliseconds since a time.perf_counter_ns() reading."""
+    return (time.perf_counter_ns() - start_ns) / 1e6
+
+
+def is_sentence_boundary(buffer: str, token: str, token_count: int = 0) -> bool:
+    """
+    Decide whether a streamed LLM buffer ends a speakable chunk.
+
+    Args:
+        buffer: Text accumulated so far
+        token: Newly generated text piece
+        token_count: Number of pieces in the buffer
+
+    Returns:
+        True if the buffer plus token should be sent to translation/TTS
+    """
+    if _SENTENCE_END.search(buffer + token):
+        return True
+    return token_count >= MAX_SENTENCE_TOKENS
+
+
+@dataclass(**_SLOTS)
 class PipelineResult:
     """Result from the voice assistant pipeline."""
     # Input
@@ -45,6 +82,9 @@ class PipelineResult:
     audio_output: Optional[Union[np.ndarray, str]] = None
     tts_time_ms: float = 0
 
+    # Streaming: time until the first audio chunk was ready
+    first_audio_time_ms: float = 0
+
     # Total
     total_time_ms: float = 0
     success: bool = True
@@ -59,8 +99,16 @@ class VoiceAssistantPipeline:
     Audio → ASR → Malayalam Text → Translate → English Text
          → Intent Detection → LLM → English Response
          → Translate → Malayalam Response → TTS → Audio
+
+    Responses to repeated queries are cached by (intent, normalized
+    English text), so a hit skips the LLM, EN→ML translation and TTS.
+    Only opening turns use the cache: once a conversation has history,
+    the answer may depend on it ("why?", "tell me more").
     """
 
+    # Intents whose answers change over time are never served from cache
+    UNCACHED_INTENTS = frozenset({"time", "weather", "reminder"})
+
     def __init__(
         self,
         asr_engine: str = "whisper",
@@ -69,17 +117,21 @@ class VoiceAssistantPipeline:
         tts_engine: str = "mms",
         device: str = "cuda",
         detect_intent: bool = True,
+        compute_type: str = "int8_float16",
+        response_cache_size: int = 512,
     ):
         """
         Initialize the pipeline.
 
         Args:
-            asr_engine: ASR engine to use (whisper, meta_asr)
+            asr_engine: ASR engine to use (whisper, faster_whisper, meta_asr)
             asr_model_size: Size of ASR model
             llm_model_size: Size of Qwen model (0.5b, 1.5b, 3b, 7b)
             tts_engine: TTS engine to use (mms, cartesia)
             device: Device to run on (cuda, cpu)
             detect_intent: Whether to detect and show intent
+            compute_type: CTranslate2 compute type for faster_whisper
+            response_cache_size: Maximum number of cached responses (0 disables)
         """
         self.asr_engine = asr_engine
         self.asr_model_size = asr_model_size
@@ -87,6 +139,7 @@ class VoiceAssistantPipeline:
         self.tts_engine = tts_engine
         self.device = device
         self.detect_intent = detect_intent
+        self.compute_type = compute_type
 
         # Components (lazy loaded)
         self._asr = None
@@ -94,39 +147,49 @@ class VoiceAssistantPipeline:
         self._llm = None
         self._tts = None
         self._intent_detector = None
+        # Set once load_components has loaded everything
+        self._ready = False
+
+        # (intent, normalized text) -> (english, malayalam, pcm16 bytes, sample_rate)
+        self.response_cache_size = response_cache_size
+        self._response_cache = OrderedDict()
+        # process() may run concurrently for different conversation_ids
+        self._response_lock = threading.Lock()
 
         logger.info(f"Pipeline initialized: ASR={asr_engine}, LLM=qwen-{llm_model_size}, TTS={tts_engine}")
 
     def load_components(self, show_progress: bool = True):
-        """Load all pipeline components."""
-        if show_progress:
-            print("Loading pipeline components...")
+        """
+        Load all pipeline components.
 
-        # Load ASR
-        if show_progress:
-            print("  [1/5] Loading ASR...")
-        self._load_asr()
+        The model loaders run in parallel threads: most of each load is
+        disk reads and host-to-device copies, which release the GIL, so
+        the models overlap instead of loading one after another. The
+        intent detector loads in the same pool.
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
 
-        # Load Translator
         if show_progress:
-            print("  [2/5] Loading Translation models...")
-        self._load_translator()
+            print("Loading pipeline components...")
 
-        # Load LLM
-        if show_progress:
-            print("  [3/5] Loading LLM...")
-        self._load_llm()
+        loaders = {
+            self._load_asr: "ASR",
+            self._load_translator: "Translation models",
+            self._load_llm: "LLM",
+            self._load_tts: "TTS",
+        }
+        if self.detect_intent:
+            loaders[self._load_intent_detector] = "Intent Detector"
+        total = len(loaders)
 
-        # Load TTS
-        if show_progress:
-            print("  [4/5] Loading TTS...")
-        self._load_tts()
+        with ThreadPoolExecutor(max_workers=total) as executor:
+            futures = {executor.submit(loader): name for loader, name in loaders.items()}
+            for done, future in enumerate(as_completed(futures), 1):
+                future.result()
+                if show_progress:
+                    print(f"  [{done}/{total}] {futures[future]} loaded")
 
-        # Load Intent Detector
-        if self.detect_intent:
-            if show_progress:
-                print("  [5/5] Loading Intent Detector...")
-            self._load_intent_detector()
+        self._ready = True
 
         if show_progress:
             print("✓ All components loaded!")
@@ -137,10 +200,15 @@ class VoiceAssistantPipeline:
             return
 
         if self.asr_engine == "whisper":
-            from ..asr import WhisperASR
-            self._asr = WhisperASR(
+            from ..asr import get_asr
+            self._asr = get_asr(model_size=self.asr_model_size, device=self.device)
+            self._asr.load_model()
+        elif self.asr_engine == "faster_whisper":
+            from ..asr import FasterWhisperASR
+            self._asr = FasterWhisperASR(
                 model_size=self.asr_model_size,
                 device=self.device,
+                compute_type=self.compute_type,
             )
             self._asr.load_model()
         else:
@@ -151,8 +219,8 @@ class VoiceAssistantPipeline:
         if self._translator is not None:
             return
 
-        from ..translation import IndicTranslator
-        self._translator = IndicTranslator(device=self.device)
+        from ..translation import get_translator
+        self._translator = get_translator(device=self.device)
         # Pre-load both directions
         self._translator.load_models(["indic-en", "en-indic"])
 
@@ -161,6 +229,8 @@ class VoiceAssistantPipeline:
         if self._llm is not None:
             return
 
+        # A private instance: the system prompt and conversation history
+        # must not leak into other get_llm() users
         from ..llm import QwenLLM
         self._llm = QwenLLM(
             model_size=self.llm_model_size,
@@ -183,8 +253,8 @@ Be conversational and helpful.""")
         if self._tts is not None:
             return
 
-        from ..tts import TTSEngine
-        self._tts = TTSEngine(backend=self.tts_engine, device=self.device)
+        from ..tts import get_tts
+        self._tts = get_tts(backend=self.tts_engine, device=self.device)
 
     def _load_intent_detector(self):
         """Load intent detector."""
@@ -192,7 +262,10 @@ Be conversational and helpful.""")
             return
 
         from .intent import IntentDetector
-        self._intent_detector = IntentDetector(use_llm=False)  # Use keyword-based for speed
+        # Keywords, then embeddings; no LLM call per turn
+        detector = IntentDetector(use_llm=False)
+        detector.load_model()
+        self._intent_detector = detector
 
     def process(
         self,
@@ -200,6 +273,7 @@ Be conversational and helpful.""")
         text_input: Optional[str] = None,
         input_language: str = "ml",
         output_audio_path: Optional[str] = None,
+        conversation_id: Optional[str] = None,
     ) -> PipelineResult:
         """
         Process a voice query through the full pipeline.
@@ -209,82 +283,319 @@ Be conversational and helpful.""")
             text_input: Direct text input (skips ASR)
             input_language: Input language code (ml, en)
             output_audio_path: Path to save output audio
+            conversation_id: Separate LLM history to use, so independent
+                queries can run concurrently (None for the shared one)
 
         Returns:
             PipelineResult with all intermediate results
         """
         result = PipelineResult(audio_input=audio_path)
-        total_start = time.perf_counter()
+        total_start = time.perf_counter_ns()
 
         try:
-            # Stage 1: ASR (if audio provided)
-            if audio_path:
-                start = time.perf_counter()
-                self._load_asr()
-                asr_result = self._asr.transcribe(audio_path)
-                result.malayalam_text = asr_result["text"]
-                result.asr_time_ms = (time.perf_counter() - start) * 1000
-                logger.info(f"ASR: {result.malayalam_text}")
-            elif text_input:
-                result.malayalam_text = text_input
-                result.asr_time_ms = 0
-            else:
-                raise ValueError("Either audio_path or text_input must be provided")
-
-            # Stage 2: Translate ML → EN (if input is Malayalam)
-            if input_language == "ml":
-                start = time.perf_counter()
-                self._load_translator()
-                result.english_text = self._translator.ml_to_en(result.malayalam_text)
-                result.translation_ml_en_time_ms = (time.perf_counter() - start) * 1000
-                logger.info(f"Translation ML→EN: {result.english_text}")
-            else:
-                result.english_text = result.malayalam_text
-                result.translation_ml_en_time_ms = 0
-
-            # Stage 3: Intent Detection
-            if self.detect_intent and self._intent_detector:
-                from .intent import IntentDetector
-                if self._intent_detector is None:
-                    self._intent_detector = IntentDetector(use_llm=False)
-
-                intent = self._intent_detector.detect(
-                    result.malayalam_text,
-                    result.english_text
+            # Stages 1-3: ASR, ML→EN translation, intent
+            self._process_input(result, audio_path, text_input, input_language)
+
+            cache_key = self._response_key(result, conversation_id)
+            cached = self._cached_response(cache_key) if cache_key else None
+            if cached is not None:
+                self._apply_cached_response(result, cached, output_audio_path)
+                # Keep the exchange in history so follow-ups have context
+                self._llm.remember(
+                    result.english_text, result.english_response, conversation_id
                 )
-                result.intent_type = intent.type.value
-                result.intent_description = intent.description
-                result.intent_confidence = intent.confidence
-                result.intent_entities = intent.entities
-                logger.info(f"Intent: {result.intent_type} - {result.intent_description}")
+                logger.info(f"Response cache hit: {result.english_response}")
+                result.total_time_ms = _elapsed_ms(total_start)
+                return result
+
+            if not self._ready:
+                self._load_llm()
+                self._load_translator()
+                self._load_tts()
 
             # Stage 4: LLM Response
-            start = time.perf_counter()
-            self._load_llm()
-            llm_response = self._llm.chat(result.english_text)
+            start = time.perf_counter_ns()
+            llm_response = self._llm.chat(result.english_text, conversation_id=conversation_id)
             result.english_response = llm_response.content
-            result.llm_time_ms = (time.perf_counter() - start) * 1000
+            result.llm_time_ms = _elapsed_ms(start)
             logger.info(f"LLM Response: {result.english_response}")
 
             # Stage 5: Translate EN → ML
-            start = time.perf_counter()
-            self._load_translator()
+            start = time.perf_counter_ns()
             result.malayalam_response = self._translator.en_to_ml(result.english_response)
-            result.translation_en_ml_time_ms = (time.perf_counter() - start) * 1000
+            result.translation_en_ml_time_ms = _elapsed_ms(start)
             logger.info(f"Translation EN→ML: {result.malayalam_response}")
 
             # Stage 6: TTS
-            start = time.perf_counter()
-            self._load_tts()
+            start = time.perf_counter_ns()
             tts_result = self._tts.synthesize(
                 text=result.malayalam_response,
                 language="ml",
                 output_path=output_audio_path,
             )
             result.audio_output = tts_result.audio
-            result.tts_time_ms = (time.perf_counter() - start) * 1000
+            result.tts_time_ms = _elapsed_ms(start)
             logger.info(f"TTS complete")
 
+            if cache_key and isinstance(tts_result.audio, np.ndarray):
+                self._cache_response(cache_key, result, tts_result.sample_rate)
+
+            result.success = True
+
+        except Exception as e:
+            logger.error(f"Pipeline error: {e}")
+            result.success = False
+            result.error = str(e)
+
+        result.total_time_ms = _elapsed_ms(total_start)
+        return result
+
+    def _response_key(
+        self, result: PipelineResult, conversation_id: Optional[str] = None
+    ) -> Optional[tuple]:
+        """Return the response cache key for result, or None if uncacheable."""
+        if not self.response_cache_size or result.intent_type in self.UNCACHED_INTENTS:
+            return None
+        # A cached answer is only valid where there is no earlier context
+        if self._llm is not None and self._llm.has_history(conversation_id):
+            return None
+        text = _WHITESPACE.sub(" ", result.english_text.strip().lower())
+        return (result.intent_type, text) if text else None
+
+    def _cache_response(self, key: tuple, result: PipelineResult, sample_rate: int):
+        """Store a response, evicting the least recently used one if full."""
+        # int16 PCM takes half the memory of the float32 waveform
+        pcm = (np.clip(result.audio_output, -1.0, 1.0) * 32767).astype(np.int16)
+        entry = (
+            result.english_response,
+            result.malayalam_response,
+            pcm.tobytes(),
+            sample_rate,
+        )
+        with self._response_lock:
+            self._response_cache[key] = entry
+            self._response_cache.move_to_end(key)
+            while len(self._response_cache) > self.response_cache_size:
+                self._response_cache.popitem(last=False)
+
+    def _cached_response(self, key: tuple) -> Optional[tuple]:
+        """Return the cached response for key, marking it recently used."""
+        with self._response_lock:
+            cached = self._response_cache.get(key)
+            if cached is not None:
+                self._response_cache.move_to_end(key)
+            return cached
+
+    @staticmethod
+    def _apply_cached_response(
+        result: PipelineResult,
+        cached: tuple,
+        output_audio_path: Optional[str] = None,
+    ):
+        """Fill the response stages of result from a cache entry."""
+        english, malayalam, pcm, sample_rate = cached
+        result.english_response = english
+        result.malayalam_response = malayalam
+        result.audio_output = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        if output_audio_path:
+            import soundfile as sf
+            sf.write(str(output_audio_path), result.audio_output, samplerate=sample_rate)
+            result.audio_output = str(output_audio_path)
+        result.success = True
+
+    def _process_input(
+        self,
+        result: PipelineResult,
+        audio_path: Optional[str],
+        text_input: Optional[str],
+        input_language: str,
+    ):
+        """Run the ASR, ML→EN translation and intent stages into result."""
+        if not self._ready:
+            if audio_path:
+                self._load_asr()
+            if input_language == "ml":
+                self._load_translator()
+
+        # Stage 1: ASR (if audio provided)
+        if audio_path:
+            start = time.perf_counter_ns()
+            asr_result = self._asr.transcribe(audio_path)
+            result.malayalam_text = asr_result["text"]
+            result.asr_time_ms = _elapsed_ms(start)
+            logger.info(f"ASR: {result.malayalam_text}")
+        elif text_input:
+            result.malayalam_text = text_input
+            result.asr_time_ms = 0
+        else:
+            raise ValueError("Either audio_path or text_input must be provided")
+
+        # Stage 2: Translate ML → EN (if input is Malayalam)
+        if input_language == "ml":
+            start = time.perf_counter_ns()
+            result.english_text = self._translator.ml_to_en(result.malayalam_text)
+            result.translation_ml_en_time_ms = _elapsed_ms(start)
+            logger.info(f"Translation ML→EN: {result.english_text}")
+        else:
+            result.english_text = result.malayalam_text
+            result.translation_ml_en_time_ms = 0
+
+        # Stage 3: Intent Detection
+        if self.detect_intent and self._intent_detector is not None:
+            intent = self._intent_detector.detect(
+                result.malayalam_text,
+                result.english_text
+            )
+            result.intent_type = intent.type.value
+            result.intent_description = intent.description
+            result.intent_confidence = intent.confidence
+            result.intent_entities = intent.entities
+            logger.info(f"Intent: {result.intent_type} - {result.intent_description}")
+
+    async def process_streaming(
+        self,
+        audio_path: Optional[str] = None,
+        text_input: Optional[str] = None,
+        input_language: str = "ml",
+        output_audio_path: Optional[str] = None,
+        on_audio: Optional[Callable[[int, str, np.ndarray], None]] = None,
+        conversation_id: Optional[str] = None,
+    ) -> PipelineResult:
+        """
+        Process a query, synthesizing the response sentence by sentence.
+
+        The LLM response is streamed; each completed sentence is translated
+        EN→ML and synthesized while the LLM keeps generating, so the first
+        audio is ready long before the full response is. Translation and
+        TTS are separate queue stages, so sentence N+1 is translated while
+        sentence N is synthesized, and the LLM and TTS models load while
+        ASR and ML→EN translation run. Sentences are handled in order, so
+        on_audio sees them in response order.
+
+        Args:
+            audio_path: Path to input audio file (Malayalam speech)
+            text_input: Direct text input (skips ASR)
+            input_language: Input language code (ml, en)
+            output_audio_path: Path to save the full response audio
+            on_audio: Called with (index, malayalam_sentence, audio) per sentence
+            conversation_id: Separate LLM history to use (None for the shared one)
+
+        Returns:
+            PipelineResult with all intermediate results
+        """
+        result = PipelineResult(audio_input=audio_path)
+        total_start = time.perf_counter_ns()
+        loop = asyncio.get_running_loop()
+        sentences = asyncio.Queue()
+        translated = asyncio.Queue()
+
+        english_parts = []
+        malayalam_parts = []
+        audio_parts = []
+        # With output_audio_path, sentences go straight into this open file
+        # instead of being kept and concatenated at the end
+        writer = None
+
+        async def translate():
+            try:
+                while True:
+                    sentence = await sentences.get()
+                    if sentence is None:
+                        break
+
+                    start = time.perf_counter_ns()
+                    malayalam = await asyncio.to_thread(self._translator.en_to_ml, sentence)
+                    result.translation_en_ml_time_ms += _elapsed_ms(start)
+                    await translated.put(malayalam)
+            finally:
+                await translated.put(None)
+
+        async def speak():
+            nonlocal writer
+            index = 0
+            while True:
+                malayalam = await translated.get()
+                if malayalam is None:
+                    break
+
+                start = time.perf_counter_ns()
+                tts_result = await asyncio.to_thread(
+                    self._tts.synthesize, text=malayalam, language="ml"
+                )
+                result.tts_time_ms += _elapsed_ms(start)
+
+                if index == 0:
+                    result.first_audio_time_ms = _elapsed_ms(total_start)
+                malayalam_parts.append(malayalam)
+                if output_audio_path:
+                    if writer is None:
+                        import soundfile as sf
+                        writer = sf.SoundFile(
+                            str(output_audio_path), "w",
+                            samplerate=tts_result.sample_rate, channels=1,
+                        )
+                    await asyncio.to_thread(writer.write, tts_result.audio)
+                else:
+                    audio_parts.append(tts_result.audio)
+                if on_audio:
+                    on_audio(index, malayalam, tts_result.audio)
+                index += 1
+
+        def generate():
+            buffer = ""
+            count = 0
+            try:
+                for piece in self._llm.stream(
+                    result.english_text, conversation_id=conversation_id
+                ):
+                    english_parts.append(piece)
+                    if is_sentence_boundary(buffer, piece, count):
+                        sentence = (buffer + piece).strip()
+                        if sentence:
+                            loop.call_soon_threadsafe(sentences.put_nowait, sentence)
+                        buffer = ""
+                        count = 0
+                    else:
+                        buffer += piece
+                        count += 1
+                if buffer.strip():
+                    loop.call_soon_threadsafe(sentences.put_nowait, buffer.strip())
+            finally:
+                loop.call_soon_threadsafe(sentences.put_nowait, None)
+
+        try:
+            # Stages 1-3: ASR, ML→EN translation, intent; the LLM and TTS
+            # load alongside them (the translator is loaded by stage 2)
+            await asyncio.gather(
+                asyncio.to_thread(
+                    self._process_input, result, audio_path, text_input, input_language
+                ),
+                asyncio.to_thread(self._load_llm),
+                asyncio.to_thread(self._load_tts),
+            )
+            await asyncio.to_thread(self._load_translator)
+
+            # Stages 4-6: LLM streaming overlapped with EN→ML translation + TTS
+            translator = asyncio.create_task(translate())
+            speaker = asyncio.create_task(speak())
+            start = time.perf_counter_ns()
+            try:
+                await asyncio.to_thread(generate)
+            finally:
+                result.llm_time_ms = _elapsed_ms(start)
+                await asyncio.gather(translator, speaker)
+
+            result.english_response = "".join(english_parts).strip()
+            result.malayalam_response = " ".join(malayalam_parts)
+            logger.info(f"LLM Response: {result.english_response}")
+            logger.info(f"Translation EN→ML: {result.malayalam_response}")
+
+            if writer is not None:
+                writer.close()
+                result.audio_output = str(output_audio_path)
+            elif audio_parts:
+                result.audio_output = np.concatenate(audio_parts)
+
             result.success = True
 
         except Exception as e:
@@ -292,14 +603,48 @@ Be conversational and helpful.""")
             result.success = False
             result.error = str(e)
 
-        result.total_time_ms = (time.perf_counter() - total_start) * 1000
+        finally:
+            if writer is not None:
+                writer.close()
+
+        result.total_time_ms = _elapsed_ms(total_start)
         return result
 
+    async def process_text_streaming(
+        self,
+        text: str,
+        input_language: str = "ml",
+        output_audio_path: Optional[str] = None,
+        on_audio: Optional[Callable[[int, str, np.ndarray], None]] = None,
+        conversation_id: Optional[str] = None,
+    ) -> PipelineResult:
+        """
+        Process text input (skip ASR) with sentence-streamed TTS.
+
+        Args:
+            text: Input text
+            input_language: Language of input (ml or en)
+            output_audio_path: Path to save output audio
+            on_audio: Called with (index, malayalam_sentence, audio) per sentence
+            conversation_id: Separate LLM history to use (None for the shared one)
+
+        Returns:
+            PipelineResult
+        """
+        return await self.process_streaming(
+            text_input=text,
+            input_language=input_language,
+            output_audio_path=output_audio_path,
+            on_audio=on_audio,
+            conversation_id=conversation_id,
+        )
+
     def process_text(
         self,
         text: str,
         input_language: str = "ml",
         output_audio_path: Optional[str] = None,
+        conversation_id: Optional[str] = None,
     ) -> PipelineResult:
         """
         Process text input (skip ASR).
@@ -308,6 +653,7 @@ Be conversational and helpful.""")
             text: Input text
             input_language: Language of input (ml or en)
             output_audio_path: Path to save output audio
+            conversation_id: Separate LLM history to use (None for the shared one)
 
         Returns:
             PipelineResult
@@ -316,10 +662,11 @@ Be conversational and helpful.""")
             text_input=text,
             input_language=input_language,
             output_audio_path=output_audio_path,
+            conversation_id=conversation_id,
         )
 
-    def clear_conversation(self):
+    def clear_conversation(self, conversation_id: Optional[str] = None):
         """Clear LLM conversation history."""
         if self._llm:
-            self._llm.clear_history()
+            self._llm.clear_history(conversation_id)
             logger.info("Conversation history cleared")
@@ -1,5 +1,5 @@
 """Translation Module"""
 
-from .indictrans import IndicTranslator, translate
+from .indictrans import IndicTranslator, get_translator, translate
 
-__all__ = ["IndicTranslator", "translate"]
+__all__ = ["IndicTranslator", "get_translator", "translate"]
@@ -4,7 +4,13 @@ Provides Malayalam <-> English translation using AI4Bharat's IndicTrans2.
 """
 
 import logging
-from typing import Optional, Literal
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+
+from ..utils import enable_compile_cache, release_cuda_memory
+from typing import List, Optional, Literal
 
 logger = logging.getLogger(__name__)
 
@@ -37,10 +43,41 @@ class IndicTranslator:
         "en": "eng_Latn",  # English
     }
 
+    # Display names of supported languages
+    SUPPORTED_LANGUAGES = {
+        "ml": "Malayalam",
+        "hi": "Hindi",
+        "ta": "Tamil",
+        "te": "Telugu",
+        "bn": "Bengali",
+        "mr": "Marathi",
+        "gu": "Gujarati",
+        "kn": "Kannada",
+        "pa": "Punjabi",
+        "en": "English",
+    }
+
+    # Decoding settings per mode: greedy for the live voice path, where
+    # short conversational turns gain little from beams; beam search with
+    # early stopping when quality matters more than latency
+    GENERATION_MODES = {
+        "fast": {"num_beams": 1, "do_sample": False},
+        "quality": {"num_beams": 5, "early_stopping": True, "length_penalty": 1.0},
+    }
+
+    # Only texts shorter than this are cached: repeated greetings and
+    # confirmations, not one-off long sentences
+    CACHE_MAX_CHARS = 128
+
     def __init__(
         self,
         device: str = "cuda",
         load_on_init: bool = False,
+        backend: Literal["torch", "onnx"] = "torch",
+        onnx_dir: Optional[str] = None,
+        quantization: Optional[Literal["int8", "nf4"]] = None,
+        compile: bool = False,
+        cache_size: int = 512,
     ):
         """
         Initialize IndicTrans2 translator.
@@ -48,27 +85,103 @@ class IndicTranslator:
         Args:
             device: Device to run on - cuda or cpu
             load_on_init: Whether to load models immediately
+            backend: "torch" for transformers models, or "onnx" to run the
+                exported encoder/decoder on ONNX Runtime (needs optimum)
+            onnx_dir: Directory written by export_onnx(); with the onnx
+                backend and no export there, models are exported on load
+            quantization: Weight-only quantization for the torch backend.
+                On CUDA, "int8" and "nf4" quantize at load time with
+                bitsandbytes; on CPU, "int8" applies dynamic INT8
+                quantization to linear layers (nf4 is CUDA only)
+            compile: Compile the forward pass with a static KV cache (CUDA
+                and torch backend only); adds a one-off warmup per direction
+            cache_size: Maximum number of cached short translations
+                (0 disables)
         """
         self.device = device
+        self.backend = backend
+        self.onnx_dir = onnx_dir
+        self.quantization = quantization
+        self.compile = compile
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        # The singleton translator is shared by worker threads
+        self._cache_lock = threading.Lock()
+        # Concurrent first requests must not load the same model twice
+        self._load_lock = threading.Lock()
         self.models = {}
         self.tokenizers = {}
+        # (direction, target language tag) -> forced BOS token ID
+        self._bos_token_ids = {}
+        # (direction, source language tag) -> token IDs of the tag prefix
+        self._prefix_ids = {}
 
         if load_on_init:
             self.load_models()
 
     def load_models(self, directions: Optional[list] = None):
         """
-        Load translation models.
+        Load translation models (already loaded directions are skipped).
+
+        If the GPU runs out of memory, every model is reloaded on CPU
+        instead, so all directions keep running on one device.
 
         Args:
             directions: List of directions to load ["en-indic", "indic-en"]
                        If None, loads both.
         """
-        from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
         import torch
 
         directions = directions or ["en-indic", "indic-en"]
 
+        with self._load_lock:
+            try:
+                self._load_models(directions)
+            except torch.cuda.OutOfMemoryError:
+                if self.device != "cuda":
+                    raise
+                logger.warning("Out of GPU memory loading IndicTrans2, falling back to CPU")
+                reload = list(self.models) + [d for d in directions if d not in self.models]
+                self.models.clear()
+                release_cuda_memory(collect=True)
+                self.device = "cpu"
+                self._load_models(reload)
+
+    def _load_models(self, directions: List[str]):
+        """Load translation models for the given directions."""
+        from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+        import torch
+
+        if self.backend == "onnx":
+            self._load_onnx_models(directions)
+            return
+
+        use_cuda = self.device == "cuda" and torch.cuda.is_available()
+        if use_cuda:
+            # Decoding is memory-bound: half-precision weights halve the
+            # bytes read per step. BF16 where supported (Ampere+), else FP16
+            dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+        else:
+            dtype = torch.float32
+            self.device = "cpu"
+        # Allow TF32 tensor-core matmuls for any remaining FP32 work
+        torch.set_float32_matmul_precision("high")
+
+        quantization_config = None
+        if use_cuda and self.quantization:
+            # Decode is bandwidth-bound: 8-bit (4-bit) weights read half
+            # (a quarter) of the bytes of FP16, and both directions fit
+            # on a 6 GB GPU
+            from transformers import BitsAndBytesConfig
+            if self.quantization == "int8":
+                quantization_config = BitsAndBytesConfig(load_in_8bit=True)
+            else:
+                quantization_config = BitsAndBytesConfig(
+                    load_in_4bit=True,
+                    bnb_4bit_quant_type="nf4",
+                    bnb_4bit_compute_dtype=dtype,
+                )
+
         for direction in directions:
             if direction in self.models:
                 continue
@@ -81,34 +194,161 @@ class IndicTranslator:
                     model_id,
                     trust_remote_code=True,
                 )
+                # low_cpu_mem_usage skips random weight init before the
+                # checkpoint is loaded over it; device_map places weights
+                # straight on the GPU in the target dtype
                 model = AutoModelForSeq2SeqLM.from_pretrained(
                     model_id,
                     trust_remote_code=True,
+                    low_cpu_mem_usage=True,
+                    torch_dtype=dtype,
+                    device_map={"": "cuda"} if use_cuda else None,
+                    quantization_config=quantization_config,
                 )
 
-                if self.device == "cuda" and torch.cuda.is_available():
-                    model = model.to("cuda")
-                else:
-                    model = model.to("cpu")
-                    self.device = "cpu"
+                if not use_cuda and self.quantization == "int8":
+                    # Quarter the FP32 weight memory on CPU-only hosts
+                    model = torch.quantization.quantize_dynamic(
+                        model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
 
                 model.eval()
+                # Decode steps reuse the KV cache rather than re-running the prefix
+                model.config.use_cache = True
 
                 self.tokenizers[direction] = tokenizer
                 self.models[direction] = model
 
+                if self.compile and use_cuda:
+                    self._compile_model(direction)
+
                 logger.info(f"Loaded {direction} model successfully")
 
             except Exception as e:
                 logger.error(f"Failed to load {direction} model: {e}")
                 raise
 
+    def _compile_model(self, direction: str):
+        """
+        Compile a direction's forward pass and warm it up.
+
+        A static KV cache pre-allocates the decoder's self-attention keys
+        and values for the full output length (times the beam count), so
+        decode steps keep fixed shapes and torch.compile can capture them
+        as CUDA graphs instead of launching each copy and reorder kernel
+        from Python. Falls back to eager mode if the remote-code model
+        does not support a static cache or compilation is unavailable.
+        """
+        import torch
+
+        enable_compile_cache()
+        model = self.models[direction]
+        eager_forward = model.forward
+        logger.info(f"Compiling IndicTrans2 {direction} forward pass (static KV cache)")
+
+        try:
+            model.generation_config.cache_implementation = "static"
+            model.forward = torch.compile(eager_forward, mode="reduce-overhead")
+
+            source, target = ("en", "hi") if direction == "en-indic" else ("hi", "en")
+            self.translate("Hello", source, target, max_length=32)
+            logger.info(f"IndicTrans2 {direction} forward pass compiled")
+
+        except Exception as e:
+            logger.warning(f"torch.compile unavailable, using eager mode: {e}")
+            model.forward = eager_forward
+            model.generation_config.cache_implementation = None
+
+    def _load_onnx_models(self, directions: List[str]):
+        """Load ONNX Runtime models, exporting any not yet in onnx_dir."""
+        try:
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        except ImportError:
+            raise ImportError(
+                "The onnx backend needs optimum. "
+                "Run: pip install optimum[onnxruntime-gpu]"
+            )
+        from transformers import AutoTokenizer
+        import torch
+
+        use_cuda = self.device == "cuda" and torch.cuda.is_available()
+        if not use_cuda:
+            self.device = "cpu"
+        provider = "CUDAExecutionProvider" if use_cuda else "CPUExecutionProvider"
+
+        for direction in directions:
+            if direction in self.models:
+                continue
+
+            model_id = self.MODELS[direction]
+            exported = self.onnx_dir and (Path(self.onnx_dir) / direction).is_dir()
+            source = str(Path(self.onnx_dir) / direction) if exported else model_id
+            logger.info(f"Loading IndicTrans2 ONNX model: {source} ({provider})")
+
+            try:
+                tokenizer = AutoTokenizer.from_pretrained(model_id, trust_remote_code=True)
+                # IO binding keeps inputs and past/present key-values on the
+                # GPU between decode steps instead of copying through the host
+                model = ORTModelForSeq2SeqLM.from_pretrained(
+                    source,
+                    export=not exported,
+                    provider=provider,
+                    use_cache=True,
+                    use_io_binding=use_cuda,
+                    trust_remote_code=True,
+                )
+
+                self.tokenizers[direction] = tokenizer
+                self.models[direction] = model
+
+                logger.info(f"Loaded {direction} ONNX model successfully")
+
+            except Exception as e:
+                logger.error(f"Failed to load {direction} ONNX model: {e}")
+                raise
+
+    def export_onnx(self, out_dir: str, directions: Optional[list] = None) -> str:
+        """
+        Export translation models to ONNX for the onnx backend.
+
+        Each direction is saved to out_dir/<direction> with its tokenizer;
+        pass out_dir as onnx_dir to load the export without redoing it.
+
+        Args:
+            out_dir: Directory to write the exported models to
+            directions: Directions to export; if None, exports both
+
+        Returns:
+            The output directory
+        """
+        try:
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        except ImportError:
+            raise ImportError(
+                "ONNX export needs optimum. Run: pip install optimum[onnxruntime-gpu]"
+            )
+        from transformers import AutoTokenizer
+
+        for direction in directions or ["en-indic", "indic-en"]:
+            model_id = self.MODELS[direction]
+            target = Path(out_dir) / direction
+            logger.info(f"Exporting {model_id} to ONNX: {target}")
+
+            model = ORTModelForSeq2SeqLM.from_pretrained(
+                model_id, export=True, use_cache=True, trust_remote_code=True
+            )
+            model.save_pretrained(target)
+            AutoTokenizer.from_pretrained(model_id, trust_remote_code=True).save_pretrained(target)
+
+        return out_dir
+
     def translate(
         self,
         text: str,
         source_lang: str,
         target_lang: str,
         max_length: int = 256,
+        mode: Literal["fast", "quality"] = "fast",
     ) -> str:
         """
         Translate text between languages.
@@ -118,12 +358,65 @@ class IndicTranslator:
             source_lang: Source language code (ml, en, hi, etc.)
             target_lang: Target language code
             max_length: Maximum output length
+            mode: "fast" (greedy) or "quality" (5-beam search)
 
         Returns:
             Translated text
         """
+        key = None
+        if self.cache_size and len(text) < self.CACHE_MAX_CHARS:
+            key = (source_lang, target_lang, mode, max_length, text)
+            with self._cache_lock:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+            if cached is not None:
+                logger.info(f"Translation cache hit: '{text[:50]}'")
+                return cached
+
+        translated = self.translate_batch([text], source_lang, target_lang, max_length, mode=mode)[0]
+
+        if key is not None:
+            with self._cache_lock:
+                self._cache[key] = translated
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return translated
+
+    def translate_batch(
+        self,
+        texts: List[str],
+        source_lang: str,
+        target_lang: str,
+        max_length: int = 256,
+        bucket_size: int = 8,
+        mode: Literal["fast", "quality"] = "fast",
+    ) -> List[str]:
+        """
+        Translate several texts in length-bucketed generate calls.
+
+        Texts are tokenized once without padding, sorted by token length
+        and split into micro-batches of bucket_size, so each batch is only
+        padded to its own longest input. Results are returned in the
+        original order.
+
+        Args:
+            texts: Texts to translate
+            source_lang: Source language code (ml, en, hi, etc.)
+            target_lang: Target language code
+            max_length: Maximum output length
+            bucket_size: Maximum texts per generate call
+            mode: "fast" (greedy) or "quality" (5-beam search)
+
+        Returns:
+            Translated texts, in the same order as texts
+        """
         import torch
 
+        if not texts:
+            return []
+
         # Determine direction
         if source_lang == "en":
             direction = "en-indic"
@@ -140,53 +433,98 @@ class IndicTranslator:
         # Get language codes
         src_code = self.LANG_CODES.get(source_lang, source_lang)
         tgt_code = self.LANG_CODES.get(target_lang, target_lang)
+        bos_token_id = self._bos_token_id(direction, tgt_code)
+        generation_kwargs = self.GENERATION_MODES[mode]
 
-        logger.info(f"Translating: {src_code} → {tgt_code}")
+        logger.info(f"Translating {len(texts)} text(s): {src_code} → {tgt_code}")
 
         try:
-            # Prepare input with language tags
-            input_text = f"{src_code} {text}"
-
-            inputs = tokenizer(
-                input_text,
-                return_tensors="pt",
-                padding=True,
-                truncation=True,
-                max_length=max_length,
-            )
-
-            if self.device == "cuda":
-                inputs = {k: v.to("cuda") for k, v in inputs.items()}
-
-            # Generate translation
-            with torch.no_grad():
-                outputs = model.generate(
-                    **inputs,
-                    max_length=max_length,
-                    num_beams=5,
-                    num_return_sequences=1,
-                    forced_bos_token_id=tokenizer.convert_tokens_to_ids(tgt_code),
+            # Tokenize only the texts and prepend the cached language tag
+            # IDs; special tokens and padding are added afterwards
+            prefix_ids = self._prefix_token_ids(direction, src_code)
+            budget = max_length - len(prefix_ids) - tokenizer.num_special_tokens_to_add()
+            text_ids = tokenizer(texts, add_special_tokens=False)["input_ids"]
+            input_ids = [
+                tokenizer.build_inputs_with_special_tokens(prefix_ids + ids[:budget])
+                for ids in text_ids
+            ]
+            encoded = {
+                "input_ids": input_ids,
+                "attention_mask": [[1] * len(ids) for ids in input_ids],
+            }
+
+            # Bucket by token length to minimise padding
+            order = sorted(range(len(texts)), key=lambda i: len(encoded["input_ids"][i]))
+
+            translations = [""] * len(texts)
+            for start in range(0, len(order), bucket_size):
+                bucket = order[start:start + bucket_size]
+                inputs = tokenizer.pad(
+                    {key: [values[i] for i in bucket] for key, values in encoded.items()},
+                    return_tensors="pt",
                 )
 
-            # Decode output
-            translated = tokenizer.decode(
-                outputs[0],
-                skip_special_tokens=True,
-                clean_up_tokenization_spaces=True,
-            )
+                if self.device == "cuda":
+                    # Copies from pageable memory are synchronous; pinning
+                    # lets them overlap the first encoder kernels
+                    inputs = {
+                        k: v.pin_memory().to("cuda", non_blocking=True)
+                        for k, v in inputs.items()
+                    }
+
+                # Generate translation
+                with torch.inference_mode():
+                    outputs = model.generate(
+                        **inputs,
+                        max_length=max_length,
+                        **generation_kwargs,
+                        num_return_sequences=1,
+                        forced_bos_token_id=bos_token_id,
+                        # The remote-code model class may not default to it
+                        use_cache=True,
+                    )
+
+                # Decode output
+                decoded = tokenizer.batch_decode(
+                    outputs,
+                    skip_special_tokens=True,
+                    clean_up_tokenization_spaces=True,
+                )
 
-            # Remove language tag if present
-            if translated.startswith(tgt_code):
-                translated = translated[len(tgt_code):].strip()
+                for i, translated in zip(bucket, decoded):
+                    # Remove language tag if present
+                    if translated.startswith(tgt_code):
+                        translated = translated[len(tgt_code):].strip()
+                    translations[i] = translated
 
-            logger.info(f"Translation complete: '{text[:50]}...' → '{translated[:50]}...'")
+            logger.info(f"Translation complete: '{texts[0][:50]}...' → '{translations[0][:50]}...'")
 
-            return translated
+            return translations
 
         except Exception as e:
             logger.error(f"Translation failed: {e}")
             raise
 
+    def _bos_token_id(self, direction: str, tgt_code: str) -> int:
+        """Return the token ID of a target language tag, looked up once."""
+        key = (direction, tgt_code)
+        token_id = self._bos_token_ids.get(key)
+        if token_id is None:
+            token_id = self.tokenizers[direction].convert_tokens_to_ids(tgt_code)
+            self._bos_token_ids[key] = token_id
+        return token_id
+
+    def _prefix_token_ids(self, direction: str, src_code: str) -> List[int]:
+        """Return the token IDs of a source language tag, tokenized once."""
+        key = (direction, src_code)
+        prefix_ids = self._prefix_ids.get(key)
+        if prefix_ids is None:
+            prefix_ids = self.tokenizers[direction](
+                src_code, add_special_tokens=False
+            )["input_ids"]
+            self._prefix_ids[key] = prefix_ids
+        return prefix_ids
+
     def ml_to_en(self, text: str) -> str:
         """Translate Malayalam to English."""
         return self.translate(text, source_lang="ml", target_lang="en")
@@ -195,31 +533,43 @@ class IndicTranslator:
         """Translate English to Malayalam."""
         return self.translate(text, source_lang="en", target_lang="ml")
 
+    def ml_to_en_batch(self, texts: List[str]) -> List[str]:
+        """Translate a batch of Malayalam texts to English."""
+        return self.translate_batch(texts, source_lang="ml", target_lang="en")
+
+    def en_to_ml_batch(self, texts: List[str]) -> List[str]:
+        """Translate a batch of English texts to Malayalam."""
+        return self.translate_batch(texts, source_lang="en", target_lang="ml")
+
     def get_supported_languages(self) -> dict:
         """Return supported languages."""
-        return {
-            "ml": "Malayalam",
-            "hi": "Hindi",
-            "ta": "Tamil",
-            "te": "Telugu",
-            "bn": "Bengali",
-            "mr": "Marathi",
-            "gu": "Gujarati",
-            "kn": "Kannada",
-            "pa": "Punjabi",
-            "en": "English",
-        }
+        return self.SUPPORTED_LANGUAGES.copy()
 
 
 # Convenience functions
-_translator = None
-
-def get_translator(device: str = "cuda") -> IndicTranslator:
-    """Get or create singleton translator instance."""
-    global _translator
-    if _translator is None:
-        _translator = IndicTranslator(device=device)
-    return _translator
+_translator_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _shared_translator(
+    device: str,
+    backend: str,
+    quantization: Optional[str],
+) -> IndicTranslator:
+    """Create the translator for a configuration, once."""
+    return IndicTranslator(device=device, backend=backend, quantization=quantization)
+
+
+def get_translator(
+    device: str = "cuda",
+    backend: str = "torch",
+    quantization: Optional[str] = None,
+) -> IndicTranslator:
+    """Get or create the shared translator instance for a configuration."""
+    # lru_cache alone can run the constructor twice on concurrent misses,
+    # handing out two instances that would each load the models
+    with _translator_lock:
+        return _shared_translator(device, backend, quantization)
 
 
 def translate(
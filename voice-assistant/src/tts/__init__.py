@@ -1,15 +1,34 @@
 """TTS (Text-to-Speech) Module"""
 
-from .indic_tts import IndicTTS
-from .mms_tts import MMSTTS
-from .cartesia_tts import CartesiaTTS
-from .tts_engine import TTSEngine, tts, compare_tts
+from .tts_engine import (
+    SynthesisCache, TTSEngine, TTSResult, get_synthesis_cache, get_tts, tts, compare_tts
+)
+
+# Backends are imported on first access: each pulls in numpy (and its own
+# model libraries), which TTSEngine only needs once a backend is used
+_BACKENDS = {
+    "IndicTTS": ".indic_tts",
+    "MMSTTS": ".mms_tts",
+    "CartesiaTTS": ".cartesia_tts",
+}
+
+
+def __getattr__(name):
+    if name in _BACKENDS:
+        import importlib
+        return getattr(importlib.import_module(_BACKENDS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "IndicTTS",
     "MMSTTS",
     "CartesiaTTS",
+    "SynthesisCache",
     "TTSEngine",
+    "TTSResult",
+    "get_synthesis_cache",
+    "get_tts",
     "tts",
     "compare_tts",
 ]
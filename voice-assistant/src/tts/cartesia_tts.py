@@ -3,10 +3,11 @@ Cartesia TTS Implementation
 High-quality online TTS with streaming support.
 """
 
+import asyncio
 import logging
 import os
 from pathlib import Path
-from typing import Optional, Union, Generator
+from typing import AsyncIterator, Optional, Union, Generator
 import numpy as np
 
 logger = logging.getLogger(__name__)
@@ -110,11 +111,8 @@ class CartesiaTTS:
         output_path: Optional[Union[str, Path]] = None,
     ) -> Union[np.ndarray, str]:
         """Full synthesis (non-streaming)."""
-        import struct
-
         # Generate audio - Cartesia SDK v2.0 API
-        audio_chunks = []
-        for chunk in self.client.tts.bytes(
+        chunks = self.client.tts.bytes(
             model_id=self.model_id,
             transcript=text,
             voice={"mode": "id", "id": voice_id},
@@ -124,25 +122,33 @@ class CartesiaTTS:
                 "encoding": "pcm_f32le",
                 "sample_rate": self.sample_rate,
             },
-        ):
-            audio_chunks.append(chunk)
-
-        audio_data = b"".join(audio_chunks)
-
-        # Convert bytes to numpy array
-        audio_array = np.array(
-            struct.unpack(f"{len(audio_data) // 4}f", audio_data),
-            dtype=np.float32
         )
 
-        # Save to file if path provided
+        # Save to file if path provided, writing each chunk as it arrives so
+        # disk writes overlap the download and the clip is never held whole
         if output_path:
             import soundfile as sf
-            sf.write(str(output_path), audio_array, samplerate=self.sample_rate)
+            pending = b""
+            with sf.SoundFile(
+                str(output_path), "w", samplerate=self.sample_rate, channels=1
+            ) as f:
+                for chunk in chunks:
+                    data = pending + chunk if pending else chunk
+                    # Chunks need not end on a sample boundary
+                    usable = len(data) - len(data) % 4
+                    f.write(np.frombuffer(data, dtype="<f4", count=usable // 4))
+                    pending = data[usable:]
             logger.info(f"Audio saved to {output_path}")
             return str(output_path)
 
-        return audio_array
+        # Chunks are appended into one growing buffer instead of being kept
+        # and joined afterwards
+        audio_data = bytearray()
+        for chunk in chunks:
+            audio_data.extend(chunk)
+
+        # View the pcm_f32le bytes as samples without copying
+        return np.frombuffer(audio_data, dtype="<f4", count=len(audio_data) // 4)
 
     def _synthesize_stream(
         self,
@@ -165,6 +171,62 @@ class CartesiaTTS:
         ):
             yield chunk
 
+    async def asynthesize(
+        self,
+        text: str,
+        language: str = "en",
+        output_path: Optional[Union[str, Path]] = None,
+        voice_id: Optional[str] = None,
+    ) -> Union[np.ndarray, str]:
+        """
+        Synthesize speech without blocking the event loop.
+
+        The download, PCM decode and any file writing run in a worker
+        thread, so the caller's loop keeps serving other work meanwhile.
+
+        Args:
+            text: Text to synthesize
+            language: Language code
+            output_path: Optional path to save audio file
+            voice_id: Override voice ID
+
+        Returns:
+            Audio array or path to saved file
+        """
+        return await asyncio.to_thread(
+            self.synthesize, text, language, output_path, voice_id
+        )
+
+    async def asynthesize_stream(
+        self,
+        text: str,
+        language: str = "en",
+        voice_id: Optional[str] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream synthesized audio chunks without blocking the event loop.
+
+        Each chunk is pulled from the synchronous SDK stream in a worker
+        thread.
+
+        Args:
+            text: Text to synthesize
+            language: Language code
+            voice_id: Override voice ID
+
+        Yields:
+            Raw pcm_f32le audio chunks
+        """
+        stream = await asyncio.to_thread(
+            self.synthesize, text, language, voice_id=voice_id, stream=True
+        )
+        done = object()
+        while True:
+            chunk = await asyncio.to_thread(next, stream, done)
+            if chunk is done:
+                return
+            yield chunk
+
     def list_voices(self) -> list:
         """List available voices."""
         if self.client is None:
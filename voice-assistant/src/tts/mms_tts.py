@@ -4,13 +4,82 @@ Offline TTS supporting 1100+ languages including Malayalam.
 """
 
 import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Union
+from typing import Generator, Iterator, List, Optional, Tuple, Union
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
 
+class _DecoderInput(Exception):
+    """Raised by a hook to stop VitsModel.forward before the vocoder runs."""
+
+
+class _StreamResampler:
+    """
+    Polyphase resampling of a signal that arrives in blocks.
+
+    Produces the same samples as signal.resample_poly on the whole signal:
+    the FIR filter runs across block boundaries using input kept from
+    earlier blocks, so edges are not zero-padded (no clicks) and the
+    output length is rounded once, at flush(). Output lags the input by
+    about half the filter length.
+    """
+
+    def __init__(self, up: int, down: int):
+        from scipy import signal
+
+        # Same filter as resample_poly's default
+        max_rate = max(up, down)
+        self.half_len = 10 * max_rate
+        self.h = signal.firwin(2 * self.half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0))
+        self.h *= up
+        self.up, self.down = up, down
+
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._start = 0  # input index of _buffer[0]
+        self._received = 0
+        self._emitted = 0
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Add input and return every output sample it completes."""
+        self._buffer = np.concatenate([self._buffer, block])
+        self._received += len(block)
+        # Output m needs input up to index (m * down + half_len) // up
+        ready = (self._received * self.up - 1 - self.half_len) // self.down + 1
+        return self._emit(ready)
+
+    def flush(self) -> np.ndarray:
+        """Return the remaining output, treating the signal as ended."""
+        return self._emit(-(-self._received * self.up // self.down))
+
+    def _emit(self, stop: int) -> np.ndarray:
+        from scipy import signal
+
+        first = self._emitted
+        if stop <= first:
+            return np.zeros(0, dtype=np.float32)
+
+        # Filter from the first input the outputs depend on, delaying the
+        # filter by pad taps so output first lands on a whole index
+        start = max(self._start, (first * self.down - self.half_len) // self.up)
+        offset = self.half_len - start * self.up
+        pad = -offset % self.down
+        h = np.concatenate([np.zeros(pad), self.h])
+        out = signal.upfirdn(h, self._buffer[start - self._start:], self.up, self.down)
+        lo = first + (offset + pad) // self.down
+        out = out[lo:lo + stop - first]
+
+        keep = max(0, (stop * self.down - self.half_len) // self.up)
+        self._buffer = self._buffer[keep - self._start:]
+        self._start = keep
+        self._emitted = stop
+        return out.astype(np.float32, copy=False)
+
+
 class MMSTTS:
     """
     Meta's MMS-TTS for offline multilingual text-to-speech.
@@ -33,10 +102,34 @@ class MMSTTS:
         "en": "eng",  # English
     }
 
+    # Display names of supported languages
+    SUPPORTED_LANGUAGES = {
+        "ml": "Malayalam",
+        "hi": "Hindi",
+        "ta": "Tamil",
+        "te": "Telugu",
+        "bn": "Bengali",
+        "mr": "Marathi",
+        "gu": "Gujarati",
+        "kn": "Kannada",
+        "pa": "Punjabi",
+        "en": "English",
+    }
+
+    # Streaming: spectrogram frames decoded per yielded block (one frame is
+    # 256 samples, 16 ms at 16 kHz) and frames of context on each side, so
+    # block edges match the full-utterance decode
+    STREAM_CHUNK_FRAMES = 3
+    STREAM_CONTEXT_FRAMES = 16
+
     def __init__(
         self,
         default_language: str = "ml",
         device: str = "cuda",
+        compute_type: str = "float32",
+        compile: bool = False,
+        max_resident_langs: int = 3,
+        jit: bool = False,
     ):
         """
         Initialize MMS-TTS.
@@ -44,37 +137,92 @@ class MMSTTS:
         Args:
             default_language: Default language code (ISO 639-1)
             device: Device to run on - cuda or cpu
+            compute_type: Weight precision - float32, float16, int8 or
+                int8_float16. On CUDA the int8 types run as float16; on
+                CPU they apply dynamic INT8 quantization to linear layers.
+            compile: Compile the VITS forward pass with torch.compile (CUDA
+                only). The first synthesis per model pays the compile cost;
+                TTSEngine.warmup() moves it to startup.
+            max_resident_langs: Number of language models kept on the GPU
+                (at least 1). Less recently used ones are moved to CPU
+                memory rather than freed, so switching back is a host to
+                device copy instead of a reload.
+            jit: Trace the model to a frozen TorchScript graph (CPU only).
+                Falls back to eager mode if the traced graph does not
+                match it.
         """
         self.default_language = default_language
         self.device = device
-        self.model = None
-        self.tokenizer = None
+        self.compute_type = compute_type
+        self.compile = compile
+        self.max_resident_langs = max_resident_langs
+        self.jit = jit
+        # Loaded models by language, least recently used first
+        self.models: "OrderedDict[str, object]" = OrderedDict()
+        self.tokenizers = {}
+        self._offloaded = set()
+        # Eager modules behind TorchScript models, for streaming synthesis
+        self._eager_models = {}
+        # Guards loading and the LRU/offload bookkeeping; each language's
+        # lock is held for the whole forward pass so its model is never
+        # moved between devices while in use
+        self._lock = threading.RLock()
+        self._lang_locks = {}
         self.sample_rate = 16000
 
     def load_model(self, language: Optional[str] = None):
-        """Load the MMS-TTS model for specified language."""
+        """Load the MMS-TTS model for specified language, if not yet loaded."""
+        lang = language or self.default_language
+        with self._lock:
+            if lang not in self.models:
+                self._load_model(lang)
+
+    def _load_model(self, lang: str):
+        """Load the model and tokenizer for lang (self._lock held)."""
         try:
             from transformers import VitsModel, AutoTokenizer
             import torch
 
-            lang = language or self.default_language
             mms_lang = self.LANGUAGE_CODES.get(lang, lang)
 
             model_id = f"facebook/mms-tts-{mms_lang}"
 
             logger.info(f"Loading MMS-TTS model: {model_id}")
 
-            self.tokenizer = AutoTokenizer.from_pretrained(model_id)
-            self.model = VitsModel.from_pretrained(model_id)
+            tokenizer = AutoTokenizer.from_pretrained(model_id)
+            model = VitsModel.from_pretrained(model_id)
 
             if self.device == "cuda" and torch.cuda.is_available():
-                self.model = self.model.to("cuda")
+                # Allow TF32 matmuls and let cuDNN pick the fastest conv
+                # algorithms for the VITS decoder
+                torch.set_float32_matmul_precision("high")
+                torch.backends.cudnn.benchmark = True
+                model = model.to("cuda")
+                # Halve weight bandwidth; PyTorch has no INT8 CUDA kernels for
+                # these layers, so int8 compute types also map to float16 here
+                if self.compute_type != "float32":
+                    model = model.half()
             else:
-                self.model = self.model.to("cpu")
+                model = model.to("cpu")
                 self.device = "cpu"
-
-            self.model.eval()
-            self._current_language = lang
+                if self.compute_type.startswith("int8"):
+                    model = torch.quantization.quantize_dynamic(
+                        model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+
+            model.eval()
+            if self.compile and self.device == "cuda":
+                # Inductor fuses the decoder's many small 1D convolutions;
+                # dynamic shapes cover the varying token and frame counts
+                model = torch.compile(model, dynamic=True)
+            elif self.jit and self.device == "cpu":
+                traced = self._trace_model(model, tokenizer)
+                if traced is not None:
+                    self._eager_models[lang] = model
+                    model = traced
+
+            self.tokenizers[lang] = tokenizer
+            self.models[lang] = model
 
             logger.info(f"MMS-TTS model loaded successfully for {mms_lang}")
 
@@ -82,13 +230,103 @@ class MMSTTS:
             logger.error(f"Failed to load MMS-TTS model: {e}")
             raise
 
+    def _trace_model(self, model, tokenizer):
+        """
+        Trace a CPU model to a frozen, inference-optimized TorchScript graph.
+
+        Freezing inlines the weights so conv, bias and activation ops can
+        be fused, and the graph runs without Python dispatch overhead.
+        VITS derives its output length from predicted durations, which a
+        trace could bake in, so the graph is checked against eager mode
+        on an input of another length and discarded on a mismatch.
+
+        Returns:
+            The TorchScript module, or None to keep the eager model
+        """
+        import torch
+
+        def example(length):
+            ids = torch.arange(1, length + 1).remainder(len(tokenizer)).unsqueeze(0)
+            return ids, torch.ones_like(ids)
+
+        try:
+            # Tuple outputs trace cleanly; index 0 is the waveform either way
+            model.config.return_dict = False
+            with torch.no_grad():
+                traced = torch.jit.trace(model, example(16), strict=False)
+                traced = torch.jit.optimize_for_inference(torch.jit.freeze(traced))
+
+                check = example(40)
+                with torch.random.fork_rng():
+                    torch.manual_seed(0)
+                    expected = model(*check)[0]
+                    torch.manual_seed(0)
+                    actual = traced(*check)[0]
+
+            if expected.shape != actual.shape:
+                raise RuntimeError(
+                    f"traced output {tuple(actual.shape)} != eager {tuple(expected.shape)}"
+                )
+            logger.info("MMS-TTS model traced to TorchScript")
+            return traced
+
+        except Exception as e:
+            logger.warning(f"TorchScript tracing unavailable, using eager mode: {e}")
+            return None
+
+    @contextmanager
+    def _use_model(self, language: str) -> Iterator[Tuple[object, object]]:
+        """
+        Hold the (tokenizer, model) for a language, ready on the device.
+
+        Loads the model on first use, moves it back to the GPU if it was
+        offloaded, and offloads models beyond max_resident_langs to CPU.
+        The language's lock is held until the block exits, so the caller's
+        forward pass never races an offload. Models in use by another
+        thread are skipped and offloaded on a later call.
+        """
+        with self._lock:
+            lang_lock = self._lang_locks.setdefault(language, threading.Lock())
+
+        # Taken before self._lock, and others are only try-acquired under
+        # it, so the two locks cannot deadlock
+        with lang_lock:
+            with self._lock:
+                self.load_model(language)
+                self.models.move_to_end(language)
+                model = self.models[language]
+
+                if self.device == "cuda":
+                    if language in self._offloaded:
+                        logger.info(f"Moving MMS-TTS model for {language} back to GPU")
+                        model.to("cuda")
+                        self._offloaded.discard(language)
+
+                    for lang in list(self.models)[:-self.max_resident_langs]:
+                        if lang in self._offloaded:
+                            continue
+                        busy = self._lang_locks.setdefault(lang, threading.Lock())
+                        if not busy.acquire(blocking=False):
+                            continue
+                        try:
+                            logger.info(f"Offloading MMS-TTS model for {lang} to CPU")
+                            self.models[lang].to("cpu")
+                            self._offloaded.add(lang)
+                        finally:
+                            busy.release()
+
+                tokenizer = self.tokenizers[language]
+
+            yield tokenizer, model
+
     def synthesize(
         self,
         text: str,
         language: Optional[str] = None,
         output_path: Optional[Union[str, Path]] = None,
         speed: float = 1.0,
-    ) -> Union[np.ndarray, str]:
+        stream: bool = False,
+    ) -> Union[np.ndarray, str, Generator]:
         """
         Synthesize speech from text.
 
@@ -97,32 +335,29 @@ class MMSTTS:
             language: Language code (uses default if not specified)
             output_path: Optional path to save audio file
             speed: Speech speed multiplier (0.5-2.0)
+            stream: If True, returns a generator of audio blocks
 
         Returns:
-            Audio array (numpy) or path to saved file
+            Audio array (numpy), path to saved file, or generator for streaming
         """
-        import torch
-
         target_lang = language or self.default_language
 
-        # Load model if not loaded or language changed
-        if self.model is None or getattr(self, '_current_language', None) != target_lang:
-            self.load_model(target_lang)
+        if stream:
+            return self._synthesize_stream(text, target_lang, speed)
+
+        import torch
 
         logger.info(f"Synthesizing speech in {target_lang}: '{text[:50]}...'")
 
         try:
-            # Tokenize input
-            inputs = self.tokenizer(text, return_tensors="pt")
+            with self._use_model(target_lang) as (tokenizer, model):
+                inputs = self._encode(tokenizer, text)
 
-            if self.device == "cuda":
-                inputs = {k: v.to("cuda") for k, v in inputs.items()}
+                # Generate audio (positional inputs also suit TorchScript models)
+                with torch.inference_mode():
+                    waveform = model(inputs["input_ids"], inputs["attention_mask"])[0]
 
-            # Generate audio
-            with torch.no_grad():
-                output = self.model(**inputs)
-
-            audio_array = output.waveform.cpu().numpy().squeeze()
+                audio_array = waveform.float().cpu().numpy().squeeze()
 
             # Apply speed adjustment if needed
             if speed != 1.0:
@@ -141,31 +376,162 @@ class MMSTTS:
             logger.error(f"Speech synthesis failed: {e}")
             raise
 
+    def _synthesize_stream(
+        self,
+        text: str,
+        language: str,
+        speed: float = 1.0,
+    ) -> Generator[np.ndarray, None, None]:
+        """
+        Streaming synthesis for low-latency playback.
+
+        Runs the VITS text encoder, duration predictor and flow once to get
+        the latent spectrogram, then decodes it through the HiFi-GAN
+        vocoder a few frames at a time, yielding float32 blocks of about
+        50 ms. Each window carries STREAM_CONTEXT_FRAMES of context on both
+        sides that is trimmed from the output. Speed changes resample the
+        blocks as one continuous signal, matching non-streamed output.
+        """
+        import torch
+
+        chunk, context = self.STREAM_CHUNK_FRAMES, self.STREAM_CONTEXT_FRAMES
+        resampler = _StreamResampler(*self._speed_ratio(speed)) if speed != 1.0 else None
+
+        logger.info(f"Streaming speech in {language}: '{text[:50]}...'")
+
+        def capture(module, args):
+            raise _DecoderInput(args)
+
+        try:
+            # The model stays reserved until the stream is exhausted or closed
+            with self._use_model(language) as (tokenizer, model):
+                # Hooks and slicing need the eager module under torch.compile or jit
+                model = self._eager_models.get(language, model)
+                model = getattr(model, "_orig_mod", model)
+                decoder = model.decoder
+                hop = int(np.prod(model.config.upsample_rates))
+
+                inputs = self._encode(tokenizer, text)
+
+                with torch.inference_mode():
+                    handle = decoder.register_forward_pre_hook(capture)
+                    try:
+                        model(**inputs)
+                        raise RuntimeError("VITS forward finished without running its decoder")
+                    except _DecoderInput as stop:
+                        spectrogram, *conditioning = stop.args[0]
+                    finally:
+                        handle.remove()
+
+                    frames = spectrogram.shape[-1]
+                    for start in range(0, frames, chunk):
+                        lo = max(0, start - context)
+                        hi = min(frames, start + chunk + context)
+                        waveform = decoder(spectrogram[..., lo:hi], *conditioning)
+
+                        offset = (start - lo) * hop
+                        length = min(chunk, frames - start) * hop
+                        block = waveform[..., offset:offset + length]
+                        block = block.float().cpu().numpy().squeeze(0)
+
+                        if resampler is not None:
+                            block = resampler.process(block)
+                            if not len(block):
+                                continue
+                        yield block
+
+            if resampler is not None:
+                yield resampler.flush()
+
+        except Exception as e:
+            logger.error(f"Streaming speech synthesis failed: {e}")
+            raise
+
+    def synthesize_batch(
+        self,
+        texts: List[str],
+        language: Optional[str] = None,
+        speed: float = 1.0,
+    ) -> List[np.ndarray]:
+        """
+        Synthesize several texts in one padded forward pass.
+
+        VITS reports each item's output length, so the padded batch
+        waveform is sliced back into per-text clips.
+
+        Args:
+            texts: Texts to synthesize, all in the same language
+            language: Language code (uses default if not specified)
+            speed: Speech speed multiplier (0.5-2.0)
+
+        Returns:
+            Audio arrays, in the same order as texts
+        """
+        import torch
+
+        if not texts:
+            return []
+
+        target_lang = language or self.default_language
+
+        logger.info(f"Synthesizing {len(texts)} texts in {target_lang}")
+
+        try:
+            with self._use_model(target_lang) as (tokenizer, model):
+                # A TorchScript model is traced for batch size 1
+                model = self._eager_models.get(target_lang, model)
+                inputs = self._encode(tokenizer, texts)
+
+                with torch.inference_mode():
+                    output = model(inputs["input_ids"], inputs["attention_mask"])
+
+                # Outputs are (waveform, sequence_lengths, ...) as a tuple or ModelOutput
+                waveforms = output[0].float().cpu().numpy()
+                lengths = output[1].cpu().numpy()
+
+            clips = [waveform[:length] for waveform, length in zip(waveforms, lengths)]
+            if speed != 1.0:
+                clips = [self._adjust_speed(clip, speed) for clip in clips]
+            return clips
+
+        except Exception as e:
+            logger.error(f"Batch speech synthesis failed: {e}")
+            raise
+
+    def _encode(self, tokenizer, text: Union[str, List[str]]) -> dict:
+        """Tokenize text (or a padded batch) and move it to the model device."""
+        inputs = tokenizer(text, padding=True, return_tensors="pt")
+
+        if self.device == "cuda":
+            # Pinned host memory makes the copy asynchronous, so it
+            # overlaps the start of the forward pass
+            inputs = {
+                k: v.pin_memory().to("cuda", non_blocking=True)
+                for k, v in inputs.items()
+            }
+        return inputs
+
     def _adjust_speed(self, audio: np.ndarray, speed: float) -> np.ndarray:
-        """Adjust audio playback speed using resampling."""
+        """Adjust audio playback speed using polyphase resampling."""
         from scipy import signal
 
-        # Resample to change speed
-        original_length = len(audio)
-        new_length = int(original_length / speed)
-        return signal.resample(audio, new_length)
+        # A single polyphase FIR pass is much cheaper than an FFT resample
+        # near unity speed
+        audio = signal.resample_poly(audio, *self._speed_ratio(speed))
+        return audio.astype(np.float32, copy=False)
+
+    @staticmethod
+    def _speed_ratio(speed: float) -> Tuple[int, int]:
+        """Return the (up, down) resampling factors for a speed multiplier."""
+        from fractions import Fraction
+
+        # Speeding up by p/q is resampling by q/p
+        ratio = Fraction(speed).limit_denominator(100)
+        return ratio.denominator, ratio.numerator
 
     def get_supported_languages(self) -> dict:
         """Return dictionary of supported languages."""
-        return {
-            code: name for code, name in [
-                ("ml", "Malayalam"),
-                ("hi", "Hindi"),
-                ("ta", "Tamil"),
-                ("te", "Telugu"),
-                ("bn", "Bengali"),
-                ("mr", "Marathi"),
-                ("gu", "Gujarati"),
-                ("kn", "Kannada"),
-                ("pa", "Punjabi"),
-                ("en", "English"),
-            ]
-        }
+        return self.SUPPORTED_LANGUAGES.copy()
 
 
 # Convenience function
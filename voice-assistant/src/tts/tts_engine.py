@@ -3,25 +3,225 @@ Unified TTS Engine
 Supports multiple backends with A/B testing capability.
 """
 
+import hashlib
 import logging
+import math
+import os
+import pickle
+import re
+import sys
+import threading
 import time
+from collections import OrderedDict
+from contextlib import nullcontext
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import Optional, Union, Literal
+from typing import TYPE_CHECKING, Iterator, List, Optional, Sequence, Tuple, Union, Literal
 from dataclasses import dataclass
-import numpy as np
+
+if TYPE_CHECKING:
+    # numpy is imported where it is used so that loading this module (e.g. for
+    # a Cartesia-only CLI call) does not pay numpy's import time
+    import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Backend engines shared by every TTSEngine in the process, keyed on the
+# backend and the settings it is built from, each with the lock that
+# serializes calls into it
+_ENGINE_POOL = {}
+_ENGINE_POOL_LOCK = threading.RLock()
+
+# Sentence ends, including the Devanagari danda and double danda
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?।॥])\s+")
+
+# dataclass(slots=True) needs Python 3.10; on 3.9 results keep a __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _elapsed_ms(start_ns: int) -> float:
+    """Milliseconds since a time.perf_counter_ns() reading."""
+    return (time.perf_counter_ns() - start_ns) / 1e6
 
-@dataclass
+
+@dataclass(frozen=True, **_SLOTS)
 class TTSResult:
-    """Result from TTS synthesis."""
-    audio: Union[np.ndarray, str]
+    """Result from TTS synthesis (immutable; slotted on Python 3.10+)."""
+    audio: Union["np.ndarray", str]
     backend: str
     language: str
     duration_ms: float
     sample_rate: int
     text: str
+    cached: bool = False
+
+    def to_int16(self) -> "np.ndarray":
+        """
+        Return the audio as int16 PCM, half the bytes of float32.
+
+        For WAV files, sockets and other consumers that carry 16-bit audio
+        anyway; int16 audio is returned without a copy.
+        """
+        if isinstance(self.audio, str):
+            raise ValueError(f"Audio was saved to {self.audio}; no samples to convert")
+        import numpy as np
+        if self.audio.dtype == np.int16:
+            return self.audio
+        pcm = np.clip(self.audio, -1.0, 1.0)
+        pcm *= 32767
+        return pcm.astype(np.int16)
+
+    def to_bytes(self) -> bytes:
+        """Return the audio as raw little-endian int16 PCM bytes."""
+        return self.to_int16().astype("<i2", copy=False).tobytes()
+
+
+class SynthesisCache:
+    """
+    LRU cache of synthesized audio.
+
+    Stores (audio, sample_rate) keyed on the text and every setting that
+    changes the output, so repeated phrases skip inference entirely.
+    Optionally persisted to disk, either as one pickle saved on demand or
+    as one WAV file per clip written as soon as it is cached.
+    """
+
+    DEFAULT_PATH = os.path.join(
+        os.path.expanduser("~"), ".cache", "logentic", "tts_cache.pkl"
+    )
+    DEFAULT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "logentic", "tts")
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        path: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of clips to keep in memory
+            path: Pickle file to load from and save to (None for memory only)
+            cache_dir: Directory of <key>.wav files checked on memory misses
+                and written on every put; it is not bounded by max_entries
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self.cache_dir = cache_dir
+        self._entries = OrderedDict()
+        self._dirty = False
+        # Backends may synthesize concurrently (see TTSEngine.compare)
+        self._lock = threading.RLock()
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        if path and os.path.exists(path):
+            self.load()
+
+    @staticmethod
+    def key(text: str, **settings) -> str:
+        """Build a cache key from the text and synthesis settings."""
+        raw = text + "|" + repr(sorted(settings.items()))
+        return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[tuple]:
+        """Return (audio, sample_rate) for key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        if self.cache_dir:
+            wav_path = os.path.join(self.cache_dir, f"{key}.wav")
+            if os.path.exists(wav_path):
+                import soundfile as sf
+                try:
+                    audio, sample_rate = sf.read(wav_path, dtype="float32")
+                except Exception as e:
+                    logger.warning(f"Failed to read cached TTS clip {wav_path}: {e}")
+                    return None
+                self._remember(key, audio, sample_rate)
+                return audio, sample_rate
+        return None
+
+    def put(self, key: str, audio: "np.ndarray", sample_rate: int):
+        """Store a clip, evicting the least recently used one if full."""
+        self._remember(key, audio, sample_rate)
+        self._dirty = True
+
+        if self.cache_dir:
+            import soundfile as sf
+            # 32-bit float keeps the clip bit-exact; write then rename so a
+            # reader never sees a partial file
+            wav_path = os.path.join(self.cache_dir, f"{key}.wav")
+            tmp_path = f"{wav_path}.{os.getpid()}.tmp"
+            try:
+                sf.write(tmp_path, audio, samplerate=sample_rate, subtype="FLOAT", format="WAV")
+                os.replace(tmp_path, wav_path)
+            except Exception as e:
+                logger.warning(f"Failed to write cached TTS clip {wav_path}: {e}")
+
+    def _remember(self, key: str, audio: "np.ndarray", sample_rate: int):
+        """Insert a clip into the in-memory LRU."""
+        with self._lock:
+            self._entries[key] = (audio, sample_rate)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def load(self):
+        """Load entries from the pickle file."""
+        try:
+            with open(self.path, "rb") as f:
+                self._entries = pickle.load(f)
+            logger.info(f"Loaded {len(self._entries)} cached TTS clips from {self.path}")
+        except Exception as e:
+            logger.warning(f"Failed to load TTS cache: {e}")
+            self._entries = OrderedDict()
+
+    def save(self):
+        """Write entries to the pickle file if anything changed."""
+        if not self.path or not self._dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "wb") as f:
+                pickle.dump(self._entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+            self._dirty = False
+        except Exception as e:
+            logger.warning(f"Failed to save TTS cache: {e}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@lru_cache(maxsize=4096)
+def _split_sentences(text: str) -> Tuple[str, ...]:
+    """
+    Split text after sentence-ending punctuation, dropping empty parts.
+
+    The split does not depend on the backend, so it is memoized: compare()
+    runs every backend on the same text, and assistants repeat phrases.
+    """
+    return tuple(sentence for sentence in _SENTENCE_SPLIT.split(text.strip()) if sentence)
+
+
+def _pcm_f32_blocks(chunks: Iterator[bytes]) -> Iterator["np.ndarray"]:
+    """Decode a stream of raw pcm_f32le byte chunks into float32 blocks."""
+    import numpy as np
+
+    pending = b""
+    for chunk in chunks:
+        data = pending + chunk if pending else chunk
+        # Chunks need not end on a sample boundary
+        usable = len(data) - len(data) % 4
+        if usable:
+            yield np.frombuffer(data, dtype="<f4", count=usable // 4)
+        pending = data[usable:]
 
 
 class TTSEngine:
@@ -42,11 +242,26 @@ class TTSEngine:
     """
 
     BACKENDS = ["mms", "cartesia", "indic"]
+    # Backends whose synthesize(stream=True) yields audio progressively
+    STREAMING_BACKENDS = frozenset({"mms", "cartesia"})
+    # Backends safe to call from several threads at once (remote API);
+    # local models synthesize one sentence at a time
+    CONCURRENT_BACKENDS = frozenset({"cartesia"})
+    # Texts longer than this are synthesized sentence by sentence
+    SPLIT_MIN_CHARS = 200
 
     def __init__(
         self,
         backend: Literal["mms", "cartesia", "indic"] = "mms",
         device: str = "cuda",
+        compute_type: str = "float32",
+        cache: Optional[SynthesisCache] = None,
+        compile: bool = False,
+        jit: bool = False,
+        sentence_workers: int = 2,
+        batch_size: int = 8,
+        max_wait_ms: float = 10,
+        background_writes: bool = False,
         **kwargs,
     ):
         """
@@ -55,32 +270,146 @@ class TTSEngine:
         Args:
             backend: TTS backend to use
             device: Device for local models (cuda/cpu)
+            compute_type: Weight precision for MMS-TTS (float32, float16,
+                int8, int8_float16)
+            cache: Optional SynthesisCache to reuse audio for repeated text
+            compile: torch.compile the MMS-TTS model (CUDA only)
+            jit: Trace the MMS-TTS model to TorchScript (CPU only)
+            sentence_workers: Threads synthesizing sentences of long texts
+                ahead of the one being returned
+            batch_size: Most texts per forward pass, for batch_synthesize()
+                and concurrent asynthesize() requests
+            max_wait_ms: How long an asynthesize() batch waits to fill
+            background_writes: Write output_path WAV files on a background
+                thread; results then carry the samples rather than the path
+                and the file exists once flush_writes() returns
             **kwargs: Backend-specific arguments
         """
         self.default_backend = backend
         self.device = device
+        self.compute_type = compute_type
+        self.cache = cache
+        self.compile = compile
+        self.jit = jit
+        self.sentence_workers = sentence_workers
+        self.batch_size = batch_size
+        self.max_wait_ms = max_wait_ms
+        # asynthesize() requests, coalesced into batch_synthesize() calls
+        self._batcher = None
+        self._writer = None
+        self._last_write = None
+        if background_writes:
+            from concurrent.futures import ThreadPoolExecutor
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-wav-writer")
         self.kwargs = kwargs
+        # Per-instance view of the shared engine pool
         self._engines = {}
+        self._backend_locks = {}
 
     def _get_engine(self, backend: str):
-        """Lazy load and cache TTS engines."""
-        if backend not in self._engines:
-            if backend == "mms":
-                from .mms_tts import MMSTTS
-                self._engines[backend] = MMSTTS(device=self.device)
+        """
+        Get a backend engine, shared with other TTSEngines of the same settings.
+
+        Engines live in a process-wide pool, so loaded models are reused
+        rather than loaded again by each TTSEngine instance.
+        """
+        engine = self._engines.get(backend)
+        if engine is not None:
+            return engine
 
-            elif backend == "cartesia":
-                from .cartesia_tts import CartesiaTTS
-                self._engines[backend] = CartesiaTTS(**self.kwargs)
+        key = self._engine_key(backend)
+        # Backends may be requested from several threads (see compare)
+        with _ENGINE_POOL_LOCK:
+            if key not in _ENGINE_POOL:
+                _ENGINE_POOL[key] = (self._create_engine(backend), threading.Lock())
+            engine, lock = _ENGINE_POOL[key]
 
-            elif backend == "indic":
-                from .indic_tts import IndicTTS
-                self._engines[backend] = IndicTTS(device=self.device)
+        self._backend_locks[backend] = lock
+        self._engines[backend] = engine
+        return engine
 
-            else:
-                raise ValueError(f"Unknown backend: {backend}")
+    def _engine_key(self, backend: str) -> tuple:
+        """Return the pool key: the backend and the settings it is built from."""
+        if backend == "mms":
+            return (backend, self.device, self.compute_type, self.compile, self.jit)
+        if backend == "cartesia":
+            return (backend, repr(sorted(self.kwargs.items())))
+        return (backend, self.device)
+
+    def _create_engine(self, backend: str):
+        """Create the engine for a backend."""
+        if backend == "mms":
+            from .mms_tts import MMSTTS
+            return MMSTTS(
+                device=self.device,
+                compute_type=self.compute_type,
+                compile=self.compile,
+                jit=self.jit,
+            )
+
+        elif backend == "cartesia":
+            from .cartesia_tts import CartesiaTTS
+            return CartesiaTTS(**self.kwargs)
+
+        elif backend == "indic":
+            from .indic_tts import IndicTTS
+            return IndicTTS(device=self.device)
+
+        raise ValueError(f"Unknown backend: {backend}")
+
+    # Short phrases used to warm up local backends
+    WARMUP_TEXT = {
+        "ml": "നമസ്കാരം",
+        "hi": "नमस्ते",
+        "en": "Hello",
+    }
+
+    def warmup(self, language: str = "ml", backend: Optional[str] = None):
+        """
+        Run one throwaway synthesis on a local backend.
+
+        Loads the model and pays CUDA context setup and cuDNN autotuning
+        up front, so the first real sentence is not slowed down. Skips
+        the synthesis cache and online backends.
+
+        Args:
+            language: Language to load the model for
+            backend: Override default backend
+        """
+        backend = backend or self.default_backend
+        engine = self._get_engine(backend)
+        if backend not in ("mms", "indic"):
+            return
 
-        return self._engines[backend]
+        start_ns = time.perf_counter_ns()
+        with self._backend_lock(backend):
+            engine.synthesize(text=self.WARMUP_TEXT.get(language, "Hello"), language=language)
+        logger.info(f"TTS warmup ({backend}) took {_elapsed_ms(start_ns):.1f}ms")
+
+    def warm(self, backends: Optional[list] = None, language: str = "ml"):
+        """
+        Create and warm up several backends in parallel.
+
+        Local backends load their models and run one throwaway synthesis
+        (see warmup); online backends are only created.
+
+        Args:
+            backends: Backends to warm (default: the default backend)
+            language: Language to load models for
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        backends = backends or [self.default_backend]
+        with ThreadPoolExecutor(max_workers=len(backends)) as executor:
+            futures = {
+                executor.submit(self.warmup, language=language, backend=backend): backend
+                for backend in backends
+            }
+            for future, backend in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.warning(f"[{backend}] Warmup failed: {e}")
 
     def synthesize(
         self,
@@ -104,21 +433,38 @@ class TTSEngine:
             TTSResult with audio and metadata
         """
         backend = backend or self.default_backend
+
+        if not kwargs.get("stream") and len(text) > self.SPLIT_MIN_CHARS:
+            sentences = _split_sentences(text)
+            if len(sentences) > 1:
+                return self._synthesize_long(
+                    text, sentences, language, backend, output_path, **kwargs
+                )
+
+        if self.cache is not None and not kwargs.get("stream"):
+            return self._synthesize_cached(text, language, backend, output_path, **kwargs)
+
         engine = self._get_engine(backend)
 
-        start_time = time.perf_counter()
+        start_ns = time.perf_counter_ns()
 
         try:
-            audio = engine.synthesize(
-                text=text,
-                language=language,
-                output_path=output_path,
-                **kwargs,
-            )
+            # Pooled engines are shared by every TTSEngine and thread
+            with self._backend_lock(backend):
+                audio = engine.synthesize(
+                    text=text,
+                    language=language,
+                    # With a background writer the backend returns samples and
+                    # the file is written off this thread
+                    output_path=None if self._writer else output_path,
+                    **kwargs,
+                )
 
-            duration_ms = (time.perf_counter() - start_time) * 1000
+            duration_ms = _elapsed_ms(start_ns)
 
             sample_rate = getattr(engine, 'sample_rate', 22050)
+            if self._writer and output_path:
+                audio = self._write_output(output_path, audio, sample_rate)
 
             return TTSResult(
                 audio=audio,
@@ -133,6 +479,385 @@ class TTSEngine:
             logger.error(f"TTS synthesis failed ({backend}): {e}")
             raise
 
+    def synthesize_sentences(
+        self,
+        text: str,
+        language: str = "ml",
+        backend: Optional[str] = None,
+        **kwargs,
+    ) -> Iterator[TTSResult]:
+        """
+        Yield one TTSResult per sentence, in order, for immediate playback.
+
+        Later sentences are synthesized in worker threads while earlier
+        ones are consumed, so time to first audio is that of the first
+        sentence rather than the whole text.
+
+        Args:
+            text: Text to synthesize
+            language: Language code
+            backend: Override default backend
+            **kwargs: Backend-specific arguments
+
+        Yields:
+            TTSResult per sentence
+        """
+        backend = backend or self.default_backend
+        yield from self._iter_sentences(_split_sentences(text), language, backend, **kwargs)
+
+    def _iter_sentences(
+        self,
+        sentences: Sequence[str],
+        language: str,
+        backend: str,
+        **kwargs,
+    ) -> Iterator[TTSResult]:
+        """Synthesize sentences on a thread pool, yielding results in order."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        # synthesize() takes the backend lock around the model call itself,
+        # so cache hits are not serialized behind other sentences
+        def synthesize(sentence: str) -> TTSResult:
+            return self.synthesize(sentence, language=language, backend=backend, **kwargs)
+
+        with ThreadPoolExecutor(max_workers=self.sentence_workers) as executor:
+            futures = [executor.submit(synthesize, sentence) for sentence in sentences]
+            try:
+                for future in futures:
+                    yield future.result()
+            finally:
+                # Stop unstarted sentences if the caller stops early
+                for future in futures:
+                    future.cancel()
+
+    def _backend_lock(self, backend: str):
+        """Return the lock serializing calls into a backend (a no-op if concurrent)."""
+        self._get_engine(backend)  # create the engine and its lock once
+        if backend in self.CONCURRENT_BACKENDS:
+            return nullcontext()
+        return self._backend_locks.setdefault(backend, threading.Lock())
+
+    def batch_synthesize(
+        self,
+        texts: List[str],
+        language: str = "ml",
+        backend: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        **kwargs,
+    ) -> List[TTSResult]:
+        """
+        Synthesize several texts, batching them through the model.
+
+        Backends with synthesize_batch (MMS-TTS) run up to batch_size texts
+        per padded forward pass; others fall back to a thread pool over
+        synthesize. Bypasses the synthesis cache.
+
+        Args:
+            texts: Texts to synthesize
+            language: Language code
+            backend: Override default backend
+            batch_size: Maximum texts per forward pass (default: self.batch_size)
+            **kwargs: Backend-specific arguments
+
+        Returns:
+            TTSResult per text, in order; duration_ms is the whole batch's
+        """
+        backend = backend or self.default_backend
+
+        start_ns = time.perf_counter_ns()
+        try:
+            audio = self._batch_audio(
+                texts, language, backend, batch_size or self.batch_size, **kwargs
+            )
+        except Exception as e:
+            logger.error(f"TTS batch synthesis failed ({backend}): {e}")
+            raise
+        duration_ms = _elapsed_ms(start_ns)
+
+        sample_rate = self.get_sample_rate(backend)
+        return [
+            TTSResult(
+                audio=clip,
+                backend=backend,
+                language=language,
+                duration_ms=duration_ms,
+                sample_rate=sample_rate,
+                text=text,
+            )
+            for text, clip in zip(texts, audio)
+        ]
+
+    async def asynthesize(
+        self,
+        text: str,
+        language: str = "ml",
+        backend: Optional[str] = None,
+    ) -> TTSResult:
+        """
+        Synthesize speech, batched with other concurrent callers.
+
+        Cache hits return at once. Other requests are queued for a
+        background worker that groups up to batch_size of them (waiting at
+        most max_wait_ms for the batch to fill) and runs each backend and
+        language group as one batch_synthesize() call in a worker thread.
+
+        Args:
+            text: Text to synthesize
+            language: Language code
+            backend: Override default backend
+
+        Returns:
+            TTSResult with audio and metadata
+        """
+        backend = backend or self.default_backend
+
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(
+                text, language=language, backend=backend, compute_type=self.compute_type
+            )
+            entry = self.cache.get(key)
+            if entry is not None:
+                return TTSResult(
+                    audio=entry[0],
+                    backend=backend,
+                    language=language,
+                    duration_ms=0.0,
+                    sample_rate=entry[1],
+                    text=text,
+                    cached=True,
+                )
+
+        if self._batcher is None:
+            from ..utils import MicroBatcher
+            # A forward pass needs one backend and one language
+            self._batcher = MicroBatcher(
+                self._synthesize_items, self.batch_size, self.max_wait_ms,
+                group_key=itemgetter(1, 2),
+            )
+        result = await self._batcher.submit((text, language, backend))
+
+        if key is not None:
+            self.cache.put(key, result.audio, result.sample_rate)
+        return result
+
+    def _synthesize_items(self, items: List[tuple]) -> List[TTSResult]:
+        """batch_synthesize() over queued (text, language, backend) requests."""
+        texts, languages, backends = zip(*items)
+        return self.batch_synthesize(list(texts), languages[0], backends[0])
+
+    def _batch_audio(
+        self,
+        texts: List[str],
+        language: str,
+        backend: str,
+        batch_size: int = 8,
+        **kwargs,
+    ) -> List["np.ndarray"]:
+        """Synthesize texts straight through the backend, batched if it can."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        engine = self._get_engine(backend)
+        lock = self._backend_lock(backend)
+
+        if hasattr(engine, "synthesize_batch"):
+            audio = []
+            with lock:
+                for start in range(0, len(texts), batch_size):
+                    audio.extend(engine.synthesize_batch(
+                        texts[start:start + batch_size], language=language, **kwargs
+                    ))
+            return audio
+
+        def synthesize(text: str) -> "np.ndarray":
+            with lock:
+                return engine.synthesize(text=text, language=language, **kwargs)
+
+        with ThreadPoolExecutor(max_workers=self.sentence_workers) as executor:
+            return list(executor.map(synthesize, texts))
+
+    def _synthesize_long(
+        self,
+        text: str,
+        sentences: Sequence[str],
+        language: str,
+        backend: str,
+        output_path: Optional[Union[str, Path]] = None,
+        **kwargs,
+    ) -> TTSResult:
+        """Synthesize a long text sentence by sentence and join the audio."""
+        import numpy as np
+
+        start_ns = time.perf_counter_ns()
+        results = list(self._iter_sentences(sentences, language, backend, **kwargs))
+        audio = np.concatenate([result.audio for result in results])
+        sample_rate = results[0].sample_rate
+
+        if output_path:
+            audio = self._write_output(output_path, audio, sample_rate)
+
+        return TTSResult(
+            audio=audio,
+            backend=backend,
+            language=language,
+            duration_ms=_elapsed_ms(start_ns),
+            sample_rate=sample_rate,
+            text=text,
+            cached=all(result.cached for result in results),
+        )
+
+    def synthesize_stream(
+        self,
+        text: str,
+        language: str = "ml",
+        backend: Optional[str] = None,
+        **kwargs,
+    ) -> Iterator["np.ndarray"]:
+        """
+        Yield float32 audio blocks as the backend produces them.
+
+        Playback can start on the first block instead of after the whole
+        clip. MMS-TTS and Cartesia stream natively; other backends yield
+        their full clip as a single block. With a synthesis cache, a hit
+        is yielded as one block and a completed stream is cached.
+
+        Args:
+            text: Text to synthesize
+            language: Language code
+            backend: Override default backend
+            **kwargs: Backend-specific arguments
+
+        Yields:
+            Audio blocks at the backend's sample rate (see get_sample_rate)
+        """
+        backend = backend or self.default_backend
+
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(
+                text,
+                language=language,
+                backend=backend,
+                compute_type=self.compute_type,
+                **kwargs,
+            )
+            entry = self.cache.get(key)
+            if entry is not None:
+                yield entry[0]
+                return
+
+        engine = self._get_engine(backend)
+        blocks = []
+        try:
+            if backend in self.STREAMING_BACKENDS:
+                stream = engine.synthesize(text=text, language=language, stream=True, **kwargs)
+                if backend == "cartesia":
+                    stream = _pcm_f32_blocks(stream)
+            else:
+                with self._backend_lock(backend):
+                    stream = [engine.synthesize(text=text, language=language, **kwargs)]
+
+            for block in stream:
+                if key is not None:
+                    blocks.append(block)
+                yield block
+
+        except Exception as e:
+            logger.error(f"TTS streaming failed ({backend}): {e}")
+            raise
+
+        if key is not None and blocks:
+            import numpy as np
+            self.cache.put(key, np.concatenate(blocks), self.get_sample_rate(backend))
+
+    def get_sample_rate(self, backend: Optional[str] = None) -> int:
+        """Return the output sample rate of a backend."""
+        return getattr(self._get_engine(backend or self.default_backend), 'sample_rate', 22050)
+
+    def _synthesize_cached(
+        self,
+        text: str,
+        language: str,
+        backend: str,
+        output_path: Optional[Union[str, Path]] = None,
+        **kwargs,
+    ) -> TTSResult:
+        """Synthesize through self.cache, writing output_path from cached audio."""
+        key = self.cache.key(
+            text,
+            language=language,
+            backend=backend,
+            compute_type=self.compute_type,
+            **kwargs,
+        )
+
+        start_ns = time.perf_counter_ns()
+        entry = self.cache.get(key)
+        cached = entry is not None
+
+        if cached:
+            audio, sample_rate = entry
+        else:
+            engine = self._get_engine(backend)
+            try:
+                with self._backend_lock(backend):
+                    audio = engine.synthesize(text=text, language=language, **kwargs)
+            except Exception as e:
+                logger.error(f"TTS synthesis failed ({backend}): {e}")
+                raise
+            sample_rate = getattr(engine, 'sample_rate', 22050)
+            self.cache.put(key, audio, sample_rate)
+
+        if output_path:
+            audio = self._write_output(output_path, audio, sample_rate)
+
+        return TTSResult(
+            audio=audio,
+            backend=backend,
+            language=language,
+            duration_ms=_elapsed_ms(start_ns),
+            sample_rate=sample_rate,
+            text=text,
+            cached=cached,
+        )
+
+    def _write_output(
+        self,
+        output_path: Union[str, Path],
+        audio: "np.ndarray",
+        sample_rate: int,
+    ) -> Union["np.ndarray", str]:
+        """
+        Save audio to output_path, in the background if enabled.
+
+        Returns:
+            The path when written inline, or the samples when the write
+            was queued on the background writer
+        """
+        import soundfile as sf
+
+        if self._writer is None:
+            sf.write(str(output_path), audio, samplerate=sample_rate)
+            return str(output_path)
+
+        def report(future):
+            if future.exception() is not None:
+                logger.warning(f"Failed to write TTS audio {output_path}: {future.exception()}")
+
+        future = self._writer.submit(sf.write, str(output_path), audio, samplerate=sample_rate)
+        future.add_done_callback(report)
+        self._last_write = future
+        return audio
+
+    def flush_writes(self):
+        """Block until every queued background WAV write has finished."""
+        future = self._last_write
+        if future is not None:
+            # The writer runs writes in order on one thread, so the last
+            # queued write finishing means all earlier ones have too
+            from concurrent.futures import wait
+            wait([future])
+
     def compare(
         self,
         text: str,
@@ -143,6 +868,9 @@ class TTSEngine:
         """
         Compare multiple TTS backends for A/B testing.
 
+        Backends run concurrently, each in its own thread, so the call
+        takes about as long as the slowest backend rather than the sum.
+
         Args:
             text: Text to synthesize
             language: Language code
@@ -152,34 +880,44 @@ class TTSEngine:
         Returns:
             Dictionary mapping backend name to TTSResult
         """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
         backends = backends or self.BACKENDS
-        results = {}
+        # Keep the backends' order regardless of which finishes first
+        results = dict.fromkeys(backends)
 
+        output_paths = dict.fromkeys(backends)
         if output_dir:
             output_dir = Path(output_dir)
             output_dir.mkdir(parents=True, exist_ok=True)
+            output_paths = {
+                backend: str(output_dir / f"{backend}_{language}.wav") for backend in backends
+            }
 
-        for backend in backends:
-            try:
-                output_path = None
-                if output_dir:
-                    output_path = output_dir / f"{backend}_{language}.wav"
-
-                result = self.synthesize(
+        with ThreadPoolExecutor(max_workers=len(backends)) as executor:
+            futures = {
+                executor.submit(
+                    self.synthesize,
                     text=text,
                     language=language,
                     backend=backend,
-                    output_path=output_path,
-                )
-                results[backend] = result
+                    output_path=output_paths[backend],
+                ): backend
+                for backend in backends
+            }
 
-                logger.info(
-                    f"[{backend}] Synthesized in {result.duration_ms:.1f}ms"
-                )
+            for future in as_completed(futures):
+                backend = futures[future]
+                try:
+                    result = future.result()
+                    results[backend] = result
 
-            except Exception as e:
-                logger.warning(f"[{backend}] Failed: {e}")
-                results[backend] = None
+                    logger.info(
+                        f"[{backend}] Synthesized in {result.duration_ms:.1f}ms"
+                    )
+
+                except Exception as e:
+                    logger.warning(f"[{backend}] Failed: {e}")
 
         return results
 
@@ -193,51 +931,102 @@ class TTSEngine:
         """
         Benchmark TTS backends.
 
+        Each iteration synthesizes all texts as one batch (see
+        batch_synthesize), after one untimed warmup batch per backend.
+
         Args:
             texts: List of texts to synthesize
             language: Language code
             backends: Backends to benchmark
-            iterations: Number of iterations per text
+            iterations: Number of timed batches
 
         Returns:
-            Benchmark results with timing statistics
+            Per backend: timed runs, errors, per-batch mean/std/min/max in
+            ms and the mean time per text
         """
         backends = backends or self.BACKENDS
-        results = {b: {"times": [], "errors": 0} for b in backends}
+        results = {}
 
         for backend in backends:
-            engine = None
+            data = results[backend] = {"runs": 0, "errors": 0, "mean_ms": None}
             try:
-                engine = self._get_engine(backend)
+                self._get_engine(backend)
             except Exception as e:
                 logger.warning(f"Cannot load {backend}: {e}")
                 continue
 
-            for text in texts:
-                for _ in range(iterations):
-                    try:
-                        start = time.perf_counter()
-                        engine.synthesize(text, language=language)
-                        elapsed = (time.perf_counter() - start) * 1000
-                        results[backend]["times"].append(elapsed)
-                    except Exception:
-                        results[backend]["errors"] += 1
-
-        # Calculate statistics
-        for backend, data in results.items():
-            times = data["times"]
-            if times:
-                data["mean_ms"] = np.mean(times)
-                data["std_ms"] = np.std(times)
-                data["min_ms"] = np.min(times)
-                data["max_ms"] = np.max(times)
-            else:
-                data["mean_ms"] = None
+            # Welford's running mean and variance over integer nanoseconds:
+            # no list of timings kept, converted to ms once at the end
+            n, mean, m2 = 0, 0.0, 0.0
+            low, high = None, None
+
+            for iteration in range(iterations + 1):
+                try:
+                    start_ns = time.perf_counter_ns()
+                    self._batch_audio(texts, language, backend, self.batch_size)
+                    elapsed = time.perf_counter_ns() - start_ns
+                except Exception:
+                    data["errors"] += 1
+                    continue
+
+                # The first batch loads weights and autotunes kernels
+                if not iteration:
+                    continue
+                n += 1
+                delta = elapsed - mean
+                mean += delta / n
+                m2 += delta * (elapsed - mean)
+                low = elapsed if low is None else min(low, elapsed)
+                high = elapsed if high is None else max(high, elapsed)
+
+            data["runs"] = n
+            if n:
+                mean /= 1e6
+                data["mean_ms"] = mean
+                data["std_ms"] = math.sqrt(m2 / n) / 1e6
+                data["min_ms"] = low / 1e6
+                data["max_ms"] = high / 1e6
+                data["per_text_ms"] = mean / len(texts)
 
         return results
 
 
 # Quick access functions
+@lru_cache(maxsize=None)
+def get_synthesis_cache() -> SynthesisCache:
+    """Get the shared on-disk synthesis cache, one WAV file per clip."""
+    return SynthesisCache(cache_dir=SynthesisCache.DEFAULT_DIR)
+
+
+@lru_cache(maxsize=None)
+def get_tts(
+    backend: str = "mms",
+    device: str = "cuda",
+    compute_type: str = "float32",
+    use_cache: bool = False,
+    compile: bool = False,
+    jit: bool = False,
+) -> TTSEngine:
+    """
+    Get or create the shared TTS engine for a backend, device and precision.
+
+    Backends named in the comma-separated TTS_WARM_BACKENDS environment
+    variable are loaded and warmed up when the engine is first created.
+    """
+    engine = TTSEngine(
+        backend=backend,
+        device=device,
+        compute_type=compute_type,
+        cache=get_synthesis_cache() if use_cache else None,
+        compile=compile,
+        jit=jit,
+    )
+    warm_backends = [b for b in os.environ.get("TTS_WARM_BACKENDS", "").split(",") if b]
+    if warm_backends:
+        engine.warm(warm_backends)
+    return engine
+
+
 def tts(
     text: str,
     language: str = "ml",
@@ -245,7 +1034,7 @@ def tts(
     output_path: Optional[str] = None,
 ) -> TTSResult:
     """Quick TTS synthesis."""
-    engine = TTSEngine(backend=backend)
+    engine = get_tts(backend)
     return engine.synthesize(text, language=language, output_path=output_path)
 
 
@@ -255,5 +1044,5 @@ def compare_tts(
     output_dir: str = "./tts_comparison",
 ) -> dict:
     """Quick A/B comparison."""
-    engine = TTSEngine()
+    engine = get_tts()
     return engine.compare(text, language=language, output_dir=output_dir)
@@ -0,0 +1,23 @@
+"""Utilities Module"""
+
+from .audio import resample, to_mono
+from .batching import MicroBatcher
+from .compile_cache import enable_compile_cache
+from .gpu_memory import release_cuda_memory
+from .keyword_matcher import KeywordMatcher
+from .timing import Timer, cuda_timer
+from .vad import TurnSegmenter, load_speech_detector, speech_detector_factory
+
+__all__ = [
+    "KeywordMatcher",
+    "MicroBatcher",
+    "Timer",
+    "TurnSegmenter",
+    "cuda_timer",
+    "enable_compile_cache",
+    "load_speech_detector",
+    "release_cuda_memory",
+    "resample",
+    "speech_detector_factory",
+    "to_mono",
+]
@@ -0,0 +1,75 @@
+"""
+Audio Helpers
+Sample-rate conversion shared by the ASR engines.
+"""
+
+import numpy as np
+
+
+def resample(audio: np.ndarray, orig_sr: int, target_sr: int = 16000) -> np.ndarray:
+    """
+    Resample audio with a polyphase anti-aliasing filter.
+
+    Uses scipy's resample_poly, falling back to resampy when scipy is not
+    installed.
+
+    Args:
+        audio: Samples, shaped (n,) or (n, channels)
+        orig_sr: Sample rate of audio in Hz
+        target_sr: Desired sample rate in Hz
+
+    Returns:
+        Resampled float32 audio with the same channel layout
+    """
+    if orig_sr == target_sr:
+        return audio
+
+    try:
+        from scipy.signal import resample_poly
+    except ImportError:
+        try:
+            import resampy
+        except ImportError:
+            raise ImportError("Resampling needs scipy. Run: pip install scipy")
+
+        # resampy's kernel is much slower on 2-D input: resample each
+        # channel as its own contiguous 1-D array
+        channels = audio.reshape(len(audio), -1).T
+        out = np.stack([
+            resampy.resample(np.ascontiguousarray(channel), orig_sr, target_sr, parallel=False)
+            for channel in channels
+        ], axis=-1)
+        return out.reshape((-1,) + audio.shape[1:]).astype(np.float32, copy=False)
+
+    # resample_poly reduces up/down by their gcd, e.g. 44100 -> 16000 is 160/441
+    return resample_poly(audio, target_sr, orig_sr, axis=0).astype(np.float32, copy=False)
+
+
+def to_mono(audio: np.ndarray, sample_rate: int, target_sr: int = 16000) -> np.ndarray:
+    """
+    Prepare decoded audio for the ASR models.
+
+    Downmix, float32 conversion and int16 scaling share one pass into a
+    single float32 buffer, and the resampler keeps float32, so there are
+    no extra float64 intermediates.
+
+    Args:
+        audio: Float or int16 samples, shaped (n,) or (n, channels)
+        sample_rate: Sample rate of audio in Hz
+        target_sr: Sample rate the model expects
+
+    Returns:
+        Mono float32 audio at target_sr
+    """
+    scale = 1.0 / 32768.0 if audio.dtype == np.int16 else 1.0
+
+    # Downmix first, so only one channel is resampled
+    if audio.ndim > 1:
+        scale /= audio.shape[1]
+        audio = audio.sum(axis=1, dtype=np.float32)
+    else:
+        audio = audio.astype(np.float32, copy=scale != 1.0)
+
+    if scale != 1.0:
+        audio *= scale
+    return resample(audio, sample_rate, target_sr)
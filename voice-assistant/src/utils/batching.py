@@ -0,0 +1,101 @@
+"""
+Request Batching
+Coalesce concurrent async requests into batched calls on a worker thread.
+"""
+
+import asyncio
+from typing import Any, Callable, Hashable, List, Optional
+
+
+class MicroBatcher:
+    """
+    Groups concurrent submit() calls into batches for a blocking function.
+
+    The first queued request waits at most max_wait_ms for others to
+    join; a batch closes early once it holds max_batch requests. With
+    group_key, a batch is split by key and each group is its own call.
+
+    run_batch runs in a worker thread, takes a list of items and returns
+    one result per item, in order. If it raises, every request of that
+    call gets the exception.
+
+    The queue and its worker task are bound to the event loop of the
+    first submit() and rebuilt when a later call runs on another loop.
+
+    Usage:
+        batcher = MicroBatcher(model.predict_batch, max_batch=8, max_wait_ms=10)
+        result = await batcher.submit(item)
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[List[Any]], List[Any]],
+        max_batch: int,
+        max_wait_ms: float,
+        group_key: Optional[Callable[[Any], Hashable]] = None,
+    ):
+        """
+        Args:
+            run_batch: Blocking function from a list of items to their results
+            max_batch: Most requests per batch
+            max_wait_ms: How long a batch waits to fill before it runs
+            group_key: Key of an item; items with different keys never
+                share a run_batch() call
+        """
+        self.run_batch = run_batch
+        self.max_batch = max_batch
+        self.max_wait_s = max_wait_ms / 1000
+        self.group_key = group_key
+        self._queue = None
+        self._loop = None
+        self._task = None
+
+    async def submit(self, item: Any) -> Any:
+        """Queue item for the next batch and return its result."""
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            self._queue = asyncio.Queue()
+            self._loop = loop
+            self._task = loop.create_task(self._worker(self._queue))
+
+        future = loop.create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _worker(self, queue: asyncio.Queue):
+        """Collect queued requests into batches and resolve their futures."""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_wait_s
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            if self.group_key is None:
+                groups = [batch]
+            else:
+                by_key = {}
+                for request in batch:
+                    by_key.setdefault(self.group_key(request[0]), []).append(request)
+                groups = list(by_key.values())
+
+            for group in groups:
+                items, futures = zip(*group)
+                try:
+                    results = await asyncio.to_thread(self.run_batch, list(items))
+                except Exception as e:
+                    for future in futures:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+
+                for future, result in zip(futures, results):
+                    if not future.done():
+                        future.set_result(result)
@@ -0,0 +1,42 @@
+"""
+Compile Cache
+Persist torch.compile artifacts across processes and restarts.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "logentic" / "inductor"
+
+
+def enable_compile_cache(cache_dir: Optional[Union[str, Path]] = None) -> str:
+    """
+    Point TorchInductor at a persistent cache directory.
+
+    Compiled kernels and FX graphs are written there, so later processes
+    (other API workers, restarts) load them instead of recompiling. An
+    existing TORCHINDUCTOR_CACHE_DIR setting takes precedence. Call before
+    torch.compile.
+
+    Args:
+        cache_dir: Cache directory (default: ~/.cache/logentic/inductor)
+
+    Returns:
+        The cache directory in use
+    """
+    os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", str(cache_dir or DEFAULT_CACHE_DIR))
+    os.environ.setdefault("TORCHINDUCTOR_FX_GRAPH_CACHE", "1")
+
+    try:
+        import torch._inductor.config as inductor_config
+        inductor_config.fx_graph_cache = True
+    except ImportError:
+        pass
+
+    cache_dir = os.environ["TORCHINDUCTOR_CACHE_DIR"]
+    logger.info(f"TorchInductor cache: {cache_dir}")
+    return cache_dir
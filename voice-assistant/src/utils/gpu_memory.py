@@ -0,0 +1,48 @@
+"""
+GPU Memory
+Hand cached CUDA memory back to the driver on GPUs shared between models.
+"""
+
+import gc
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def release_cuda_memory(min_idle_bytes: int = 0, collect: bool = False) -> bool:
+    """
+    Release PyTorch's cached but unused CUDA memory.
+
+    The caching allocator keeps freed blocks reserved for reuse, which
+    other models on the same GPU (ASR, LLM, TTS) cannot allocate from.
+    Emptying the cache costs re-allocation later, so callers on the hot
+    path pass a threshold and only release when that much is idle.
+
+    Args:
+        min_idle_bytes: Only release if reserved minus allocated exceeds this
+        collect: Run the garbage collector first, so tensors of dropped
+            models are freed, and release CUDA IPC handles
+
+    Returns:
+        True if the cache was emptied
+    """
+    try:
+        import torch
+    except ImportError:
+        return False
+
+    if not torch.cuda.is_available():
+        return False
+
+    if collect:
+        gc.collect()
+
+    idle = torch.cuda.memory_reserved() - torch.cuda.memory_allocated()
+    if idle <= min_idle_bytes:
+        return False
+
+    torch.cuda.empty_cache()
+    if collect:
+        torch.cuda.ipc_collect()
+    logger.debug(f"Released {idle / 2**20:.0f}MB of cached CUDA memory")
+    return True
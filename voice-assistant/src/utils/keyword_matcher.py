@@ -0,0 +1,133 @@
+"""
+Keyword Matcher
+Multi-keyword substring search with a single Aho-Corasick automaton.
+"""
+
+import re
+from collections import deque
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# Word tokens for whole-word matching; apostrophes stay inside words ("what's")
+_WORD_RE = re.compile(r"[\w']+")
+
+
+class KeywordMatcher:
+    """
+    Finds every keyword occurring in a text in one linear pass.
+
+    Uses pyahocorasick's C automaton when installed, otherwise an
+    equivalent pure-Python automaton built once at construction and
+    flattened into a DFA, so scanning costs one dict lookup per character.
+
+    With whole_words=True, keywords and phrases only match on word
+    boundaries ("hi" does not match "this"). The text is tokenized once
+    and rejoined with single spaces, and each keyword is padded with
+    spaces, so the same single pass handles words and multi-word phrases.
+
+    Usage:
+        matcher = KeywordMatcher({"remind": "task", "light": "smart_home"})
+        for keyword, value in matcher.iter("remind me to switch the light"):
+            ...
+    """
+
+    def __init__(self, keywords: Dict[str, Any], whole_words: bool = False):
+        """
+        Build the automaton.
+
+        Args:
+            keywords: Mapping of keyword to the value reported on a match
+            whole_words: Only match keywords on word boundaries
+        """
+        self.keywords = dict(keywords)
+        self.whole_words = whole_words
+        self._automaton = None
+
+        patterns = {
+            (f" {keyword} " if whole_words else keyword): (keyword, value)
+            for keyword, value in self.keywords.items()
+        }
+
+        try:
+            import ahocorasick
+            self._automaton = ahocorasick.Automaton()
+            for pattern, match in patterns.items():
+                self._automaton.add_word(pattern, match)
+            self._automaton.make_automaton()
+        except ImportError:
+            self._build(patterns)
+
+    def _build(self, patterns: Dict[str, Tuple[str, Any]]):
+        """Build the pure-Python automaton as a DFA transition table."""
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+
+        for pattern, match in patterns.items():
+            state = 0
+            for char in pattern:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(match)
+
+        # Breadth-first: fail links point to the longest proper suffix state
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0)
+                self._out[nxt].extend(self._out[self._fail[nxt]])
+
+        # Resolve fail links ahead of time: each state's transitions are its
+        # fail state's transitions overridden by its own (BFS order means the
+        # fail state is always complete first)
+        self._delta = [dict(self._goto[0])] + [None] * (len(self._goto) - 1)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            table = dict(self._delta[self._fail[state]])
+            table.update(self._goto[state])
+            self._delta[state] = table
+            queue.extend(self._goto[state].values())
+        del self._goto, self._fail
+
+    def iter(self, text: str) -> Iterator[Tuple[str, Any]]:
+        """
+        Yield (keyword, value) for every keyword occurrence in text.
+
+        Args:
+            text: Text to search (matching is case-sensitive)
+
+        Yields:
+            (keyword, value) pairs in order of where each match ends
+        """
+        if self.whole_words:
+            text = f" {' '.join(_WORD_RE.findall(text))} "
+
+        if self._automaton is not None:
+            if self.keywords:
+                for _, match in self._automaton.iter(text):
+                    yield match
+            return
+
+        delta, out = self._delta, self._out
+        state = 0
+        for char in text:
+            state = delta[state].get(char, 0)
+            if out[state]:
+                yield from out[state]
+
+    def first(self, text: str) -> Optional[Any]:
+        """Return the value of the first keyword to match in text, or None."""
+        for _, value in self.iter(text):
+            return value
+        return None
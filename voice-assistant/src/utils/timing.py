@@ -0,0 +1,79 @@
+"""
+Timing Helpers
+Measure GPU work with CUDA events instead of host-side stopwatches.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class Timer:
+    """
+    Elapsed time of a timed block, read through the ms property.
+
+    With CUDA events the device is only synchronized when ms is first
+    read, so the timed region itself runs without extra syncs.
+    """
+
+    def __init__(self, start_event=None, end_event=None):
+        self._start_event = start_event
+        self._end_event = end_event
+        self._start = None
+        self._ms = None
+
+    def _begin(self):
+        if self._start_event is not None:
+            self._start_event.record()
+        else:
+            self._start = time.perf_counter()
+
+    def _finish(self):
+        if self._end_event is not None:
+            self._end_event.record()
+        else:
+            self._ms = (time.perf_counter() - self._start) * 1000
+
+    @property
+    def ms(self) -> float:
+        """Elapsed milliseconds."""
+        if self._ms is None and self._end_event is not None:
+            self._end_event.synchronize()
+            self._ms = self._start_event.elapsed_time(self._end_event)
+        return self._ms
+
+
+@contextmanager
+def cuda_timer() -> Iterator[Timer]:
+    """
+    Time a block of GPU work with a pair of CUDA events.
+
+    Falls back to time.perf_counter() when torch or CUDA is unavailable.
+
+    Usage:
+        with cuda_timer() as t:
+            translated = translator.ml_to_en(text)
+        print(f"{t.ms:.1f}ms")
+
+    Yields:
+        Timer whose ms property holds the elapsed time after the block
+    """
+    try:
+        import torch
+        use_cuda = torch.cuda.is_available()
+    except ImportError:
+        use_cuda = False
+
+    if use_cuda:
+        timer = Timer(
+            torch.cuda.Event(enable_timing=True),
+            torch.cuda.Event(enable_timing=True),
+        )
+    else:
+        timer = Timer()
+
+    timer._begin()
+    try:
+        yield timer
+    finally:
+        timer._finish()
@@ -0,0 +1,165 @@
+"""
+Voice Activity Detection
+Per-frame speech detection and splitting of live audio into speech turns.
+"""
+
+import logging
+from typing import Callable, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Silero VAD scores 512-sample frames (32ms at 16kHz)
+VAD_FRAME = 512
+
+# A turn ends after this much continuous non-speech following speech
+SILENCE_STOP_MS = 800
+
+
+def load_speech_detector(sample_rate: int = 16000) -> Callable[[np.ndarray], bool]:
+    """
+    Build a per-frame speech detector.
+
+    Uses Silero VAD when torch is available, otherwise a simple RMS
+    energy gate. The detector is for a single audio stream; use
+    speech_detector_factory() to serve several streams.
+
+    Args:
+        sample_rate: Sample rate in Hz (Silero supports 8000/16000)
+
+    Returns:
+        Callable taking a float32 frame of VAD_FRAME samples, returning bool
+    """
+    return speech_detector_factory(sample_rate)()
+
+
+def speech_detector_factory(
+    sample_rate: int = 16000,
+) -> Callable[[], Callable[[np.ndarray], bool]]:
+    """
+    Load the VAD once and return a factory of independent detectors.
+
+    Silero VAD carries recurrent state from frame to frame and is not
+    thread-safe, so each stream (e.g. each WebSocket connection) needs
+    its own copy of the model. Each detector has a reset() attribute
+    that clears that state, which TurnSegmenter calls between turns.
+
+    Args:
+        sample_rate: Sample rate in Hz (Silero supports 8000/16000)
+
+    Returns:
+        Callable returning a new detector for each stream
+    """
+    try:
+        import copy
+        import torch
+        model, _ = torch.hub.load("snakers4/silero-vad", "silero_vad", trust_repo=True)
+        logger.info("Using Silero VAD")
+
+        def new_detector():
+            own = copy.deepcopy(model)
+            own.reset_states()
+
+            def is_speech(frame):
+                with torch.inference_mode():
+                    return own(torch.from_numpy(frame), sample_rate).item() > 0.5
+
+            is_speech.reset = own.reset_states
+            return is_speech
+
+        return new_detector
+
+    except Exception as e:
+        logger.warning(f"Silero VAD unavailable ({e}), using energy threshold")
+
+        # Stateless, so every stream can share it
+        def is_speech(frame):
+            return float(np.sqrt(np.dot(frame, frame) / frame.size)) > 0.01
+
+        return lambda: is_speech
+
+
+class TurnSegmenter:
+    """
+    Splits a live PCM16 stream into speech turns.
+
+    Audio is fed in arbitrary chunks; each VAD_FRAME of it is scored and
+    a turn is emitted once SILENCE_STOP_MS of silence follows speech (or
+    the turn reaches max_turn_s). Leading silence is dropped.
+
+    Usage:
+        segmenter = TurnSegmenter(load_speech_detector())
+        for turn in segmenter.feed(pcm_chunk):
+            transcribe(turn)
+    """
+
+    def __init__(
+        self,
+        is_speech: Callable[[np.ndarray], bool],
+        sample_rate: int = 16000,
+        max_turn_s: float = 30.0,
+    ):
+        """
+        Initialize the segmenter.
+
+        Args:
+            is_speech: Speech detector from load_speech_detector(), used
+                only by this segmenter
+            sample_rate: Sample rate of the stream in Hz
+            max_turn_s: Longest turn emitted before it is cut
+        """
+        self.is_speech = is_speech
+        self.sample_rate = sample_rate
+        self.stop_frames = int(SILENCE_STOP_MS * sample_rate / 1000 / VAD_FRAME)
+        self.max_frames = int(max_turn_s * sample_rate / VAD_FRAME)
+
+        self._pending = np.empty(0, dtype=np.int16)
+        self._frames: List[np.ndarray] = []
+        self._silent_frames = 0
+
+    def feed(self, pcm: np.ndarray) -> List[np.ndarray]:
+        """
+        Add audio to the stream.
+
+        Args:
+            pcm: Mono int16 samples
+
+        Returns:
+            Turns completed by this chunk, as float32 arrays
+        """
+        pcm = np.concatenate([self._pending, pcm])
+        usable = len(pcm) - len(pcm) % VAD_FRAME
+        self._pending = pcm[usable:]
+
+        turns = []
+        frames = pcm[:usable].reshape(-1, VAD_FRAME).astype(np.float32) / 32768.0
+        for frame in frames:
+            if self.is_speech(frame):
+                self._frames.append(frame)
+                self._silent_frames = 0
+            elif self._frames:
+                self._frames.append(frame)
+                self._silent_frames += 1
+
+            if self._frames and (
+                self._silent_frames >= self.stop_frames
+                or len(self._frames) >= self.max_frames
+            ):
+                turns.append(self._take_turn())
+
+        return turns
+
+    def flush(self) -> List[np.ndarray]:
+        """Return the turn in progress, if any speech has been heard."""
+        return [self._take_turn()] if self._frames else []
+
+    def _take_turn(self) -> np.ndarray:
+        turn = np.concatenate(self._frames)
+        self._frames = []
+        self._silent_frames = 0
+        # Start the next turn from fresh VAD state
+        reset = getattr(self.is_speech, "reset", None)
+        if reset is not None:
+            reset()
+        return turn
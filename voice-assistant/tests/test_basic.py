@@ -27,6 +27,141 @@ class TestASR:
         assert "ml" in asr.SUPPORTED_INDIAN_LANGUAGES
         assert asr.SUPPORTED_INDIAN_LANGUAGES["hi"] == "Hindi"
 
+    def test_faster_whisper_asr_init(self):
+        """Test FasterWhisperASR initialization."""
+        from src.asr import FasterWhisperASR
+
+        asr = FasterWhisperASR(model_size="tiny", device="cpu")
+        assert asr.model_size == "tiny"
+        assert asr.compute_type == "int8"  # int8_float16 needs a GPU
+        assert asr.model is None  # Model not loaded yet
+
+    def test_whisper_asr_backend(self):
+        """Test WhisperASR backend selection and compute type choice."""
+        from src.asr import WhisperASR
+
+        asr = WhisperASR(model_size="tiny", device="cpu", backend="whisper")
+        assert asr.backend == "whisper"
+        assert asr._fast_asr is None
+        assert WhisperASR._pick_compute_type("cpu") == "int8"
+
+    def test_whisper_asr_batch_queue(self):
+        """Test WhisperASR.transcribe_async coalesces up to batch_size requests."""
+        import asyncio
+        from src.asr import WhisperASR
+
+        asr = WhisperASR(device="cpu", backend="whisper", batch_size=2, max_wait_ms=50)
+        batch_sizes = []
+
+        def fake_batch(audios, languages):
+            batch_sizes.append(len(audios))
+            return [{"text": audio, "language": lang} for audio, lang in zip(audios, languages)]
+
+        asr.transcribe_batch = fake_batch
+
+        async def run():
+            return await asyncio.gather(*(asr.transcribe_async(a) for a in "abc"))
+
+        results = asyncio.run(run())
+        assert [r["text"] for r in results] == ["a", "b", "c"]
+        assert batch_sizes == [2, 1]
+
+    def test_whisper_encoder_cache(self):
+        """Test encoder outputs are cached per clip for detect_language -> transcribe."""
+        import numpy as np
+        from src.asr import WhisperASR
+
+        asr = WhisperASR(device="cpu", backend="whisper")
+        clip = np.zeros(16000, dtype=np.float32)
+        assert asr._encoder_key("clip.wav") is None
+        assert asr._encoder_key(np.zeros(31 * 16000, dtype=np.float32)) is None
+        assert asr._encoder_key(clip) == asr._encoder_key(clip.copy())
+
+        for i in range(asr.ENCODER_CACHE_SIZE + 1):
+            asr._cache_encoder_output(asr._encoder_key(clip + i), i)
+        assert asr._encoder_key(clip) not in asr._encoder_cache
+        assert len(asr._encoder_cache) == asr.ENCODER_CACHE_SIZE
+
+        # Consumed once by transcribe; other lengths are never hashed
+        asr._encoder_key = lambda audio: pytest.fail("hashed a clip with no cached length")
+        assert asr._take_encoder_output(np.zeros(8000, dtype=np.float32)) is None
+        del asr._encoder_key
+        assert asr._take_encoder_output(clip + 1) == 1
+        assert asr._take_encoder_output(clip + 1) is None
+
+    def test_timestamp_segments(self):
+        """Test decoded tokens split into segments like Whisper's transcribe()."""
+        from src.asr.whisper_asr import _timestamp_segments
+
+        ts = 1000
+        tokens = [ts, 1, 2, ts + 50, ts + 50, 3, ts + 100]
+        assert _timestamp_segments(tokens, ts, 3.0) == [
+            (0.0, 1.0, [ts, 1, 2, ts + 50]),
+            (1.0, 2.0, [ts + 50, 3, ts + 100]),
+        ]
+        assert _timestamp_segments([ts, 1, 2], ts, 3.0) == [(0.0, 3.0, [ts, 1, 2])]
+        assert _timestamp_segments([ts, 1, ts + 25], ts, 3.0) == [(0.0, 0.5, [ts, 1, ts + 25])]
+
+    def test_language_result(self):
+        """Test detect_language results report the argmax and the top languages."""
+        from src.asr import WhisperASR
+
+        asr = WhisperASR(device="cpu", backend="whisper")
+        probs = {f"l{i}": i / 100 for i in range(20)}
+        probs["ml"] = 0.5
+
+        result = asr._language_result(probs)
+        assert result["language"] == "ml"
+        assert result["language_name"] == "Malayalam"
+        assert result["confidence"] == 0.5
+        assert list(result["all_probabilities"])[:2] == ["ml", "l19"]
+        assert len(result["all_probabilities"]) == asr.TOP_LANGUAGES
+
+    def test_get_asr_shared(self):
+        """Test get_asr returns one shared instance per model size and device."""
+        from src.asr import get_asr
+
+        assert get_asr("tiny", "cpu") is get_asr("tiny", "cpu")
+        assert get_asr("tiny", "cpu") is not get_asr("base", "cpu")
+
+    def test_indic_whisper_backend(self):
+        """Test IndicWhisperASR maps its checkpoint onto the CTranslate2 backend."""
+        from src.asr import IndicWhisperASR
+
+        asr = IndicWhisperASR(language="ml", backend="ctranslate2")
+        assert asr._ct2_asr.model_size == "large-v3"
+        assert asr._ct2_asr.compute_type == "int8"  # CPU
+        assert asr._ct2_asr.language == "ml"
+
+        asr = IndicWhisperASR(language="en", backend="transformers")
+        assert asr._ct2_asr is None
+
+    def test_indic_whisper_dynamic_batching(self):
+        """Test concurrent transcribe_async calls share one batch."""
+        import asyncio
+        from src.asr import IndicWhisperASR
+
+        asr = IndicWhisperASR(language="ml", backend="transformers")
+        batch_sizes = []
+
+        def fake_batch(audios, languages):
+            batch_sizes.append(len(audios))
+            return [{"text": audio, "language": lang} for audio, lang in zip(audios, languages)]
+
+        asr.transcribe_batch = fake_batch
+
+        async def run():
+            return await asyncio.gather(
+                asr.transcribe_async("a"),
+                asr.transcribe_async("b", "hi"),
+                asr.transcribe_async("c"),
+            )
+
+        results = asyncio.run(run())
+        assert batch_sizes == [3]
+        assert [r["text"] for r in results] == ["a", "b", "c"]
+        assert results[1]["language"] == "hi"
+
 
 class TestTTS:
     """Tests for TTS module."""
@@ -58,6 +193,407 @@ class TestTTS:
         assert "happy" in emotions
 
 
+    def test_cartesia_streamed_write(self, tmp_path):
+        """Test Cartesia chunks split mid-sample decode and save correctly."""
+        from types import SimpleNamespace
+        import numpy as np
+        import soundfile as sf
+        from src.tts.cartesia_tts import CartesiaTTS
+
+        samples = np.array([0.5, -0.25, 0.125], dtype="<f4")
+        data = samples.tobytes()
+        tts = CartesiaTTS(api_key="test")
+        tts.client = SimpleNamespace(tts=SimpleNamespace(
+            bytes=lambda **kwargs: iter([data[:5], data[5:6], data[6:]])
+        ))
+
+        np.testing.assert_array_equal(tts.synthesize("hi"), samples)
+
+        path = tmp_path / "out.wav"
+        assert tts.synthesize("hi", output_path=path) == str(path)
+        written, sample_rate = sf.read(str(path), dtype="float32")
+        assert sample_rate == tts.sample_rate
+        np.testing.assert_allclose(written, samples, atol=1e-4)
+
+    def test_cartesia_async(self):
+        """Test Cartesia async synthesis and chunk streaming."""
+        import asyncio
+        from types import SimpleNamespace
+        import numpy as np
+        from src.tts.cartesia_tts import CartesiaTTS
+
+        data = np.array([0.5, -0.25], dtype="<f4").tobytes()
+        tts = CartesiaTTS(api_key="test")
+        tts.client = SimpleNamespace(tts=SimpleNamespace(
+            bytes=lambda **kwargs: iter([data[:4], data[4:]])
+        ))
+
+        async def run():
+            audio = await tts.asynthesize("hi")
+            chunks = [chunk async for chunk in tts.asynthesize_stream("hi")]
+            return audio, chunks
+
+        audio, chunks = asyncio.run(run())
+        np.testing.assert_array_equal(audio, [0.5, -0.25])
+        assert chunks == [data[:4], data[4:]]
+
+    def test_compare_backends_concurrently(self):
+        """Test compare runs backends in parallel and keeps failures as None."""
+        import threading
+        from types import SimpleNamespace
+        import numpy as np
+        from src.tts import TTSEngine
+
+        barrier = threading.Barrier(2, timeout=5)
+
+        def synthesize(text, **kwargs):
+            barrier.wait()  # both backends must be running at once
+            return np.zeros(4, dtype=np.float32)
+
+        def fail(text, **kwargs):
+            raise RuntimeError("offline")
+
+        engine = TTSEngine()
+        engine._engines = {
+            "mms": SimpleNamespace(synthesize=synthesize, sample_rate=16000),
+            "indic": SimpleNamespace(synthesize=synthesize, sample_rate=22050),
+            "cartesia": SimpleNamespace(synthesize=fail),
+        }
+
+        results = engine.compare("hello", backends=["cartesia", "mms", "indic"])
+        assert list(results) == ["cartesia", "mms", "indic"]
+        assert results["cartesia"] is None
+        assert results["indic"].sample_rate == 22050
+
+    def test_backend_calls_serialized(self):
+        """Test concurrent synthesize() calls never overlap inside one backend."""
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        from types import SimpleNamespace
+        import numpy as np
+        from src.tts import TTSEngine
+
+        active, peak = [0], [0]
+        guard = threading.Lock()
+
+        def synthesize(text, **kwargs):
+            with guard:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.01)
+            with guard:
+                active[0] -= 1
+            return np.zeros(4, dtype=np.float32)
+
+        engine = TTSEngine(backend="mms")
+        engine._engines = {"mms": SimpleNamespace(synthesize=synthesize, sample_rate=16000)}
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(engine.synthesize, ["a", "b", "c", "d"]))
+        assert peak[0] == 1
+
+    def test_background_writes(self, tmp_path):
+        """Test output files are written off the synthesis thread."""
+        from types import SimpleNamespace
+        import numpy as np
+        import soundfile as sf
+        from src.tts import TTSEngine
+
+        audio = np.array([0.5, -0.25, 0.0], dtype=np.float32)
+
+        def synthesize(text, output_path=None, **kwargs):
+            assert output_path is None  # the engine writes the file itself
+            return audio
+
+        engine = TTSEngine(backend="mms", background_writes=True)
+        engine._engines = {"mms": SimpleNamespace(synthesize=synthesize, sample_rate=16000)}
+
+        path = tmp_path / "out.wav"
+        result = engine.synthesize("hello", output_path=path)
+        assert result.audio is audio
+        engine.flush_writes()
+
+        written, sample_rate = sf.read(str(path), dtype="float32")
+        assert sample_rate == 16000
+        np.testing.assert_allclose(written, audio, atol=1e-4)
+
+    def test_tts_result_pcm16(self):
+        """Test TTSResult converts float audio to int16 PCM."""
+        import numpy as np
+        from src.tts import TTSResult
+
+        audio = np.array([0.0, 0.5, -1.0, 2.0], dtype=np.float32)
+        result = TTSResult(audio, "mms", "ml", 0.0, 16000, "hi")
+        pcm = result.to_int16()
+        np.testing.assert_array_equal(pcm, [0, 16383, -32767, 32767])
+        np.testing.assert_array_equal(audio, [0.0, 0.5, -1.0, 2.0])  # input untouched
+        assert result.to_bytes() == pcm.astype("<i2").tobytes()
+
+        same = TTSResult(pcm, "mms", "ml", 0.0, 16000, "hi")
+        assert same.to_int16() is pcm
+
+        import dataclasses
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            same.cached = True
+    def test_synthesize_stream(self):
+        """Test streamed blocks from native and whole-clip backends."""
+        from types import SimpleNamespace
+        import numpy as np
+        from src.tts import SynthesisCache, TTSEngine
+
+        data = np.array([0.5, -0.25, 0.125], dtype="<f4").tobytes()
+        calls = []
+
+        def indic_synthesize(text, **kwargs):
+            calls.append(text)
+            return np.ones(3, dtype=np.float32)
+
+        engine = TTSEngine(backend="indic", cache=SynthesisCache())
+        engine._engines = {
+            "cartesia": SimpleNamespace(
+                synthesize=lambda text, stream=False, **kwargs: iter([data[:5], data[5:]]),
+                sample_rate=44100,
+            ),
+            "indic": SimpleNamespace(synthesize=indic_synthesize, sample_rate=22050),
+        }
+
+        blocks = list(engine.synthesize_stream("hi", language="en", backend="cartesia"))
+        assert [len(block) for block in blocks] == [1, 2]
+        np.testing.assert_array_equal(np.concatenate(blocks), [0.5, -0.25, 0.125])
+
+        assert len(list(engine.synthesize_stream("hi"))) == 1
+        assert len(list(engine.synthesize_stream("hi"))) == 1
+        assert calls == ["hi"]  # second call served from the cache
+        assert engine.get_sample_rate() == 22050
+
+    def test_sentence_pipelined_synthesis(self):
+        """Test long texts are synthesized per sentence and joined in order."""
+        from types import SimpleNamespace
+        import numpy as np
+        from src.tts import TTSEngine
+
+        def synthesize(text, **kwargs):
+            return np.full(len(text), len(text), dtype=np.float32)
+
+        engine = TTSEngine(backend="mms")
+        engine._engines = {"mms": SimpleNamespace(synthesize=synthesize, sample_rate=16000)}
+
+        sentences = ["First sentence here.", "नमस्ते दुनिया।", "And a much longer third one!"]
+        text = " ".join(sentences * 5)
+        assert len(text) > TTSEngine.SPLIT_MIN_CHARS
+
+        result = engine.synthesize(text)
+        expected = np.concatenate([synthesize(s) for s in sentences * 5])
+        np.testing.assert_array_equal(result.audio, expected)
+        assert result.text == text
+
+        parts = [r.text for r in engine.synthesize_sentences(" ".join(sentences))]
+        assert parts == sentences
+
+        from src.tts.tts_engine import _split_sentences
+        hits = _split_sentences.cache_info().hits
+        engine.synthesize(text)
+        assert _split_sentences.cache_info().hits == hits + 1
+
+    def test_batch_synthesize(self):
+        """Test batched backends get chunked batches and others fall back."""
+        from types import SimpleNamespace
+        import numpy as np
+        from src.tts import TTSEngine
+
+        batches = []
+
+        def synthesize_batch(texts, language=None):
+            batches.append(list(texts))
+            return [np.zeros(len(text), dtype=np.float32) for text in texts]
+
+        engine = TTSEngine()
+        engine._engines = {
+            "mms": SimpleNamespace(synthesize_batch=synthesize_batch, sample_rate=16000),
+            "indic": SimpleNamespace(
+                synthesize=lambda text, **kwargs: np.ones(len(text), dtype=np.float32),
+                sample_rate=22050,
+            ),
+        }
+
+        texts = ["a", "bb", "ccc"]
+        results = engine.batch_synthesize(texts, backend="mms", batch_size=2)
+        assert batches == [["a", "bb"], ["ccc"]]
+        assert [len(r.audio) for r in results] == [1, 2, 3]
+        assert [r.text for r in engine.batch_synthesize(texts, backend="indic")] == texts
+
+        stats = engine.benchmark(texts, backends=["mms"], iterations=2)["mms"]
+        assert stats["runs"] == 2  # warmup batch excluded
+        assert stats["min_ms"] <= stats["mean_ms"] <= stats["max_ms"]
+        assert stats["per_text_ms"] == stats["mean_ms"] / 3
+
+    def test_asynthesize_pools_requests(self):
+        """Test concurrent async requests share one batched forward pass."""
+        import asyncio
+        from types import SimpleNamespace
+        import numpy as np
+        from src.tts import SynthesisCache, TTSEngine
+
+        batches = []
+
+        def synthesize_batch(texts, language=None):
+            batches.append((language, list(texts)))
+            return [np.zeros(len(text), dtype=np.float32) for text in texts]
+
+        engine = TTSEngine(cache=SynthesisCache(), max_wait_ms=50)
+        engine._engines = {
+            "mms": SimpleNamespace(synthesize_batch=synthesize_batch, sample_rate=16000),
+        }
+
+        async def run():
+            first = await asyncio.gather(
+                engine.asynthesize("a"), engine.asynthesize("bb"), engine.asynthesize("c", "hi")
+            )
+            again = await engine.asynthesize("bb")
+            return first, again
+
+        results, again = asyncio.run(run())
+        assert sorted(batches) == [("hi", ["c"]), ("ml", ["a", "bb"])]
+        assert [len(r.audio) for r in results] == [1, 2, 1]
+        assert again.cached and len(again.audio) == 2
+
+    def test_engine_pool_shared(self):
+        """Test TTSEngines with the same settings share backend engines."""
+        from src.tts import TTSEngine
+
+        first = TTSEngine(device="cpu")._get_engine("mms")
+        assert TTSEngine(device="cpu")._get_engine("mms") is first
+        assert TTSEngine(device="cpu", compute_type="int8")._get_engine("mms") is not first
+
+    def test_mms_adjust_speed(self):
+        """Test MMS-TTS speed changes resample to the expected length."""
+        import numpy as np
+        from src.tts.mms_tts import MMSTTS
+
+        audio = np.sin(np.linspace(0, 100, 16000)).astype(np.float32)
+        tts = MMSTTS()
+        faster = tts._adjust_speed(audio, 1.25)
+        slower = tts._adjust_speed(audio, 0.8)
+        assert len(faster) == 12800
+        assert len(slower) == 20000
+        assert faster.dtype == np.float32
+
+    def test_mms_stream_resampler(self):
+        """Test block-wise speed changes match resampling the whole clip."""
+        import numpy as np
+        from src.tts.mms_tts import MMSTTS, _StreamResampler
+
+        audio = np.random.default_rng(0).standard_normal(5000).astype(np.float32)
+        tts = MMSTTS()
+        for speed in (1.25, 0.8, 1.37):
+            resampler = _StreamResampler(*tts._speed_ratio(speed))
+            blocks = [resampler.process(audio[i:i + 768]) for i in range(0, len(audio), 768)]
+            streamed = np.concatenate(blocks + [resampler.flush()])
+            np.testing.assert_allclose(streamed, tts._adjust_speed(audio, speed), atol=1e-5)
+
+
+    def test_mms_resident_languages(self):
+        """Test MMS-TTS offloads least recently used language models to CPU."""
+        from src.tts.mms_tts import MMSTTS
+
+        class FakeModel:
+            def __init__(self):
+                self.device = "cuda"
+
+            def to(self, device):
+                self.device = device
+                return self
+
+        tts = MMSTTS(device="cuda", max_resident_langs=2)
+        for lang in ("ml", "hi", "en"):
+            tts.models[lang] = FakeModel()
+            tts.tokenizers[lang] = lang
+
+        for lang in ("ml", "hi", "en"):
+            with tts._use_model(lang):
+                pass
+        assert tts.models["ml"].device == "cpu"
+        assert tts.models["hi"].device == "cuda"
+
+        with tts._use_model("ml") as (tokenizer, model):
+            assert tokenizer == "ml" and model.device == "cuda"
+        assert tts.models["hi"].device == "cpu"
+        assert len(tts.models) == 3
+
+        # A model in use by another caller is not offloaded under it
+        with tts._use_model("hi"):
+            with tts._use_model("en"):
+                pass
+            with tts._use_model("ml"):
+                pass
+            assert tts.models["hi"].device == "cuda"
+
+
+class TestSynthesisCache:
+    """Tests for the TTS synthesis cache."""
+
+    def test_lru_eviction(self):
+        """Test hits, misses and least-recently-used eviction."""
+        import numpy as np
+        from src.tts import SynthesisCache
+
+        cache = SynthesisCache(max_entries=2)
+        keys = [cache.key(text, language="ml") for text in ("a", "b", "c")]
+        cache.put(keys[0], np.zeros(4), 16000)
+        cache.put(keys[1], np.ones(4), 16000)
+        assert cache.get(keys[0])[1] == 16000  # refreshes "a"
+        cache.put(keys[2], np.ones(4), 16000)
+
+        assert len(cache) == 2
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None
+        assert cache.key("a", language="ml") != cache.key("a", language="hi")
+
+    def test_disk_layer(self, tmp_path):
+        """Test clips written to the cache directory survive a new cache."""
+        import numpy as np
+        from src.tts import SynthesisCache
+
+        audio = np.array([0.1, -0.2, 0.3], dtype=np.float32)
+        cache = SynthesisCache(max_entries=1, cache_dir=str(tmp_path))
+        key = cache.key("hello", language="ml")
+        cache.put(key, audio, 16000)
+        assert (tmp_path / f"{key}.wav").exists()
+
+        fresh = SynthesisCache(cache_dir=str(tmp_path))
+        cached, sample_rate = fresh.get(key)
+        assert sample_rate == 16000
+        np.testing.assert_array_equal(cached, audio)
+        assert len(fresh) == 1
+        assert fresh.get(cache.key("other", language="ml")) is None
+
+
+class TestTranslation:
+    """Tests for translation module."""
+
+    def test_translation_cache(self):
+        """Test short translations are cached and long ones are not."""
+        from src.translation.indictrans import IndicTranslator
+
+        calls = []
+        translator = IndicTranslator(cache_size=1)
+        translator.translate_batch = lambda texts, *args, **kwargs: (
+            calls.append(texts[0]) or [texts[0].upper()]
+        )
+
+        assert translator.translate("hello", "en", "ml") == "HELLO"
+        assert translator.translate("hello", "en", "ml") == "HELLO"
+        assert calls == ["hello"]
+
+        long_text = "x" * IndicTranslator.CACHE_MAX_CHARS
+        translator.translate(long_text, "en", "ml")
+        translator.translate(long_text, "en", "ml")
+        translator.translate("bye", "en", "ml")
+        translator.translate("hello", "en", "ml")
+        assert calls == ["hello", long_text, long_text, "bye", "hello"]
+
+
 class TestNLU:
     """Tests for NLU module."""
 
@@ -86,6 +622,116 @@ class TestNLU:
         result = classifier.classify("remind me to call mom")
         assert result.intent == "reminder"
 
+    def test_keyword_whole_words(self):
+        """Test intent keywords match whole words and phrases only."""
+        from src.nlu import IntentClassifier
+        from src.pipeline.intent import IntentDetector, IntentType
+
+        classifier = IntentClassifier()
+        assert classifier.classify("this is it").intent == "unknown"  # not "hi"
+        assert classifier.classify("What time is it?").intent == "time"
+
+        detector = IntentDetector()
+        assert detector._keyword_detect("this") is None
+        assert detector._keyword_detect("set a timer and remind me") == IntentType.REMINDER
+        assert detector._keyword_detect("please turn on the fan") == IntentType.COMMAND
+
+    def test_extract_entities(self):
+        """Test times and numbers come out of one scan without duplicates."""
+        from src.nlu import IntentClassifier
+
+        classifier = IntentClassifier()
+        entities = classifier._extract_entities("at 10:30 PM buy 5 apples, 100 eggs and 5 more")
+        assert entities == [
+            {"type": "time", "value": "10:30 PM"},
+            {"type": "time", "value": "5"},
+            {"type": "number", "value": "100"},
+        ]
+
+    def test_intent_detector_shares_llm(self):
+        """Test every IntentDetector reuses one intent LLM."""
+        from src.pipeline.intent import IntentDetector
+
+        first, second = IntentDetector(), IntentDetector()
+        assert first._get_llm() is second._get_llm()
+        assert first._get_llm().model is None  # Model not loaded yet
+        assert IntentDetector(use_llm=False)._get_llm() is None
+
+    def test_embedding_intent_tier(self):
+        """Test the embedding tier answers confident non-keyword queries."""
+        from types import SimpleNamespace
+        import numpy as np
+        from src.pipeline.intent import IntentDetector, IntentType
+
+        vectors = {"book a cab": [1.0, 0.0], "hmm okay": [0.6, 0.8]}
+        encoder = SimpleNamespace(
+            encode=lambda texts, normalize_embeddings: np.array([vectors[t] for t in texts])
+        )
+        centroids = np.array([[1.0, 0.0], [0.0, 1.0]])
+        model = "test-encoder"
+        IntentDetector._EMBEDDER_CACHE[model] = (
+            encoder, [IntentType.TASK, IntentType.INFORMATION], centroids
+        )
+        try:
+            detector = IntentDetector(use_llm=False)
+            detector.EMBEDDING_MODEL = model
+
+            intent = detector.detect("book a cab")
+            assert intent.type == IntentType.TASK
+            assert intent.confidence == 1.0
+
+            # Best similarity 0.8 clears the bar; raise it and fall through
+            assert detector.detect("hmm okay").type == IntentType.INFORMATION
+            detector.EMBEDDING_MIN_CONFIDENCE = 0.9
+            assert detector.detect("hmm okay").type == IntentType.GENERAL
+        finally:
+            del IntentDetector._EMBEDDER_CACHE[model]
+
+    def test_embedding_load_failure_cached(self, monkeypatch):
+        """Test a failed embedding model load falls through once, not every turn."""
+        import sys
+        from types import SimpleNamespace
+        from src.pipeline.intent import IntentDetector, IntentType
+
+        loads = []
+
+        def failing_load(name, device):
+            loads.append(name)
+            raise OSError("offline")
+
+        monkeypatch.setitem(
+            sys.modules, "sentence_transformers",
+            SimpleNamespace(SentenceTransformer=failing_load),
+        )
+        model = "offline-encoder"
+        try:
+            detector = IntentDetector(use_llm=False)
+            detector.EMBEDDING_MODEL = model
+            detector.load_model()
+            assert detector.detect("hmm okay").type == IntentType.GENERAL
+            assert loads == [model]
+        finally:
+            IntentDetector._EMBEDDER_CACHE.pop(model, None)
+
+    def test_parse_llm_response(self):
+        """Test the LLM intent reply is parsed field by field."""
+        from src.pipeline.intent import IntentDetector, IntentType
+
+        detector = IntentDetector(use_llm=False)
+        intent = detector._parse_llm_response(
+            "Sure.\n  INTENT: Reminder\nENTITIES: time: 10:30, person: mom\n"
+            "DESCRIPTION: Set a reminder  \n",
+            "orig", "eng",
+        )
+        assert intent.type == IntentType.REMINDER
+        assert intent.entities == {"time": "10:30", "person": "mom"}
+        assert intent.description == "Set a reminder"
+
+        intent = detector._parse_llm_response("INTENT: dance\nENTITIES: none", "o", "e")
+        assert intent.type == IntentType.GENERAL
+        assert intent.entities == {}
+        assert intent.description == "General query"
+
     def test_get_supported_intents(self):
         """Test getting supported intents."""
         from src.nlu import IntentClassifier
@@ -96,6 +742,75 @@ class TestNLU:
         assert "weather" in intents
 
 
+class TestLLM:
+    """Tests for LLM module."""
+
+    def test_incremental_prompt_ids(self):
+        """Test cached per-turn token IDs match tokenizing the full chat template."""
+        from src.llm.qwen import QwenLLM
+
+        class ChatMLTokenizer:
+            def apply_chat_template(self, messages, tokenize=False, add_generation_prompt=False):
+                text = "".join(
+                    f"<|im_start|>{m['role']}\n{m['content']}<|im_end|>\n" for m in messages
+                )
+                return text + ("<|im_start|>assistant\n" if add_generation_prompt else "")
+
+            def encode(self, text, add_special_tokens=True):
+                return [ord(c) for c in text]
+
+        llm = QwenLLM(device="cpu", max_memory_messages=2)
+        llm.tokenizer = ChatMLTokenizer()
+
+        def full_ids(user_input):
+            messages = [{"role": "system", "content": llm.system_prompt}]
+            messages += [{"role": m.role, "content": m.content} for m in llm.conversation_history[-2:]]
+            messages.append({"role": "user", "content": user_input})
+            return llm.tokenizer.encode(
+                llm.tokenizer.apply_chat_template(messages, add_generation_prompt=True)
+            )
+
+        for turn in ("hi", "what time is it", "thanks"):
+            ids, user_ids = llm._build_input_ids(turn)
+            assert ids == full_ids(turn)
+            llm._remember(turn, f"reply to {turn}", user_ids=user_ids)
+
+        llm.set_system_prompt("Be brief.")
+        assert llm._build_input_ids("ok")[0] == full_ids("ok")
+
+    def test_kv_cache_prefix_reuse(self):
+        """Test a conversation's KV cache is cropped to the prefix it shares with the prompt."""
+        from types import SimpleNamespace
+        from src.llm.qwen import QwenLLM
+
+        class FakeCache:
+            def __init__(self, length):
+                self.length = length
+
+            def crop(self, length):
+                self.length = length
+
+        llm = QwenLLM(device="cpu")
+        llm.model = SimpleNamespace(generation_config=SimpleNamespace(cache_implementation=None))
+
+        llm._kv_caches["c"] = ([1, 2, 3, 9], FakeCache(4))
+        cache = llm._take_kv_cache([1, 2, 3, 4, 5], "c")
+        assert cache.length == 3
+        assert "c" not in llm._kv_caches  # owned by the caller until stored back
+
+        llm._kv_caches["c"] = ([1, 2, 3], FakeCache(3))
+        assert llm._take_kv_cache([1, 2, 3], "c").length == 2  # one token left to prefill
+        llm._kv_caches["c"] = ([7, 8], FakeCache(2))
+        assert llm._take_kv_cache([1, 2, 3], "c") is None
+
+    def test_sampling_kwargs(self):
+        """Test temperature 0 decodes greedily on every HF generation path."""
+        from src.llm.qwen import QwenLLM
+
+        assert QwenLLM._sampling_kwargs(0.0, 0.9) == {"do_sample": False}
+        assert QwenLLM._sampling_kwargs(0.7) == {"do_sample": True, "temperature": 0.7, "top_p": 1.0}
+
+
 class TestAgents:
     """Tests for Agent orchestrator."""
 
@@ -119,6 +834,86 @@ class TestAgents:
         assert result["language"] == "en"
 
 
+    def test_classify_intent(self):
+        """Test keyword intent priority and smart home routing."""
+        from src.agents import AgentOrchestrator
+
+        orchestrator = AgentOrchestrator()
+        orchestrator.setup()
+
+        assert orchestrator.process("Remind me what to buy")["intent"] == "information_query"
+        assert orchestrator.process("Remind me to call mom")["intent"] == "task_management"
+        result = orchestrator.process("Turn on the lights")
+        assert result["intent"] == "smart_home"
+        assert "Smart Home Agent" in result["response"]
+        assert orchestrator.process("Hello there")["intent"] == "general_chat"
+
+    def test_checkpoint_reuse(self, caplog):
+        """Test that a repeated multi-agent request is answered from its checkpoint."""
+        import logging
+        from src.agents import AgentOrchestrator
+
+        orchestrator = AgentOrchestrator()
+        orchestrator.setup()
+
+        with caplog.at_level(logging.INFO, logger="src.agents.orchestrator"):
+            first = orchestrator.process("Remind me what to buy")
+            second = orchestrator.process("Remind me what to buy")
+        assert first == second
+        assert caplog.text.count("Running task agent") == 1
+        assert "Reusing checkpointed result" in caplog.text
+
+    def test_checkpoint_threads_bounded(self, caplog):
+        """Test old and expired checkpoint threads are deleted and re-run."""
+        import logging
+        from src.agents import AgentOrchestrator
+
+        orchestrator = AgentOrchestrator({"checkpoint_threads": 1})
+        orchestrator.setup()
+        storage = orchestrator.graph.checkpointer.storage
+
+        with caplog.at_level(logging.INFO, logger="src.agents.orchestrator"):
+            orchestrator.process("Remind me what to buy")
+            orchestrator.process("Remind me to switch off the light")
+            assert len(orchestrator._threads) == 1 and len(storage) == 1
+            orchestrator.process("Remind me what to buy")
+        assert caplog.text.count("Running task agent") == 3
+
+        caplog.clear()
+        expiring = AgentOrchestrator({"checkpoint_ttl_s": 0})
+        expiring.setup()
+        with caplog.at_level(logging.INFO, logger="src.agents.orchestrator"):
+            expiring.process("Remind me what to buy")
+            expiring.process("Remind me what to buy")
+        assert caplog.text.count("Running task agent") == 2
+
+    def test_single_agent_bypasses_graph(self):
+        """Test single-intent requests never touch the graph."""
+        from src.agents import AgentOrchestrator
+
+        orchestrator = AgentOrchestrator()
+        orchestrator.setup()
+        orchestrator.graph.ainvoke = None  # Would fail if called
+
+        result = orchestrator.process("Turn on the lights")
+        assert result["intent"] == "smart_home"
+        assert result["response"].startswith("[Smart Home Agent]")
+
+    def test_multi_intent_fan_out(self):
+        """Test that every matched intent's agent runs, with and without LangGraph."""
+        import asyncio
+        from src.agents import AgentOrchestrator
+
+        graph = AgentOrchestrator()
+        graph.setup()
+        fallback = AgentOrchestrator()
+
+        for orchestrator in (graph, fallback):
+            result = asyncio.run(orchestrator.aprocess("When should I schedule the fan service?"))
+            assert result["intent"] == "information_query"
+            response = result["response"]
+            assert response.index("Info Agent") < response.index("Task Agent") < response.index("Smart Home Agent")
+
 class TestEdge:
     """Tests for Edge module."""
 
@@ -130,6 +925,19 @@ class TestEdge:
         assert handler.sample_rate == 16000
         assert handler.channels == 1
 
+    def test_preprocess(self):
+        """Test AudioHandler.preprocess peak-normalizes and removes DC offset."""
+        import numpy as np
+        from src.edge import AudioHandler
+
+        audio = np.array([0.5, -0.25, 0.1, 0.2], dtype=np.float32)
+        expected = audio / 0.5
+        expected = expected - expected.mean()
+
+        out = AudioHandler().preprocess(audio)
+        assert out.dtype == np.float32
+        assert np.allclose(out, expected)
+
     def test_edge_client_init(self):
         """Test EdgeClient initialization."""
         from src.edge import EdgeClient
@@ -137,7 +945,339 @@ class TestEdge:
         client = EdgeClient(server_url="http://localhost:8000")
         assert client.server_url == "http://localhost:8000"
 
+    def test_send_audio_stream_coalesces(self):
+        """Test streamed chunks are sent as PCM16 frames of SEND_FRAME_MS plus an end frame."""
+        import asyncio
+        import numpy as np
+        from src.edge import EdgeClient
+
+        class FakeConnection:
+            def __init__(self):
+                self.sent = []
+
+            async def send(self, message):
+                self.sent.append(message)
+
+        async def chunks():
+            for _ in range(10):
+                yield np.zeros(1024, dtype=np.float32)
+
+        client = EdgeClient()
+        client.ws_connection = FakeConnection()
+        asyncio.run(client.send_audio_stream(chunks()))
+
+        frame_bytes = client.SAMPLE_RATE * client.SEND_FRAME_MS // 1000 * 2
+        sizes = [len(message) for message in client.ws_connection.sent]
+        assert sizes[0] >= frame_bytes
+        assert sum(sizes) == 10 * 1024 * 2
+        assert sizes[-1] == 0
+
+    def test_sync_edge_client_loop(self):
+        """Test SyncEdgeClient runs calls on one persistent loop thread."""
+        from src.edge.client import SyncEdgeClient
+
+        client = SyncEdgeClient(server_url="http://127.0.0.1:1")
+        assert client._thread.is_alive()
+        assert client.health_check() is False  # nothing listening
+        assert client.health_check() is False
+        client.close()
+        assert not client._thread.is_alive()
+
+
+class TestUtils:
+    """Tests for utility helpers."""
+
+    def test_cuda_timer(self):
+        """Test the timer reports elapsed time after the block."""
+        from src.utils import cuda_timer
+
+        with cuda_timer() as timer:
+            sum(range(1000))
+        assert timer.ms >= 0
+
+    def test_release_cuda_memory(self):
+        """Test release_cuda_memory is a no-op without a GPU."""
+        from src.utils import release_cuda_memory
+
+        try:
+            import torch
+            has_cuda = torch.cuda.is_available()
+        except ImportError:
+            has_cuda = False
+
+        if not has_cuda:
+            assert release_cuda_memory(collect=True) is False
+
+    def test_enable_compile_cache(self, monkeypatch, tmp_path):
+        """Test the inductor cache dir is set without overriding the user's."""
+        import os
+        from src.utils import enable_compile_cache
+
+        monkeypatch.delenv("TORCHINDUCTOR_CACHE_DIR", raising=False)
+        monkeypatch.delenv("TORCHINDUCTOR_FX_GRAPH_CACHE", raising=False)
+        assert enable_compile_cache(tmp_path) == str(tmp_path)
+        assert os.environ["TORCHINDUCTOR_FX_GRAPH_CACHE"] == "1"
+
+        monkeypatch.setenv("TORCHINDUCTOR_CACHE_DIR", "/custom")
+        assert enable_compile_cache(tmp_path) == "/custom"
+
+    def test_to_mono(self):
+        """Test decoded stereo audio becomes mono float32 at 16kHz."""
+        import numpy as np
+        from src.utils import to_mono
+
+        stereo = np.ones((8000, 2), dtype=np.float64)
+        out = to_mono(stereo, 8000)
+        assert out.shape == (16000,)
+        assert out.dtype == np.float32
+
+        pcm = np.array([[16384, 0], [-32768, -32768]], dtype=np.int16)
+        np.testing.assert_allclose(to_mono(pcm, 16000), [0.25, -1.0])
+
+    def test_turn_segmenter(self):
+        """Test a stream is cut into a turn after trailing silence."""
+        import numpy as np
+        from src.utils import TurnSegmenter
+        from src.utils.vad import VAD_FRAME
+
+        segmenter = TurnSegmenter(lambda frame: frame.max() > 0.1)
+        silence = np.zeros(VAD_FRAME * 4, dtype=np.int16)
+        speech = np.full(VAD_FRAME * 3, 16000, dtype=np.int16)
+
+        # Leading silence is dropped; odd-sized chunks are carried over
+        assert segmenter.feed(silence) == []
+        assert segmenter.feed(speech[:1000]) == []
+        assert segmenter.feed(speech[1000:]) == []
+
+        turns = segmenter.feed(np.zeros(VAD_FRAME * segmenter.stop_frames, dtype=np.int16))
+        assert len(turns) == 1
+        assert len(turns[0]) == VAD_FRAME * (3 + segmenter.stop_frames)
+        assert segmenter.flush() == []
+
+    def test_speech_detector_reset_per_turn(self):
+        """Test each stream gets a detector whose state is reset between turns."""
+        import numpy as np
+        from src.utils import TurnSegmenter, speech_detector_factory
+        from src.utils.vad import VAD_FRAME
+
+        new_detector = speech_detector_factory(16000)
+        assert callable(new_detector())
+
+        resets = []
+
+        def is_speech(frame):
+            return frame.max() > 0.1
+
+        is_speech.reset = lambda: resets.append(True)
+        segmenter = TurnSegmenter(is_speech)
+        segmenter.feed(np.full(VAD_FRAME, 16000, dtype=np.int16))
+        assert len(segmenter.flush()) == 1
+        assert resets == [True]
+
+    def test_resample(self):
+        """Test polyphase resampling keeps duration and removes aliasing tones."""
+        import numpy as np
+        from src.utils import resample
+
+        sr = 44100
+        t = np.arange(sr) / sr
+        # 440 Hz is kept; 10 kHz is above the 8 kHz Nyquist of 16 kHz audio
+        audio = np.sin(2 * np.pi * 440 * t) + np.sin(2 * np.pi * 10000 * t)
+        out = resample(audio, sr, 16000)
+
+        assert out.dtype == np.float32
+        assert len(out) == 16000
+        spectrum = np.abs(np.fft.rfft(out))
+        assert spectrum[440] > 100 * spectrum[6000]
+        assert resample(audio, 16000, 16000) is audio
+
+
+class TestMicroBatcher:
+    """Tests for the async request batcher."""
+
+    def test_groups_and_errors(self):
+        """Test requests are batched per key and a failing call fails only its group."""
+        import asyncio
+        from src.utils import MicroBatcher
+
+        calls = []
+
+        def run_batch(items):
+            calls.append(items)
+            if items[0][0] == "bad":
+                raise ValueError("boom")
+            return [text.upper() for _, text in items]
+
+        batcher = MicroBatcher(run_batch, max_batch=4, max_wait_ms=50, group_key=lambda item: item[0])
+
+        async def run():
+            return await asyncio.gather(
+                *(batcher.submit(item) for item in [("a", "x"), ("bad", "y"), ("a", "z")]),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(run())
+        assert results[0] == "X" and results[2] == "Z"
+        assert isinstance(results[1], ValueError)
+        assert calls == [[("a", "x"), ("a", "z")], [("bad", "y")]]
+
+
+class TestKeywordMatcher:
+    """Tests for the Aho-Corasick keyword matcher."""
+
+    def test_overlapping_matches(self):
+        """Test all overlapping keyword occurrences are reported."""
+        from src.utils import KeywordMatcher
+
+        matcher = KeywordMatcher({"he": 1, "she": 2, "hers": 3, "his": 4})
+        assert sorted(kw for kw, _ in matcher.iter("ushers")) == ["he", "hers", "she"]
+        assert matcher.first("this") == 4
+        assert matcher.first("nothing") is None
+
+    def test_whole_words(self):
+        """Test whole-word mode skips matches inside words and spans phrases."""
+        from src.utils import KeywordMatcher
+
+        matcher = KeywordMatcher({"hi": 1, "turn on": 2, "what's up": 3}, whole_words=True)
+        assert matcher.first("this") is None
+        assert matcher.first("hi, there") == 1
+        assert [kw for kw, _ in matcher.iter("turn  on... what's up")] == ["turn on", "what's up"]
+
+
+class TestDemoCommon:
+    """Tests for shared demo helpers."""
+
+    def test_pcm16_to_float32(self):
+        """Test int16 recordings are scaled to mono float32."""
+        import numpy as np
+        from demo_common import pcm16_to_float32
+
+        audio = np.array([[0], [16384], [-32768]], dtype=np.int16)
+        result = pcm16_to_float32(audio)
+        assert result.dtype == np.float32
+        assert result.shape == (3,)
+        assert result[1] == 0.5
+        assert result[2] == -1.0
+
+    def test_is_silent(self):
+        """Test the RMS silence gate on int16 and float32 audio."""
+        import numpy as np
+        from demo_common import is_silent
+
+        assert is_silent(np.zeros((16000, 1), dtype=np.int16))
+        assert is_silent(np.array([], dtype=np.int16))
+        assert not is_silent(np.full((16000, 1), 8000, dtype=np.int16))
+        assert not is_silent(np.full(16000, 0.25, dtype=np.float32))
+
+    def test_background_worker(self):
+        """Test BackgroundWorker handles every queued item before closing."""
+        from demo_common import BackgroundWorker
+
+        handled = []
+        worker = BackgroundWorker(handled.append)
+        for i in range(3):
+            worker.submit(i)
+        worker.close()
+        assert handled == [0, 1, 2]
+
 
 # Run tests with: pytest tests/ -v
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+class TestPipelineStreaming:
+    """Tests for sentence chunking of streamed LLM output."""
+
+    def test_sentence_boundary(self):
+        """Test flushing on punctuation and on the token cap."""
+        from src.pipeline.orchestrator import MAX_SENTENCE_TOKENS, is_sentence_boundary
+
+        assert is_sentence_boundary("Hello there", ".")
+        assert is_sentence_boundary("Is it", "?")
+        assert not is_sentence_boundary("Hello", " there")
+        assert is_sentence_boundary("word " * 10, " more", MAX_SENTENCE_TOKENS)
+
+    def test_process_streaming_stages(self, tmp_path):
+        """Test sentences flow through translation and TTS in response order."""
+        import asyncio
+        from types import SimpleNamespace
+        import numpy as np
+        from src.pipeline.orchestrator import VoiceAssistantPipeline
+
+        pipeline = VoiceAssistantPipeline(device="cpu", detect_intent=False)
+        pipeline._llm = SimpleNamespace(
+            stream=lambda text, conversation_id=None: iter(["One.", " Two.", " Three"])
+        )
+        pipeline._translator = SimpleNamespace(en_to_ml=str.upper)
+        pipeline._tts = SimpleNamespace(
+            synthesize=lambda text, language: SimpleNamespace(
+                audio=np.full(2, len(text), dtype=np.float32), sample_rate=16000
+            )
+        )
+        spoken = []
+
+        result = asyncio.run(pipeline.process_streaming(
+            text_input="hi",
+            input_language="en",
+            on_audio=lambda index, text, audio: spoken.append((index, text)),
+        ))
+        assert result.success, result.error
+        assert spoken == [(0, "ONE."), (1, "TWO."), (2, "THREE")]
+        assert result.malayalam_response == "ONE. TWO. THREE"
+        assert len(result.audio_output) == 6
+
+        # With an output path each sentence is written as it is synthesized
+        import soundfile as sf
+        path = tmp_path / "reply.wav"
+        result = asyncio.run(pipeline.process_streaming(
+            text_input="hi", input_language="en", output_audio_path=path
+        ))
+        assert result.success, result.error
+        assert result.audio_output == str(path)
+        assert sf.info(str(path)).frames == 6
+
+    def test_response_cache(self):
+        """Test repeated queries skip the LLM, translation and TTS."""
+        from types import SimpleNamespace
+        import numpy as np
+        from src.pipeline.orchestrator import VoiceAssistantPipeline
+
+        pipeline = VoiceAssistantPipeline(device="cpu", detect_intent=False)
+        calls = []
+        histories = {}
+
+        def chat(text, conversation_id=None):
+            calls.append(text)
+            histories.setdefault(conversation_id, []).append(text)
+            return SimpleNamespace(content="Hello!")
+
+        pipeline._llm = SimpleNamespace(
+            chat=chat,
+            has_history=lambda conversation_id=None: bool(histories.get(conversation_id)),
+            remember=lambda text, response, conversation_id=None: (
+                histories.setdefault(conversation_id, []).append(text)
+            ),
+        )
+        pipeline._translator = SimpleNamespace(en_to_ml=str.upper)
+        pipeline._tts = SimpleNamespace(
+            synthesize=lambda text, language, output_path=None: SimpleNamespace(
+                audio=np.array([0.5, -0.25], dtype=np.float32), sample_rate=16000
+            )
+        )
+
+        first = pipeline.process_text("Tell me  a joke", input_language="en", conversation_id="a")
+        second = pipeline.process_text(" tell me a JOKE ", input_language="en", conversation_id="b")
+        assert calls == ["Tell me  a joke"]
+        assert second.success and second.malayalam_response == "HELLO!"
+        np.testing.assert_allclose(second.audio_output, first.audio_output, atol=1e-4)
+        # The cached exchange still becomes part of the conversation
+        assert histories["b"] == [" tell me a JOKE "]
+
+        # Follow-ups depend on context, so a conversation with history misses
+        pipeline.process_text("Tell me a joke", input_language="en", conversation_id="b")
+        assert len(calls) == 2
+
+        pipeline.response_cache_size = 0
+        pipeline.process_text("Tell me a joke", input_language="en", conversation_id="c")
+        assert len(calls) == 3